@@ -1,20 +1,42 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import os
+import re
+import sys
 import uuid
 import logging
-import boto3
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
+from boto3.dynamodb.conditions import Key
+
+# travelease_common repo root par hai (Docker image mein /app ke andar)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from travelease_common.admission import Overloaded, init_admission, shed_response
+from travelease_common.cache import get_cache
+from travelease_common.debug import init_debug
+from travelease_common.http_cache import ResponseCache, ResponseEntry, json_response, negotiated_response
+from travelease_common.metrics import init_metrics, track_cache
+from travelease_common.serving import fork_safe
+from travelease_common.startup import WARMUP_KEY, dynamodb_resource, register_warmup, warm_dynamodb, warm_up
+from travelease_common.table_snapshot import iter_snapshot_items
+from travelease_common.upstream import Upstream, fan_out
 from email_sender_gmail import (
     send_confirmation_email,
     send_cancellation_email
 )
+from smart_trip_ranker import TOP_K, SmartTripRanker
 
 # -------------------------------
 # App & Logging
 # -------------------------------
 app = Flask(__name__)
 CORS(app)
+# Per-route latency histograms + GET /metrics
+init_metrics(app, "booking")
+# Slow request span logs + /debug/profile (DEBUG_TOKEN ke saath)
+init_debug(app)
+# Rate limits (global + per client) -> 429; DynamoDB concurrency cap
+init_admission(app)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -24,13 +46,70 @@ logging.basicConfig(
 # -------------------------------
 # DynamoDB Configuration
 # -------------------------------
-AWS_REGION = "eu-north-1"
+# Region: AWS_REGION / AWS_DEFAULT_REGION env (ECS set karta hai), default eu-north-1
 BOOKINGS_TABLE = os.getenv("BOOKINGS_TABLE", "BookingsDB")
 SMART_TRIPS_TABLE = os.getenv("SMART_TRIPS_TABLE", "SmartTripsDB")
 
-dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
-bookings_table = dynamodb.Table(BOOKINGS_TABLE)
-smart_trips_table = dynamodb.Table(SMART_TRIPS_TABLE)
+# DYNAMODB_ENDPOINT_URL: local stand-in (load tests); unset -> AWS
+# fork_safe: har gunicorn worker apna boto3 resource banata hai (master se share nahi)
+# dynamodb_resource: pooled keep-alive connections + adaptive retries
+dynamodb = fork_safe(dynamodb_resource)
+bookings_table = fork_safe(lambda: dynamodb.Table(BOOKINGS_TABLE))
+smart_trips_table = fork_safe(lambda: dynamodb.Table(SMART_TRIPS_TABLE))
+# Worker traffic lene se pehle: boto3 models + pooled connections ready
+register_warmup("dynamodb", lambda: warm_dynamodb(bookings_table, {"booking_reference": WARMUP_KEY}))
+
+# Warm start: SMART_TRIPS_SNAPSHOT set ho to destination index snapshot file se
+# banta hai aur /smart-trip table scan nahi karta
+SMART_TRIPS_SNAPSHOT = os.getenv("SMART_TRIPS_SNAPSHOT")
+trips_by_destination = None
+if SMART_TRIPS_SNAPSHOT:
+    trips_by_destination = {}
+    for item in iter_snapshot_items(SMART_TRIPS_SNAPSHOT):
+        trips_by_destination.setdefault(item.get("destination_code", "").upper(), []).append(item)
+    logging.info(f"Loaded smart trips for {len(trips_by_destination)} destinations from {SMART_TRIPS_SNAPSHOT}")
+
+# Smart-trip recommendations cache (per destination)
+SMART_TRIP_CACHE_TTL = int(os.getenv("SMART_TRIP_CACHE_TTL", 600))
+smart_trip_cache = track_cache(get_cache("smart-trips"))
+# Serialized + compressed responses (ETag / 304 for GET /smart-trip)
+smart_trip_responses = ResponseCache("smart-trips")
+SMART_TRIP_CACHE_CONTROL = os.getenv("SMART_TRIP_CACHE_CONTROL", "public, max-age=300")
+# Ranked top-k (scores precomputed per destination; limit / types filters)
+smart_trip_ranker = SmartTripRanker(ttl=SMART_TRIP_CACHE_TTL)
+SMART_TRIP_DEFAULT_LIMIT = int(os.getenv("SMART_TRIP_DEFAULT_LIMIT", 10))
+# booking_count updates /book ke response ke baad, background threads par
+# (threads fork ke baad nahi bachte -> har worker ka apna executor)
+popularity_executor = fork_safe(lambda: ThreadPoolExecutor(max_workers=2, thread_name_prefix="popularity"))
+# flight_details mein route, e.g. "IndiGo (DEL-GOI)" -> destination GOI
+ROUTE_RE = re.compile(r"\b([A-Z]{3})-([A-Z]{3})\b")
+
+# Destination aggregator: Flight aur CrowdPulse services (ECS par ALB ke through)
+flight_api = Upstream("flight", os.getenv("FLIGHT_SERVICE_URL"),
+                      float(os.getenv("DESTINATION_FLIGHTS_TIMEOUT", 1.5)))
+crowdpulse_api = Upstream("crowdpulse", os.getenv("CROWDPULSE_SERVICE_URL"),
+                          float(os.getenv("DESTINATION_CROWDPULSE_TIMEOUT", 1.5)))
+DESTINATION_TIMEOUT = float(os.getenv("DESTINATION_TIMEOUT", 2.0))
+DESTINATION_CACHE_CONTROL = os.getenv("DESTINATION_CACHE_CONTROL", "public, max-age=60")
+
+def plain_numbers(item):
+    """Copy of a DynamoDB item with Decimal values as float (JSON-safe)."""
+    return {k: float(v) if isinstance(v, Decimal) else v for k, v in item.items()}
+
+def destination_of(flight_details):
+    match = ROUTE_RE.search(flight_details or "")
+    return match.group(2) if match else None
+
+def parse_ranking_args(data):
+    """(limit, types) from query args / JSON body; ValueError on a bad limit."""
+    limit = int(data.get("limit") or SMART_TRIP_DEFAULT_LIMIT)
+    if not 1 <= limit <= TOP_K:
+        raise ValueError(f"limit must be between 1 and {TOP_K}")
+    types = data.get("types")
+    if isinstance(types, str):
+        types = types.split(",")
+    types = sorted({str(t).strip().lower() for t in types if str(t).strip()}) if types else None
+    return limit, types
 
 # -------------------------------
 # Health Check
@@ -52,6 +131,8 @@ def book_flight():
         user_email = data.get("user_email")
         flight_details = data.get("flight_details") or data.get("flight")
         amount_paid = data.get("amount_paid") or data.get("amount") or data.get("price")
+        # Optional: Smart Trip items jo user ne is booking ke saath liye (popularity)
+        trip_ids = data.get("trip_ids") or []
         transaction_id = data.get(
             "transaction_id",
             f"TXN-{uuid.uuid4().hex[:8].upper()}"
@@ -77,6 +158,8 @@ def book_flight():
             }
         )
 
+        record_trip_popularity(destination_of(flight_details), amount_paid, trip_ids)
+
         # -------------------------------
         # Send Confirmation Email
         # -------------------------------
@@ -94,7 +177,7 @@ def book_flight():
                 f"Confirmation email failed for booking {booking_reference}"
             )
 
-        return jsonify({
+        return negotiated_response({
             "message": "Booking Confirmed!",
             "booking_reference": booking_reference,
             "flight_id": flight_id,
@@ -103,12 +186,47 @@ def book_flight():
             "amount_paid": amount_paid,
             "transaction_id": transaction_id,
             "email_status": "Sent" if email_sent else "Failed"
-        }), 200
+        })
 
+    except Overloaded:
+        raise  # init_admission -> 429
     except Exception as e:
         logging.error(f"Booking error: {e}")
         return jsonify({"message": "Booking failed"}), 500
 
+def record_trip_popularity(destination_code, amount_paid, trip_ids):
+    """Ranking signals from a booking: fare paid + booking_count of picked items (async)."""
+    # Ranking signal hai; booking isse fail nahi honi chahiye
+    if destination_code:
+        try:
+            smart_trip_ranker.observe_fare(destination_code, float(amount_paid))
+        except (TypeError, ValueError):
+            pass
+    if not isinstance(trip_ids, list) or not trip_ids:
+        return
+    trip_ids = list(dict.fromkeys(str(t) for t in trip_ids))[:TOP_K]
+    try:
+        popularity_executor.submit(persist_trip_popularity, destination_code, trip_ids)
+    except RuntimeError as e:  # executor shutdown (worker exit)
+        logging.warning(f"Smart trip popularity update skipped: {e}")
+
+def persist_trip_popularity(destination_code, trip_ids):
+    """ADD booking_count per item (sequential update_item calls, off the request path)."""
+    for trip_id in trip_ids:
+        try:
+            # Persisted count: baaki workers / tasks ko agle catalog refresh par milta hai
+            smart_trips_table.update_item(
+                Key={"trip_id": trip_id},
+                UpdateExpression="ADD booking_count :one",
+                ConditionExpression="attribute_exists(trip_id)",
+                ExpressionAttributeValues={":one": 1},
+            )
+        except Exception as e:
+            logging.warning(f"Smart trip popularity update failed for {trip_id}: {e}")
+            continue
+        if destination_code:
+            smart_trip_ranker.record_booking(destination_code, trip_id)
+
 # -------------------------------
 # CANCEL BOOKING (FIXED)
 # -------------------------------
@@ -171,6 +289,8 @@ def cancel_booking():
             "email_status": "Sent" if email_sent else "Failed"
         }), 200
 
+    except Overloaded:
+        raise  # init_admission -> 429
     except Exception as e:
         logging.error(f"Cancellation error: {e}")
         return jsonify({"message": "Cancellation failed"}), 500
@@ -189,37 +309,156 @@ def get_booked_seats():
 # -------------------------------
 # SMART TRIP RECOMMENDATIONS
 # -------------------------------
-@app.route("/smart-trip", methods=["POST"])
+@app.route("/smart-trip", methods=["GET", "POST"])
 def get_smart_trip_recommendations():
+    # GET /smart-trip?destination_code=GOI browser/CDN cache aur If-None-Match
+    # (304) ke saath chalta hai; POST (JSON body) purane clients ke liye.
+    # Ranked (best first, suggestion_type mix): &limit=10 (max 50) &types=Hotel,Tour
     try:
-        data = request.get_json(force=True, silent=True) or {}
+        if request.method == "GET":
+            data = request.args
+        else:
+            data = request.get_json(force=True, silent=True) or {}
         destination_code = (data.get("destination_code") or data.get("to") or "").upper()
 
         if not destination_code:
             return jsonify({"message": "Missing destination code"}), 400
-
-        response = smart_trips_table.scan()
-        items = response.get("Items", [])
-
-        filtered = [
-            item for item in items
-            if item.get("destination_code", "").upper() == destination_code
-        ]
-
-        for item in filtered:
-            for k, v in item.items():
-                if isinstance(v, Decimal):
-                    item[k] = float(v)
-
-        return jsonify({"recommendations": filtered}), 200
-
+        try:
+            limit, types = parse_ranking_args(data)
+        except (TypeError, ValueError) as e:
+            return jsonify({"message": f"Invalid limit: {e}"}), 400
+
+        conditional_ok = request.method == "GET"
+        key = f"{destination_code}:{limit}:{','.join(types or [])}"
+        entry = smart_trip_responses.get(key)
+        if entry is not None:
+            return json_response(entry, SMART_TRIP_CACHE_CONTROL, conditional_ok)
+
+        recommendations = ranked_smart_trips(destination_code, limit, types)
+        entry = smart_trip_responses.put(key, {"recommendations": recommendations}, SMART_TRIP_CACHE_TTL)
+        return json_response(entry, SMART_TRIP_CACHE_CONTROL, conditional_ok)
+
+    except Overloaded as e:
+        return shed_response(e, smart_trip_responses.get(key, allow_stale=True), "smart-trips")
     except Exception as e:
         logging.error(f"Smart-trip error: {e}")
         return jsonify({"message": "Error fetching smart trip recommendations"}), 500
 
+def query_all(table, **kwargs):
+    """Saare pages (DynamoDB query ek baar mein max 1 MB deta hai)."""
+    items = []
+    while True:
+        response = table.query(**kwargs)
+        items.extend(response.get("Items", []))
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return items
+        kwargs["ExclusiveStartKey"] = last_key
+
+def load_smart_trips(destination_code):
+    """Recommendations for one destination: shared cache, else snapshot index / destination GSI query."""
+    cached = smart_trip_cache.get(destination_code)
+    if cached is not None:
+        return cached
+
+    if trips_by_destination is not None:
+        # Snapshot sirf catalog hai; booking_count (runtime, /book likhta hai) table se
+        items = with_booking_counts(trips_by_destination.get(destination_code, []))
+    else:
+        # destination-index GSI: sirf is destination ke items, saare pages
+        items = query_all(smart_trips_table, IndexName="destination-index",
+                          KeyConditionExpression=Key("destination_code").eq(destination_code))
+
+    filtered = [plain_numbers(item) for item in items]
+    smart_trip_cache.set(destination_code, filtered, SMART_TRIP_CACHE_TTL)
+    return filtered
+
+def with_booking_counts(items):
+    """Snapshot items with current booking_count values (BatchGetItem, 100 keys per call)."""
+    trip_ids = [item["trip_id"] for item in items if item.get("trip_id")]
+    counts = {}
+    try:
+        for start in range(0, len(trip_ids), 100):
+            request_items = {SMART_TRIPS_TABLE: {
+                "Keys": [{"trip_id": t} for t in trip_ids[start:start + 100]],
+                "ProjectionExpression": "trip_id, booking_count",
+            }}
+            for _ in range(5):  # UnprocessedKeys (throttling) ke liye kuch retries
+                response = dynamodb.batch_get_item(RequestItems=request_items)
+                for row in response.get("Responses", {}).get(SMART_TRIPS_TABLE, []):
+                    counts[row["trip_id"]] = row.get("booking_count", 0)
+                request_items = response.get("UnprocessedKeys")
+                if not request_items:
+                    break
+    except Overloaded:
+        raise
+    except Exception as e:
+        logging.warning(f"Booking counts unavailable, using snapshot values: {e}")
+        return items
+    return [dict(item, booking_count=counts[item["trip_id"]]) if item.get("trip_id") in counts else item
+            for item in items]
+
+def ranked_smart_trips(destination_code, limit, types=None):
+    return smart_trip_ranker.top(destination_code, limit, types, loader=lambda: load_smart_trips(destination_code))
+
+# -------------------------------
+# DESTINATION AGGREGATOR
+# -------------------------------
+@app.route("/api/destination/<string:destination_code>", methods=["GET"])
+def get_destination(destination_code):
+    """
+    Flights + smart-trip recommendations + CrowdPulse for one destination in
+    one round trip. Teeno parallel fetch hote hain; page latency sabse slow
+    backend jitni hoti hai (sum nahi). Koi backend slow / down ho to uska
+    section null aur errors mein reason -- baaki sections phir bhi aate hain.
+
+    GET /api/destination/GOI?from=DEL&type=domestic[&date=YYYY-MM-DD][&limit=10&types=Hotel]
+    (from/type na hon to flights skip hote hain; limit/types recommendations ke liye)
+    """
+    destination_code = destination_code.upper()
+    from_dest = request.args.get("from", "").upper()
+    flight_type = request.args.get("type")
+    flight_date = request.args.get("date")
+    try:
+        limit, types = parse_ranking_args(request.args)
+    except ValueError as e:
+        return jsonify({"message": f"Invalid limit: {e}"}), 400
+
+    calls = {
+        "recommendations": lambda: ranked_smart_trips(destination_code, limit, types),
+        "crowdpulse": lambda: crowdpulse_api.get(f"/api/crowdpulse/{destination_code}"),
+    }
+    if from_dest and flight_type:
+        params = {"type": flight_type, "from": from_dest, "to": destination_code}
+        if flight_date:
+            params["date"] = flight_date
+        calls["flights"] = lambda: flight_api.get("/api/flights", params)["flights"]
+
+    results, errors = fan_out(calls, DESTINATION_TIMEOUT)
+    for name, reason in errors.items():
+        logging.warning(f"Destination {destination_code}: {name} unavailable ({reason})")
+    if errors and not results:
+        return jsonify({"message": "Destination data unavailable", "errors": errors}), 502
+    if results.get("flights"):
+        # Cheapest fare -> smart-trip ranking ka "price relative to fare"
+        smart_trip_ranker.observe_fare(destination_code, min(float(f.get("price") or 0) for f in results["flights"]))
+
+    payload = {
+        "destination_code": destination_code,
+        "flights": results.get("flights"),
+        "recommendations": results.get("recommendations"),
+        "crowdpulse": results.get("crowdpulse"),
+        "errors": errors,
+        "partial": bool(errors),
+    }
+    # Partial response cache nahi hona chahiye: backend theek hote hi poora data mile
+    entry = ResponseEntry(payload, 0)
+    return json_response(entry, "no-store" if errors else DESTINATION_CACHE_CONTROL)
+
 # -------------------------------
-# Main
+# Main (dev server; production: python -m travelease_common.serving booking)
 # -------------------------------
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
+    warm_up()
     app.run(host="0.0.0.0", port=port, debug=False)
@@ -3,24 +3,32 @@ import os
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
+from travelease_common.metrics import track_dependency
+
+# Default Gmail; local/load-test runs SMTP_HOST/SMTP_PORT se stand-in server
+# par point kar sakte hain (SMTP_STARTTLS=0 -> plain connection)
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "1") != "0"
+
 def _get_creds():
     user = os.getenv("EMAIL_USER")
     pwd  = os.getenv("EMAIL_PASS")
     return user, pwd
 
-def send_confirmation_email(recipient_email, booking_details):
-    """
-    Send booking confirmation via Gmail SMTP.
-    Returns True on success, False on failure.
-    """
-    GMAIL_USER, GMAIL_PASS = _get_creds()
-    if not GMAIL_USER or not GMAIL_PASS:
-        # credentials missing
-        return False
+def _send(msg, user, pwd):
+    # Connect + TLS + login + send poora ek SMTP dependency call ki tarah time hota hai
+    with track_dependency("smtp", "send"), smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
+        if SMTP_STARTTLS:
+            server.starttls()
+        server.login(user, pwd)
+        server.send_message(msg)
 
+def build_confirmation_message(sender, recipient_email, booking_details):
+    """Confirmation email as a MIME message (no network)."""
     msg = MIMEMultipart("alternative")
     msg["Subject"] = "TravelEase Booking Confirmation ✈️"
-    msg["From"] = GMAIL_USER
+    msg["From"] = sender
     msg["To"] = recipient_email
 
     html = f"""
@@ -39,12 +47,23 @@ def send_confirmation_email(recipient_email, booking_details):
     </html>
     """
     msg.attach(MIMEText(html, "html"))
+    return msg
+
+
+def send_confirmation_email(recipient_email, booking_details):
+    """
+    Send booking confirmation via Gmail SMTP.
+    Returns True on success, False on failure.
+    """
+    GMAIL_USER, GMAIL_PASS = _get_creds()
+    if not GMAIL_USER or not GMAIL_PASS:
+        # credentials missing
+        return False
+
+    msg = build_confirmation_message(GMAIL_USER, recipient_email, booking_details)
 
     try:
-        with smtplib.SMTP("smtp.gmail.com", 587) as server:
-            server.starttls()
-            server.login(GMAIL_USER, GMAIL_PASS)
-            server.send_message(msg)
+        _send(msg, GMAIL_USER, GMAIL_PASS)
         return True
     except Exception as e:
         # log error for internal debugging
@@ -52,17 +71,11 @@ def send_confirmation_email(recipient_email, booking_details):
         return False
 
 
-def send_cancellation_email(recipient_email, booking_details, refund_amount):
-    """
-    Send cancellation email. Returns True on success, False on failure.
-    """
-    GMAIL_USER, GMAIL_PASS = _get_creds()
-    if not GMAIL_USER or not GMAIL_PASS:
-        return False
-
+def build_cancellation_message(sender, recipient_email, booking_details, refund_amount):
+    """Cancellation email as a MIME message (no network)."""
     msg = MIMEMultipart("alternative")
     msg["Subject"] = "TravelEase Booking Cancelled"
-    msg["From"] = GMAIL_USER
+    msg["From"] = sender
     msg["To"] = recipient_email
 
     html = f"""
@@ -82,12 +95,21 @@ def send_cancellation_email(recipient_email, booking_details, refund_amount):
     </html>
     """
     msg.attach(MIMEText(html, "html"))
+    return msg
+
+
+def send_cancellation_email(recipient_email, booking_details, refund_amount):
+    """
+    Send cancellation email. Returns True on success, False on failure.
+    """
+    GMAIL_USER, GMAIL_PASS = _get_creds()
+    if not GMAIL_USER or not GMAIL_PASS:
+        return False
+
+    msg = build_cancellation_message(GMAIL_USER, recipient_email, booking_details, refund_amount)
 
     try:
-        with smtplib.SMTP("smtp.gmail.com", 587) as server:
-            server.starttls()
-            server.login(GMAIL_USER, GMAIL_PASS)
-            server.send_message(msg)
+        _send(msg, GMAIL_USER, GMAIL_PASS)
         return True
     except Exception as e:
         print(f"[ERROR] Cancellation email failed: {e}")
@@ -0,0 +1,159 @@
+# Booking_Service/smart_trip_ranker.py
+"""
+Ranked Smart Trip recommendations: precomputed scores + per-destination top-k.
+
+Har item ka score ek baar banta hai (catalog load / booking par), request
+par sirf chhoti top-k lists se items uthaye jaate hain -- isliye response
+size aur latency catalog size (42 items ya 50k) se independent hai.
+
+    score = PRICE_WEIGHT * value + TYPE_WEIGHT * type_weight + POPULARITY_WEIGHT * popularity
+
+- value:       fare / (fare + price). Flight fare ke muqable sasta add-on upar.
+               fare = us destination ke observed fares (bookings, flight search)
+               ka EWMA; abhi tak koi fare na dikha ho to items ka median price.
+- type_weight: TYPE_WEIGHTS[suggestion_type] (unknown type -> DEFAULT_TYPE_WEIGHT)
+- popularity:  booking_count / (booking_count + POPULARITY_HALF), 0..1
+
+Index per destination: har suggestion_type ki ek sorted list (top TOP_K).
+Booking count sirf badhta hai -> score sirf badhta hai -> record_booking()
+ek item ko O(TOP_K) mein apni list mein upar le jaata hai. Fare FARE_DRIFT se
+zyada badle ya catalog `ttl` se purana ho to destination ka index rebuild.
+
+top() suggestion_type mix bhi rakhta hai: har pick par us type ke agle
+item ka score MIX_DECAY ** (us type ke pehle se chune items) se multiply
+hota hai, taaki 10 hotels ke bajaye hotel + tour + food mile.
+"""
+import bisect
+import heapq
+import statistics
+import threading
+import time
+
+PRICE_WEIGHT = 0.5
+TYPE_WEIGHT = 0.2
+POPULARITY_WEIGHT = 0.3
+TYPE_WEIGHTS = {"hotel": 1.0, "tour": 0.9, "activity": 0.9, "ticket": 0.8, "food": 0.7}
+DEFAULT_TYPE_WEIGHT = 0.5
+POPULARITY_HALF = 20
+MIX_DECAY = 0.85
+TOP_K = 50          # per destination per type; /smart-trip limit isse zyada nahi
+FARE_ALPHA = 0.2    # EWMA weight of a new fare
+FARE_DRIFT = 0.25   # fare itna (relative) badle to destination rescore
+
+
+def score_item(item, fare):
+    price = float(item.get("price") or 0)
+    value = fare / (fare + price) if fare + price > 0 else 0.0
+    type_weight = TYPE_WEIGHTS.get(str(item.get("suggestion_type", "")).lower(), DEFAULT_TYPE_WEIGHT)
+    count = float(item.get("booking_count") or 0)
+    popularity = count / (count + POPULARITY_HALF)
+    return PRICE_WEIGHT * value + TYPE_WEIGHT * type_weight + POPULARITY_WEIGHT * popularity
+
+
+class _DestinationIndex:
+    def __init__(self, items, fare):
+        self.fare = fare
+        self.built_at = time.time()
+        self.items = {}    # trip_id -> [score, item]
+        self.by_type = {}  # type (lowercase) -> sorted [(-score, trip_id)], top TOP_K
+        grouped = {}
+        for item in items:
+            trip_id = item.get("trip_id")
+            if trip_id is None:
+                continue
+            score = score_item(item, fare)
+            self.items[trip_id] = [score, item]
+            grouped.setdefault(str(item.get("suggestion_type", "")).lower(), []).append((-score, trip_id))
+        for kind, entries in grouped.items():
+            self.by_type[kind] = heapq.nsmallest(TOP_K, entries)
+
+    def bump(self, trip_id):
+        entry = self.items.get(trip_id)
+        if entry is None:
+            return False
+        old_score, item = entry
+        item["booking_count"] = float(item.get("booking_count") or 0) + 1
+        entry[0] = score_item(item, self.fare)
+        ranked = self.by_type.setdefault(str(item.get("suggestion_type", "")).lower(), [])
+        i = bisect.bisect_left(ranked, (-old_score, trip_id))
+        if i < len(ranked) and ranked[i] == (-old_score, trip_id):
+            del ranked[i]
+        bisect.insort(ranked, (-entry[0], trip_id))
+        del ranked[TOP_K:]
+        return True
+
+    def top(self, limit, types=None):
+        kinds = [k for k in (types if types is not None else self.by_type) if self.by_type.get(k)]
+        cursor = dict.fromkeys(kinds, 0)
+        picked = dict.fromkeys(kinds, 0)
+        out = []
+        while len(out) < limit and cursor:
+            best, best_value = None, None
+            for kind in cursor:
+                value = -self.by_type[kind][cursor[kind]][0] * MIX_DECAY ** picked[kind]
+                if best_value is None or value > best_value:
+                    best, best_value = kind, value
+            score, trip_id = self.by_type[best][cursor[best]]
+            out.append(dict(self.items[trip_id][1], score=round(-score, 4)))
+            picked[best] += 1
+            cursor[best] += 1
+            if cursor[best] >= len(self.by_type[best]):
+                del cursor[best]
+        return out
+
+
+class SmartTripRanker:
+    """Per-process ranked index of Smart Trip items, built lazily per destination."""
+
+    def __init__(self, ttl=600):
+        self.ttl = ttl
+        self._indexes = {}  # destination -> _DestinationIndex
+        self._fares = {}    # destination -> EWMA fare
+        self._lock = threading.Lock()
+
+    def _build(self, destination, loader):
+        # loader() (cache miss par DynamoDB query) lock ke bahar: ek cold destination
+        # baaki destinations / threads ki ranking ko block na kare
+        items = [dict(item) for item in loader()]  # bump() counts badalta hai -> cache ki copy nahi
+        with self._lock:
+            fare = self._fares.get(destination)
+        if fare is None:
+            prices = [float(item.get("price") or 0) for item in items]
+            fare = statistics.median(prices) if prices else 1.0
+        return _DestinationIndex(items, fare)
+
+    def _fresh(self, index):
+        return index is not None and index.built_at + self.ttl >= time.time()
+
+    def top(self, destination, limit, types=None, loader=list):
+        """Best `limit` items (type-mixed). types: lowercase suggestion_types or None for all."""
+        with self._lock:
+            index = self._indexes.get(destination)
+            if self._fresh(index):
+                return index.top(limit, types)
+        built = self._build(destination, loader)
+        with self._lock:
+            index = self._indexes.get(destination)
+            # Beech mein kisi aur thread ne fresh index bana diya ho to wahi (uske bumps ke saath)
+            if not self._fresh(index):
+                index = self._indexes[destination] = built
+            return index.top(limit, types)
+
+    def record_booking(self, destination, trip_id):
+        """A booking picked this item: its popularity (and score) goes up. False if not indexed."""
+        with self._lock:
+            index = self._indexes.get(destination)
+            return index is not None and index.bump(trip_id)
+
+    def observe_fare(self, destination, fare):
+        """Feed a flight fare seen for this destination (booking amount, cheapest search result)."""
+        if not fare or fare <= 0:
+            return
+        with self._lock:
+            previous = self._fares.get(destination)
+            current = fare if previous is None else previous + FARE_ALPHA * (fare - previous)
+            self._fares[destination] = current
+            index = self._indexes.get(destination)
+            if index is not None and abs(current - index.fare) > FARE_DRIFT * index.fare:
+                items = [item for _, item in index.items.values()]
+                self._indexes[destination] = _DestinationIndex(items, current)
@@ -1,9 +1,24 @@
-from flask import Flask, jsonify, abort
+from flask import Flask, jsonify, abort, request
 from flask_cors import CORS
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from googleapiclient.discovery import build
 from dotenv import load_dotenv
-import os, time, random, logging, json
+import os, sys, time, random, logging, json, threading
+from concurrent.futures import ThreadPoolExecutor
+from sentiment_timeseries import SentimentStore, RANGES
+from mock_feeder import FORMATS, LOG_DIR, PostLogTailer
+
+# travelease_common repo root par hai (Docker image mein /app ke andar)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from travelease_common.admission import admit, init_admission
+from travelease_common.cache import get_cache
+from travelease_common.debug import init_debug
+from travelease_common.http_cache import ResponseCache, json_response
+from travelease_common.metrics import init_metrics, track_cache, track_dependency
+from travelease_common.startup import lazy, lazy_import, register_warmup, warm_up
+
+# Heavy imports (googleapiclient ~150 ms, VADER lexicon) pehli use / warm-up par
+discovery = lazy_import("googleapiclient.discovery")
+httplib2 = lazy_import("httplib2")
+vader = lazy_import("vaderSentiment.vaderSentiment")
 
 # ------------------------
 # CONFIGURATION
@@ -11,25 +26,59 @@ import os, time, random, logging, json
 load_dotenv()
 app = Flask(__name__)
 CORS(app)
+# Per-route latency histograms + GET /metrics
+init_metrics(app, "crowdpulse")
+# Slow request span logs + /debug/profile (DEBUG_TOKEN ke saath)
+init_debug(app)
+# Rate limits (global + per client) -> 429; YouTube calls "youtube" guard se
+# (concurrency cap + daily quota budget; overload par static fallback videos)
+init_admission(app)
 
 logging.basicConfig(level=logging.INFO, format='[%(asctime)s] %(levelname)s: %(message)s')
 
 # --- YOUTUBE API KEY ---
 # Removed hardcoded fallback key — will use environment variable set via Jenkins and Docker build arg
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY", "").strip()
+# Optional override (e.g. local YouTube stand-in for load tests)
+YOUTUBE_API_ENDPOINT = os.getenv("YOUTUBE_API_ENDPOINT", "").strip()
+YOUTUBE_TIMEOUT = float(os.getenv("YOUTUBE_TIMEOUT", "3.0"))
 
 if not YOUTUBE_API_KEY:
     logging.warning("⚠️ No YouTube API key found in environment; CrowdPulse will use fallback data.")
 
-try:
-    youtube = build("youtube", "v3", developerKey=YOUTUBE_API_KEY) if YOUTUBE_API_KEY else None
-    if youtube:
+
+def _build_youtube():
+    if not YOUTUBE_API_KEY:
+        return None
+    try:
+        client_options = {"api_endpoint": YOUTUBE_API_ENDPOINT} if YOUTUBE_API_ENDPOINT else None
+        client = discovery.build("youtube", "v3", developerKey=YOUTUBE_API_KEY, client_options=client_options)
         logging.info("✅ YouTube API client initialized successfully (live data enabled).")
-except Exception as e:
-    youtube = None
-    logging.error(f"Failed to initialize YouTube client: {e}")
+        return client
+    except Exception as e:
+        logging.error(f"Failed to initialize YouTube client: {e}")
+        return None
+
+
+# youtube.get() -> shared service object (None = fallback data)
+youtube = lazy(_build_youtube)
+_thread_http = threading.local()
+
+
+def _youtube_http():
+    # httplib2.Http thread-safe nahi hai: ek shared connection par do threads
+    # ek doosre ka response padh kar hang ho jate the -> har thread ka apna
+    http = getattr(_thread_http, "http", None)
+    if http is None:
+        http = _thread_http.http = httplib2.Http(timeout=YOUTUBE_TIMEOUT)
+    return http
+
 
-analyzer = SentimentIntensityAnalyzer()
+analyzer = lazy(lambda: vader.SentimentIntensityAnalyzer())
+
+# Worker traffic lene se pehle imports + lexicon + client ready (koi API call nahi)
+register_warmup("sentiment", lambda: analyzer.polarity_scores("warm up"))
+register_warmup("youtube", youtube.get)
 
 CITY_MAP = {
     "DEL": "Delhi", "BOM": "Mumbai", "CCU": "Kolkata", "MAA": "Chennai", "GOI": "Goa",
@@ -38,8 +87,25 @@ CITY_MAP = {
     "LHR": "London", "NYC": "New York", "LAX": "Los Angeles", "CDG": "Paris", "TOK": "Tokyo"
 }
 
-CACHE = {}
+# Shared across workers/tasks when CACHE_BACKEND=sqlite|redis
+CACHE = track_cache(get_cache("crowdpulse"))
 TTL = 900  # 15 minutes
+# Serialized + compressed pulses (ETag / 304); browser 5 min tak reuse kare
+PULSE_RESPONSES = ResponseCache("crowdpulse")
+PULSE_CACHE_CONTROL = os.getenv("PULSE_CACHE_CONTROL", "public, max-age=300")
+
+# Multi-city requests
+MAX_MULTI_CODES = 20
+FETCH_POOL = ThreadPoolExecutor(max_workers=8)
+
+# Per-city sentiment history (fixed-memory ring buffers). Process ke andar hai:
+# CrowdPulse single worker chalta hai (serving.py, uvicorn bhi --workers 1)
+SENTIMENT_HISTORY = SentimentStore()
+# History feeder ke post log (mock_feeder.py, FEEDER_LOG_DIR) se bharti hai,
+# pulse cache se nahi -> har ingested post count hota hai, cache hit ho ya miss
+SENTIMENT_POLL_SECONDS = float(os.getenv("SENTIMENT_POLL_SECONDS", "5"))
+_ingest_started = False
+_ingest_lock = threading.Lock()
 
 # Static fallback data (minimal but attractive)
 STATIC_VLOGS = {
@@ -81,20 +147,55 @@ def get_social_posts(city_name: str):
     return posts
 
 
+def _city_code_for(city_name: str):
+    return next((k for k, v in CITY_MAP.items() if v.lower() == city_name.lower()), None)
+
+
+def _youtube_search_request(city_name: str):
+    search_query = f"{city_name} travel vlog 2024 tourism"
+    return youtube.get().search().list(
+        q=search_query,
+        part="snippet",
+        type="video",
+        order="viewCount",
+        maxResults=5
+    )
+
+
+def _videos_from_response(res):
+    videos = []
+    for item in res.get("items", []):
+        video_id = item["id"]["videoId"]
+        snippet = item["snippet"]
+        videos.append({
+            "title": snippet["title"],
+            "url": f"https://www.youtube.com/watch?v={video_id}",
+            "thumbnail": snippet["thumbnails"]["high"]["url"]
+        })
+    return videos
+
+
+def _fallback_videos(code, city_name: str):
+    return STATIC_VLOGS.get(code, [{
+        "title": f"Explore {city_name} | Travel Highlights",
+        "url": "https://www.youtube.com",
+        "thumbnail": "https://placehold.co/200x120/6c2bd9/white?text=Vlog"
+    }])
+
+
 def get_youtube_videos(city_name: str):
     """
     Fetch actual YouTube vlog data for the given city.
     Falls back to static samples or placeholders if API quota is exceeded.
     """
-    code = next((k for k, v in CITY_MAP.items() if v.lower() == city_name.lower()), None)
-    videos = []
+    code = _city_code_for(city_name)
 
     # First, return static known vlogs if available
     if code and code in STATIC_VLOGS:
         return STATIC_VLOGS[code]
 
     # If YouTube API unavailable
-    if not youtube:
+    if not youtube.get():
         logging.warning("YouTube client unavailable. Using static fallback.")
         return STATIC_VLOGS.get(code, [{
             "title": f"Top sights in {city_name}",
@@ -103,24 +204,9 @@ def get_youtube_videos(city_name: str):
         }])
 
     try:
-        search_query = f"{city_name} travel vlog 2024 tourism"
-        req = youtube.search().list(
-            q=search_query,
-            part="snippet",
-            type="video",
-            order="viewCount",
-            maxResults=5
-        )
-        res = req.execute()
-
-        for item in res.get("items", []):
-            video_id = item["id"]["videoId"]
-            snippet = item["snippet"]
-            videos.append({
-                "title": snippet["title"],
-                "url": f"https://www.youtube.com/watch?v={video_id}",
-                "thumbnail": snippet["thumbnails"]["high"]["url"]
-            })
+        with admit("youtube"), track_dependency("youtube", "search"):
+            response = _youtube_search_request(city_name).execute(http=_youtube_http())
+        videos = _videos_from_response(response)
 
         # If API returned nothing, fallback to static
         if not videos:
@@ -128,14 +214,118 @@ def get_youtube_videos(city_name: str):
 
     except Exception as e:
         logging.warning(f"[YouTube API Fallback for {city_name}] {e}")
-        videos = STATIC_VLOGS.get(code, [{
-            "title": f"Explore {city_name} | Travel Highlights",
-            "url": "https://www.youtube.com",
-            "thumbnail": "https://placehold.co/200x120/6c2bd9/white?text=Vlog"
-        }])
+        videos = _fallback_videos(code, city_name)
     return videos
 
 
+def get_youtube_videos_bulk(city_names):
+    """
+    Fetch vlogs for several cities at once.
+    Live lookups are combined into a single YouTube batch HTTP request; any
+    city the batch could not answer (per-city error, empty result or the
+    whole batch failing) gets the static/placeholder fallback right away.
+    Per-city retries would run serially, N x timeout, and spend quota on
+    the same failing searches.
+    """
+    results = {}
+    pending = []
+    for city_name in city_names:
+        code = _city_code_for(city_name)
+        if (code and code in STATIC_VLOGS) or not youtube.get():
+            results[city_name] = get_youtube_videos(city_name)
+        else:
+            pending.append(city_name)
+
+    if len(pending) == 1:
+        results[pending[0]] = get_youtube_videos(pending[0])
+    elif pending:
+        def _collect(request_id, response, exception):
+            if exception is not None:
+                logging.warning(f"[YouTube batch] {pending[int(request_id)]}: {exception}")
+                return
+            videos = _videos_from_response(response)
+            if videos:
+                results[pending[int(request_id)]] = videos
+
+        try:
+            batch = youtube.get().new_batch_http_request(callback=_collect)
+            for i, city_name in enumerate(pending):
+                batch.add(_youtube_search_request(city_name), request_id=str(i))
+            # Batch ki har search quota mein alag count hoti hai
+            with admit("youtube", cost=len(pending)), track_dependency("youtube", "batch"):
+                batch.execute(http=_youtube_http())
+        except Exception as e:
+            logging.warning(f"[YouTube batch failed, using static fallback] {e}")
+
+        for city_name in pending:
+            if city_name not in results:
+                results[city_name] = _fallback_videos(_city_code_for(city_name), city_name)
+    return results
+
+
+def _get_cached_pulse(city_code):
+    return CACHE.get(city_code)
+
+
+def _build_pulse(city_code, social_posts, youtube_videos):
+    data = {
+        "city_code": city_code,
+        "city_name": CITY_MAP[city_code],
+        "social_media_posts": social_posts,
+        "youtube_videos": youtube_videos,
+        "last_updated": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    CACHE.set(city_code, data, TTL)
+    return data
+
+
+# ------------------------
+# SENTIMENT INGESTION
+# ------------------------
+
+def make_tailers(log_dir=LOG_DIR):
+    """One PostLogTailer per (city code, log format); new posts only."""
+    return [(code, PostLogTailer(city_name, fmt, log_dir))
+            for code, city_name in CITY_MAP.items() for fmt in FORMATS]
+
+
+def ingest_post_logs(tailers, store=None):
+    """Record every post appended to the feeder logs since the last poll; returns how many."""
+    store = SENTIMENT_HISTORY if store is None else store
+    total, now = 0, time.time()
+    for code, tailer in tailers:
+        by_ts = {}
+        for post in tailer.poll():
+            by_ts.setdefault(post.get("ts") or now, []).append(post)
+        for ts, posts in by_ts.items():
+            store.record_posts(code, posts, ts)
+            total += len(posts)
+    return total
+
+
+def _ingest_loop(tailers):
+    while True:
+        try:
+            ingest_post_logs(tailers)
+        except Exception as e:
+            logging.warning(f"Sentiment ingestion failed: {e}")
+        time.sleep(SENTIMENT_POLL_SECONDS)
+
+
+def start_sentiment_ingest():
+    """Start the post-log ingestion thread (once per process; warm-up se)."""
+    global _ingest_started
+    with _ingest_lock:
+        if _ingest_started:
+            return
+        _ingest_started = True
+    threading.Thread(target=_ingest_loop, args=(make_tailers(),), daemon=True).start()
+
+
+# Worker process mein (gunicorn post_worker_init / ASGI lifespan / dev server)
+register_warmup("sentiment_ingest", start_sentiment_ingest)
+
+
 # ------------------------
 # ROUTES
 # ------------------------
@@ -155,13 +345,16 @@ def health_check():
 @app.route("/api/crowdpulse/<string:city_code>")
 def get_city_pulse(city_code):
     city_code = city_code.upper()
-    now = time.time()
+
+    entry = PULSE_RESPONSES.get(city_code)
+    if entry is not None:
+        return json_response(entry, PULSE_CACHE_CONTROL)
 
     # Cached
-    cached = CACHE.get(city_code)
-    if cached and now - cached["timestamp"] < TTL:
+    cached = _get_cached_pulse(city_code)
+    if cached:
         logging.info(f"Returning cached data for {city_code}")
-        return jsonify(cached["data"])
+        return json_response(PULSE_RESPONSES.put(city_code, cached, TTL), PULSE_CACHE_CONTROL)
 
     city_name = CITY_MAP.get(city_code)
     if not city_name:
@@ -171,20 +364,69 @@ def get_city_pulse(city_code):
     social_posts = get_social_posts(city_name)
     youtube_videos = get_youtube_videos(city_name)
 
-    data = {
-        "city_code": city_code,
-        "city_name": city_name,
-        "social_media_posts": social_posts,
-        "youtube_videos": youtube_videos,
-        "last_updated": time.strftime("%Y-%m-%d %H:%M:%S"),
-    }
+    pulse = _build_pulse(city_code, social_posts, youtube_videos)
+    return json_response(PULSE_RESPONSES.put(city_code, pulse, TTL), PULSE_CACHE_CONTROL)
+
+@app.route("/api/crowdpulse")
+def get_multi_city_pulse():
+    """
+    Pulses for many cities in one response: /api/crowdpulse?codes=DEL,BOM,DXB
+    Cache hits are served directly; misses fetch YouTube (as one batch) in the
+    background while social posts are generated for each city.
+    """
+    codes = []
+    for code in request.args.get("codes", "").split(","):
+        code = code.strip().upper()
+        if code and code not in codes:
+            codes.append(code)
+
+    if not codes:
+        return jsonify({"error": "Missing required query parameter: codes"}), 400
+    if len(codes) > MAX_MULTI_CODES:
+        return jsonify({"error": f"Too many city codes (max {MAX_MULTI_CODES})"}), 400
+
+    pulses = {}
+    not_found = [code for code in codes if code not in CITY_MAP]
+    misses = []
+    for code in codes:
+        if code in CITY_MAP:
+            cached = _get_cached_pulse(code)
+            if cached:
+                pulses[code] = cached
+            else:
+                misses.append(code)
+
+    if misses:
+        logging.info(f"Fetching live data for {', '.join(misses)}")
+        names = [CITY_MAP[code] for code in misses]
+        videos_future = FETCH_POOL.submit(get_youtube_videos_bulk, names)
+        posts_futures = {code: FETCH_POOL.submit(get_social_posts, CITY_MAP[code]) for code in misses}
+        videos_by_city = videos_future.result()
+
+        for code in misses:
+            pulses[code] = _build_pulse(code, posts_futures[code].result(), videos_by_city[CITY_MAP[code]])
+
+    return jsonify({
+        "pulses": {code: pulses[code] for code in codes if code in pulses},
+        "not_found": not_found
+    })
+
+@app.route("/api/crowdpulse/<string:city_code>/trend")
+def get_city_trend(city_code):
+    city_code = city_code.upper()
+    if city_code not in CITY_MAP:
+        abort(404, description="City code not found")
+
+    range_key = request.args.get("range", "24h")
+    if range_key not in RANGES:
+        return jsonify({"error": f"Unsupported range. Use one of: {', '.join(RANGES)}"}), 400
 
-    CACHE[city_code] = {"data": data, "timestamp": now}
-    return jsonify(data)
+    return jsonify(SENTIMENT_HISTORY.trend(city_code, range_key))
 
 
 # ------------------------
-# ENTRY POINT
+# ENTRY POINT (dev server; production: python -m travelease_common.serving crowdpulse)
 # ------------------------
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5010, debug=False)
+    warm_up()
+    app.run(host="0.0.0.0", port=int(os.getenv("PORT", 5010)), debug=False)
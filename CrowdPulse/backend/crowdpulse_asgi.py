@@ -0,0 +1,322 @@
+# backend/crowdpulse_asgi.py
+"""
+Asyncio (ASGI) serving mode for CrowdPulse.
+
+Same routes aur same JSON as crowdpulse_app.py, lekin YouTube lookups
+non-blocking HTTP (httpx) se hote hain, ek semaphore se bounded hain aur
+har call ka apna timeout hai (slot ka wait bhi usi mein). Social posts ki
+VADER scoring thread mein hoti hai. Timeout / error par STATIC_VLOGS fallback
+milta hai, isliye ek slow YouTube call koi worker block nahi karta.
+
+Run (single worker -- sentiment history process ke andar hai):
+    uvicorn crowdpulse_asgi:app --host 0.0.0.0 --port 5010
+or:
+    python crowdpulse_asgi.py
+"""
+import asyncio
+import json
+import logging
+import math
+import os
+from urllib.parse import parse_qs
+
+import httpx
+
+from crowdpulse_app import (
+    CITY_MAP, MAX_MULTI_CODES, PULSE_CACHE_CONTROL, PULSE_RESPONSES, SENTIMENT_HISTORY, STATIC_VLOGS, TTL,
+    YOUTUBE_API_ENDPOINT, YOUTUBE_API_KEY, YOUTUBE_TIMEOUT,
+    _build_pulse, _city_code_for, _fallback_videos, _get_cached_pulse,
+    _videos_from_response, get_social_posts, get_youtube_videos, warm_up,
+)
+from sentiment_timeseries import RANGES
+from travelease_common.admission import Overloaded, admit, check_request, client_key, internal_caller
+from travelease_common.debug import authorized, begin_request, end_request, profile_response, span, spans_response
+from travelease_common.http_cache import conditional
+from travelease_common.metrics import render_metrics, request_finished, request_started, track_dependency
+
+# ------------------------
+# CONFIGURATION
+# ------------------------
+YOUTUBE_SEARCH_URL = (YOUTUBE_API_ENDPOINT or "https://www.googleapis.com").rstrip("/") + "/youtube/v3/search"
+YOUTUBE_MAX_CONCURRENCY = int(os.getenv("YOUTUBE_MAX_CONCURRENCY", "50"))
+
+_http = None
+_youtube_slots = None
+_inflight = {}  # city_code -> asyncio.Task (single-flight per city)
+
+
+# ------------------------
+# ASYNC LOOKUPS
+# ------------------------
+
+async def _youtube_search(params):
+    # Slot ka intezaar bhi caller ke timeout ke andar hai (wait_for isse wrap karta hai)
+    async with _youtube_slots:
+        # wait=0: guard full ho to turant Overloaded -> fallback (event loop block nahi hota)
+        with admit("youtube", wait=0), track_dependency("youtube", "search"):
+            res = await _http.get(YOUTUBE_SEARCH_URL, params=params)
+            res.raise_for_status()
+    return res.json()
+
+
+async def get_youtube_videos_async(city_name: str):
+    """
+    Non-blocking version of get_youtube_videos().
+    Static / no-key cities reuse the sync helper (no network involved);
+    live lookups are bounded by a semaphore, and YOUTUBE_TIMEOUT covers both
+    waiting for a slot and the call itself.
+    """
+    code = _city_code_for(city_name)
+    if not YOUTUBE_API_KEY or _http is None:
+        return get_youtube_videos(city_name)
+    if code and code in STATIC_VLOGS:
+        return get_youtube_videos(city_name)
+
+    params = {
+        "key": YOUTUBE_API_KEY,
+        "q": f"{city_name} travel vlog 2024 tourism",
+        "part": "snippet",
+        "type": "video",
+        "order": "viewCount",
+        "maxResults": 5,
+    }
+    try:
+        videos = _videos_from_response(await asyncio.wait_for(_youtube_search(params), YOUTUBE_TIMEOUT))
+        if not videos:
+            raise ValueError("Empty response")
+        return videos
+    except Exception as e:
+        logging.warning(f"[YouTube API Fallback for {city_name}] {type(e).__name__}: {e}")
+        return _fallback_videos(code, city_name)
+
+
+async def _fetch_pulse(city_code):
+    city_name = CITY_MAP[city_code]
+    logging.info(f"Fetching live data for {city_name}")
+    videos_task = asyncio.ensure_future(get_youtube_videos_async(city_name))
+    # VADER scoring CPU/sync kaam hai -> thread mein, loop baaki requests serve karta rahe
+    social_posts = await asyncio.to_thread(get_social_posts, city_name)
+    return _build_pulse(city_code, social_posts, await videos_task)
+
+
+async def get_pulse(city_code):
+    """Cached pulse, or a live fetch shared by all concurrent callers for that city."""
+    cached = _get_cached_pulse(city_code)
+    if cached:
+        return cached
+    task = _inflight.get(city_code)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_pulse(city_code))
+        _inflight[city_code] = task
+        task.add_done_callback(lambda _: _inflight.pop(city_code, None))
+    return await task
+
+
+# ------------------------
+# ROUTES
+# ------------------------
+
+async def home(scope, query):
+    return 200, "text/html; charset=utf-8", "<h3>🌍 CrowdPulse API running</h3>"
+
+
+async def ping(scope, query):
+    return 200, "text/plain; charset=utf-8", "pong"
+
+
+async def health_check(scope, query):
+    return 200, "text/plain; charset=utf-8", "OK"
+
+
+async def city_pulse(scope, query, city_code):
+    city_code = city_code.upper()
+    if city_code not in CITY_MAP:
+        return 404, None, {"error": "City code not found"}
+    entry = PULSE_RESPONSES.get(city_code)
+    if entry is None:
+        entry = PULSE_RESPONSES.put(city_code, await get_pulse(city_code), TTL)
+    headers = dict(scope.get("headers", []))
+    status, body, extra = conditional(
+        entry,
+        headers.get(b"if-none-match", b"").decode("latin-1"),
+        headers.get(b"accept-encoding", b"").decode("latin-1"),
+        PULSE_CACHE_CONTROL,
+        headers.get(b"accept", b"").decode("latin-1"),
+    )
+    return status, extra.pop("Content-Type", "application/json"), body, extra
+
+
+async def city_trend(scope, query, city_code):
+    city_code = city_code.upper()
+    if city_code not in CITY_MAP:
+        return 404, None, {"error": "City code not found"}
+    range_key = query.get("range", ["24h"])[0]
+    if range_key not in RANGES:
+        return 400, None, {"error": f"Unsupported range. Use one of: {', '.join(RANGES)}"}
+    return 200, None, SENTIMENT_HISTORY.trend(city_code, range_key)
+
+
+async def multi_city_pulse(scope, query):
+    codes = []
+    for code in query.get("codes", [""])[0].split(","):
+        code = code.strip().upper()
+        if code and code not in codes:
+            codes.append(code)
+    if not codes:
+        return 400, None, {"error": "Missing required query parameter: codes"}
+    if len(codes) > MAX_MULTI_CODES:
+        return 400, None, {"error": f"Too many city codes (max {MAX_MULTI_CODES})"}
+
+    known = [code for code in codes if code in CITY_MAP]
+    results = await asyncio.gather(*(get_pulse(code) for code in known))
+    return 200, None, {
+        "pulses": dict(zip(known, results)),
+        "not_found": [code for code in codes if code not in CITY_MAP],
+    }
+
+
+async def metrics(scope, query):
+    body, content_type = render_metrics()
+    return 200, content_type, body.decode("utf-8")
+
+
+def _debug_token(scope):
+    return dict(scope.get("headers", [])).get(b"x-debug-token", b"").decode("latin-1")
+
+
+async def debug_profile(scope, query):
+    if not authorized(_debug_token(scope)):
+        return 404, None, {"error": "Not found"}
+    # Sampling thread pool mein -> event loop chalta rehta hai aur profile hota hai
+    # (yeh request khud in-flight hai, isliye loop thread threads=requests mein aata hai)
+    status, body, _ = await asyncio.get_running_loop().run_in_executor(
+        None, profile_response, {k: v[0] for k, v in query.items()})
+    return status, "text/plain; charset=utf-8", body
+
+
+async def debug_spans(scope, query):
+    if not authorized(_debug_token(scope)):
+        return 404, None, {"error": "Not found"}
+    status, body = spans_response({k: v[0] for k, v in query.items()})
+    return status, None, body
+
+
+# handler -> Flask rule (same `route` label as the WSGI app)
+ROUTE_LABELS = {
+    home: "/", ping: "/ping", health_check: "/api/crowdpulse/health", metrics: "/metrics",
+    debug_profile: "/debug/profile", debug_spans: "/debug/spans",
+    multi_city_pulse: "/api/crowdpulse", city_pulse: "/api/crowdpulse/<string:city_code>",
+    city_trend: "/api/crowdpulse/<string:city_code>/trend",
+}
+
+
+def _route(path):
+    if path == "/metrics":
+        return metrics, ()
+    if path == "/debug/profile":
+        return debug_profile, ()
+    if path == "/debug/spans":
+        return debug_spans, ()
+    if path == "/":
+        return home, ()
+    if path == "/ping":
+        return ping, ()
+    if path == "/api/crowdpulse/health":
+        return health_check, ()
+    if path in ("/api/crowdpulse", "/api/crowdpulse/"):
+        return multi_city_pulse, ()
+    parts = path.strip("/").split("/")
+    if len(parts) == 3 and parts[:2] == ["api", "crowdpulse"]:
+        return city_pulse, (parts[2],)
+    if len(parts) == 4 and parts[:2] == ["api", "crowdpulse"] and parts[3] == "trend":
+        return city_trend, (parts[2],)
+    return None, ()
+
+
+# ------------------------
+# ASGI APP
+# ------------------------
+
+async def _lifespan(receive, send):
+    global _http, _youtube_slots
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            _youtube_slots = asyncio.Semaphore(YOUTUBE_MAX_CONCURRENCY)
+            _http = httpx.AsyncClient(
+                timeout=YOUTUBE_TIMEOUT,
+                limits=httpx.Limits(max_connections=YOUTUBE_MAX_CONCURRENCY),
+            )
+            # Sentiment lexicon etc. startup complete hone se pehle (loop block nahi hota)
+            await asyncio.get_running_loop().run_in_executor(None, warm_up)
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            if _http is not None:
+                await _http.aclose()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        return await _lifespan(receive, send)
+    if scope["type"] != "http":
+        return
+
+    started = request_started()
+    spans = begin_request()
+    handler, args = _route(scope["path"])
+    extra_headers = {}
+    headers = dict(scope.get("headers", []))
+    try:
+        check_request(client_key(headers.get(b"x-forwarded-for", b"").decode("latin-1"),
+                                 (scope.get("client") or [None])[0]), scope["path"],
+                      internal_caller(headers.get(b"x-internal-key", b"").decode("latin-1")))
+        overloaded = None
+    except Overloaded as e:
+        overloaded = e
+    if overloaded is not None:
+        status, content_type, body = 429, None, {"error": "Service is busy, please retry shortly"}
+        extra_headers = {"Retry-After": str(max(1, math.ceil(overloaded.retry_after)))}
+    elif scope["method"] not in ("GET", "HEAD"):
+        status, content_type, body = 405, None, {"error": "Method not allowed"}
+    elif handler is None:
+        status, content_type, body = 404, None, {"error": "Not found"}
+    else:
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        try:
+            # Handlers (status, content_type, body) ya + extra headers lautate hain
+            status, content_type, body, *extra = await handler(scope, query, *args)
+            if extra:
+                extra_headers = extra[0]
+        except Exception as e:
+            logging.error(f"Unhandled error on {scope['path']}: {e}")
+            status, content_type, body = 500, None, {"error": "Internal server error"}
+
+    if content_type is None:
+        content_type = "application/json"
+        with span("serialize"):
+            payload = json.dumps(body).encode("utf-8")
+    else:
+        payload = body if isinstance(body, bytes) else body.encode("utf-8")
+
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", content_type.encode("latin-1")),
+            (b"content-length", str(len(payload)).encode("latin-1")),
+            (b"access-control-allow-origin", b"*"),
+        ] + [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in extra_headers.items()],
+    })
+    await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else payload})
+    request_finished(started, scope["method"], ROUTE_LABELS.get(handler, "<unmatched>"), status)
+    end_request(spans, f"{scope['method']} {scope['path']}")
+
+
+# ------------------------
+# ENTRY POINT
+# ------------------------
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=5010, log_level="info")
@@ -1,11 +1,15 @@
 # backend/mock_feeder.py
 import os
+import sys
 import json
 import random
+import struct
 import time
+import argparse
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
-os.makedirs(DATA_DIR, exist_ok=True)
+LOG_DIR = os.getenv("FEEDER_LOG_DIR", os.path.join(DATA_DIR, "log"))
+os.makedirs(LOG_DIR, exist_ok=True)
 
 CITIES = [
     "Goa", "Manali", "Delhi", "Mumbai", "Paris", "New York", "Tokyo",
@@ -35,32 +39,314 @@ EXAMPLES = {
         "Not worth the hype, disappointed."
     ]
 }
-def generate_mock_posts(city):
+
+# Region bias -> (positive, negative, neutral) weights
+BIAS_WEIGHTS = {
+    "positive": (0.6, 0.2, 0.2),
+    "neutral":  (0.3, 0.2, 0.5),
+    "negative": (0.2, 0.5, 0.3),
+}
+MOOD_ORDER = ["positive", "negative", "neutral"]
+
+# ------------------------
+# APPEND-ONLY POST LOG
+# ------------------------
+# Har city ki apni directory hai: data/log/<city>/
+#   active.<ext>            -> abhi likha ja raha segment (append-only)
+#   segment-000001.<ext>    -> sealed segments (kabhi modify nahi hote)
+# Rotation: active file ko fsync karke os.replace() se sealed naam par
+# rename kiya jata hai, isliye reader ko kabhi half-written segment nahi milta.
+#
+# Formats:
+#   ndjson -> ek post per line: {"text": ..., "sentiment": ..., "ts": ...}
+#   binary -> length-prefixed records: <I length><B sentiment><d ts><utf-8 text>
+SEGMENT_MAX_BYTES = int(os.getenv("FEEDER_SEGMENT_MAX_BYTES", 64 * 1024 * 1024))
+FORMATS = {"ndjson": "ndjson", "binary": "bin"}
+SENTIMENT_CODES = {"positive": 0, "negative": 1, "neutral": 2}
+CODE_SENTIMENTS = {v: k for k, v in SENTIMENT_CODES.items()}
+RECORD_HEADER = struct.Struct("<IBd")
+
+
+def city_slug(city):
+    return city.lower().replace(" ", "")
+
+
+def encode_post(post, fmt):
+    """Encode a single post dict for the given log format."""
+    if fmt == "binary":
+        text = post["text"].encode("utf-8")
+        return RECORD_HEADER.pack(len(text), SENTIMENT_CODES[post["sentiment"]], post.get("ts", 0.0)) + text
+    return (json.dumps(post, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class PostLog:
+    """Append-only, segment-rotating post log for a single city."""
+
+    def __init__(self, city, fmt="ndjson", log_dir=LOG_DIR, segment_max_bytes=SEGMENT_MAX_BYTES):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown log format: {fmt}")
+        self.city = city
+        self.fmt = fmt
+        self.ext = FORMATS[fmt]
+        self.dir = os.path.join(log_dir, city_slug(city))
+        self.segment_max_bytes = segment_max_bytes
+        os.makedirs(self.dir, exist_ok=True)
+        self.active_path = os.path.join(self.dir, f"active.{self.ext}")
+        self._fh = open(self.active_path, "ab")
+        self._size = self._fh.tell()
+
+    def _next_segment_path(self):
+        sealed = [f for f in os.listdir(self.dir) if f.startswith("segment-") and f.endswith(self.ext)]
+        seq = max((int(f.split("-")[1].split(".")[0]) for f in sealed), default=0) + 1
+        return os.path.join(self.dir, f"segment-{seq:06d}.{self.ext}")
+
+    def rotate(self):
+        """Seal the active segment atomically and start a fresh one."""
+        if self._size == 0:
+            return None
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._fh.close()
+        sealed_path = self._next_segment_path()
+        os.replace(self.active_path, sealed_path)
+        self._fh = open(self.active_path, "ab")
+        self._size = 0
+        return sealed_path
+
+    def append_bytes(self, payload):
+        """Append pre-encoded records; rotates first if the segment would overflow."""
+        if self._size and self._size + len(payload) > self.segment_max_bytes:
+            self.rotate()
+        self._fh.write(payload)
+        self._size += len(payload)
+
+    def append(self, posts):
+        self.append_bytes(b"".join(encode_post(p, self.fmt) for p in posts))
+
+    def flush(self):
+        self._fh.flush()
+
+    def close(self):
+        self._fh.flush()
+        self._fh.close()
+
+
+def decode_records(data, fmt):
+    """Decode the complete records in a byte buffer -> (posts, bytes_consumed).
+
+    A torn tail (record abhi likha ja raha hai) consumed nahi hota, taaki
+    tailer agli poll mein usi offset se poora record padh sake.
+    """
     posts = []
+    if fmt == "ndjson":
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            if line:
+                posts.append(json.loads(line))
+        return posts, end
+    offset, end = 0, len(data)
+    while offset + RECORD_HEADER.size <= end:
+        length, code, ts = RECORD_HEADER.unpack_from(data, offset)
+        if offset + RECORD_HEADER.size + length > end:
+            break  # torn tail write; ignore
+        start = offset + RECORD_HEADER.size
+        posts.append({"text": data[start:start + length].decode("utf-8"),
+                      "sentiment": CODE_SENTIMENTS[code], "ts": ts})
+        offset = start + length
+    return posts, offset
+
+
+def _decode_segment(path, fmt):
+    with open(path, "rb") as f:
+        posts, _ = decode_records(f.read(), fmt)
+    yield from posts
+
+
+def read_posts(city, fmt="ndjson", log_dir=LOG_DIR):
+    """Yield all posts for a city: sealed segments in order, then the active one."""
+    city_dir = os.path.join(log_dir, city_slug(city))
+    if not os.path.isdir(city_dir):
+        return
+    ext = FORMATS[fmt]
+    sealed = sorted(f for f in os.listdir(city_dir) if f.startswith("segment-") and f.endswith(ext))
+    for name in sealed + [f"active.{ext}"]:
+        path = os.path.join(city_dir, name)
+        if os.path.exists(path):
+            yield from _decode_segment(path, fmt)
+
+
+class PostLogTailer:
+    """
+    Follows one city's post log: poll() returns the posts appended since the
+    last poll (ingestion side, e.g. CrowdPulse sentiment history).
+
+    Active file aadha padha ho aur beech mein rotate ho jaye to wahi inode
+    sealed segment ban jata hai -> offset inode se yaad rakha jata hai, isliye
+    na koi post chhoot-ta hai na do baar aata hai.
+    """
+
+    def __init__(self, city, fmt="ndjson", log_dir=LOG_DIR, from_start=False):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown log format: {fmt}")
+        self.fmt = fmt
+        self.ext = FORMATS[fmt]
+        self.dir = os.path.join(log_dir, city_slug(city))
+        self.active_path = os.path.join(self.dir, f"active.{self.ext}")
+        self._done = set()    # sealed segments already consumed
+        self._offsets = {}    # inode -> bytes consumed (partially read files)
+        if not from_start:
+            # Purana log skip: sirf naye posts (sealed segments GBs ke ho sakte hain)
+            self._done.update(self._sealed())
+            self._read_new(self.active_path)
+
+    def _sealed(self):
+        if not os.path.isdir(self.dir):
+            return []
+        return sorted(f for f in os.listdir(self.dir)
+                      if f.startswith("segment-") and f.endswith(self.ext) and f not in self._done)
+
+    def _read_new(self, path, sealed=False):
+        try:
+            with open(path, "rb") as f:
+                inode = os.fstat(f.fileno()).st_ino
+                offset = self._offsets.get(inode, 0)
+                f.seek(offset)
+                posts, used = decode_records(f.read(), self.fmt)
+        except FileNotFoundError:
+            return []
+        if sealed:
+            self._offsets.pop(inode, None)
+        else:
+            self._offsets[inode] = offset + used
+        return posts
+
+    def poll(self):
+        posts = []
+        for name in self._sealed():
+            posts.extend(self._read_new(os.path.join(self.dir, name), sealed=True))
+            self._done.add(name)
+        posts.extend(self._read_new(self.active_path))
+        return posts
+
+
+# ------------------------
+# POST GENERATION
+# ------------------------
+def generate_mock_posts(city, log=None, fmt="ndjson"):
+    """Append one cycle (40-100 posts) of region-biased posts to the city's log."""
     # Randomly bias sentiment by region for realism
-    bias = random.choice(["positive", "neutral", "negative"])
-    for _ in range(random.randint(40, 100)):
-        mood = random.choices(
-            ["positive", "negative", "neutral"],
-            weights={
-                "positive": [0.6, 0.2, 0.3][["positive","neutral","negative"].index(bias)],
-                "negative": [0.2, 0.3, 0.5][["positive","neutral","negative"].index(bias)],
-                "neutral":  [0.2, 0.5, 0.2][["positive","neutral","negative"].index(bias)]
-            }[["positive","neutral","negative"].index(bias)],
-            k=1
-        )[0]
-        posts.append({
-            "text": random.choice(EXAMPLES[mood]),
-            "sentiment": mood
-        })
-    with open(os.path.join(DATA_DIR, f"{city.lower()}_posts.json"), "w", encoding="utf-8") as f:
-        json.dump(posts, f, indent=2)
+    bias = random.choice(list(BIAS_WEIGHTS))
+    now = time.time()
+    moods = random.choices(MOOD_ORDER, weights=BIAS_WEIGHTS[bias], k=random.randint(40, 100))
+    posts = [{"text": random.choice(EXAMPLES[mood]), "sentiment": mood, "ts": now} for mood in moods]
 
+    owns_log = log is None
+    log = log or PostLog(city, fmt)
+    try:
+        log.append(posts)
+    finally:
+        if owns_log:
+            log.close()
+    return len(posts)
+
+
+def parse_bias(spec):
+    """Parse 'positive=0.7,negative=0.1,neutral=0.2' (or a BIAS_WEIGHTS key) into weights."""
+    if spec in BIAS_WEIGHTS:
+        return BIAS_WEIGHTS[spec]
+    weights = dict.fromkeys(MOOD_ORDER, 0.0)
+    for part in spec.split(","):
+        mood, _, value = part.partition("=")
+        if mood.strip() not in weights:
+            raise ValueError(f"Unknown sentiment in bias: {mood}")
+        weights[mood.strip()] = float(value)
+    if sum(weights.values()) <= 0:
+        raise ValueError("Bias weights must sum to a positive value")
+    return tuple(weights[m] for m in MOOD_ORDER)
+
+
+LOAD_TICK_SECONDS = 0.1  # throttled load: har city ko itne time ka batch ek baar mein
+
+
+def run_load(cities, fmt, weights, rate, duration, batch_size=50_000):
+    """
+    High-volume load generator for benchmarking the ingestion path.
+    The (mood, text) pool is encoded once per batch with that batch's real
+    timestamp, then records are emitted in large joined batches, so
+    throughput is bounded by disk rather than by the Python loop.
+    rate = target posts/minute across all cities (0 = as fast as possible);
+    throttled batches hold ~LOAD_TICK_SECONDS of posts per city, capped at
+    batch_size. Stops at `duration` even in the middle of a city round.
+    """
+    logs = {city: PostLog(city, fmt) for city in cities}
+    templates, pool_weights = [], []
+    for mood, w in zip(MOOD_ORDER, weights):
+        for text in EXAMPLES[mood]:
+            templates.append({"text": text, "sentiment": mood})
+            pool_weights.append(w / len(EXAMPLES[mood]))
+
+    per_second = rate / 60.0 if rate else 0
+    if per_second:
+        batch_size = max(1, min(batch_size, int(per_second * LOAD_TICK_SECONDS / len(cities))))
+    start = time.perf_counter()
+    deadline = start + duration
+    total = 0
+    try:
+        while time.perf_counter() < deadline:
+            for city in cities:
+                if time.perf_counter() >= deadline:
+                    break
+                now = time.time()
+                pool = [encode_post(dict(t, ts=now), fmt) for t in templates]
+                logs[city].append_bytes(b"".join(random.choices(pool, weights=pool_weights, k=batch_size)))
+                total += batch_size
+            if per_second:
+                ahead = total / per_second - (time.perf_counter() - start)
+                ahead = min(ahead, deadline - time.perf_counter())
+                if ahead > 0:
+                    time.sleep(ahead)
+    finally:
+        for log in logs.values():
+            log.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"[LOAD] {total:,} posts in {elapsed:.1f}s -> {total / elapsed * 60:,.0f} posts/min ({fmt})")
+    return total, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CrowdPulse mock sentiment feeder")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="ndjson")
+    parser.add_argument("--interval", type=int, default=120, help="Seconds between normal cycles")
+    parser.add_argument("--load", action="store_true", help="Run high-volume load generation")
+    parser.add_argument("--rate", type=int, default=0, help="Load mode posts/minute (0 = unthrottled)")
+    parser.add_argument("--duration", type=float, default=60, help="Load mode duration in seconds")
+    parser.add_argument("--bias", default="positive",
+                        help="Load mode bias: positive|neutral|negative or positive=0.7,negative=0.1,neutral=0.2")
+    parser.add_argument("--cities", default="", help="Comma-separated subset of cities")
+    args = parser.parse_args(argv)
+
+    cities = [c.strip() for c in args.cities.split(",") if c.strip()] or CITIES
+
+    if args.load:
+        run_load(cities, args.format, parse_bias(args.bias), args.rate, args.duration)
+        return
 
-if __name__ == "__main__":
     print("Generating mock sentiment data...")
-    while True:
-        for city in CITIES:
-            generate_mock_posts(city)
-        print("Cycle complete. Updating again in 2 minutes...")
-        time.sleep(120)
+    logs = {city: PostLog(city, args.format) for city in cities}
+    try:
+        while True:
+            for city in cities:
+                generate_mock_posts(city, logs[city], args.format)
+                logs[city].flush()
+            print(f"Cycle complete. Updating again in {args.interval} seconds...")
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for log in logs.values():
+            log.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,156 @@
+# backend/sentiment_timeseries.py
+"""
+Fixed-memory sentiment time-series for CrowdPulse.
+
+Har city ke liye teen tiers hain (1-minute, 1-hour, 1-day). Har tier ek
+ring buffer hai jo `array` objects par bana hai: ek array bucket start
+times ka aur ek flat array counts ka (positive, negative, neutral).
+Koi per-post Python object store nahi hota, isliye memory fixed rehti hai
+chahe kitne bhi posts ingest ho jayein.
+
+Store process-local hai: har worker ki apni history hoti. Isliye CrowdPulse
+single worker hai (travelease_common.serving, single_worker) -- ek worker
+ke andar threads ek hi store share karte hain (per-city lock).
+"""
+import threading
+import time
+from array import array
+
+SENTIMENTS = ("positive", "negative", "neutral")
+SENTIMENT_INDEX = {s: i for i, s in enumerate(SENTIMENTS)}
+
+# (name, resolution_seconds, slots)
+TIERS = (
+    ("minute", 60, 24 * 60),   # last 24 hours
+    ("hour", 3600, 30 * 24),   # last 30 days
+    ("day", 86400, 365),       # last year
+)
+
+RANGES = {
+    "1h": 3600,
+    "6h": 6 * 3600,
+    "24h": 24 * 3600,
+    "7d": 7 * 86400,
+    "30d": 30 * 86400,
+    "365d": 365 * 86400,
+}
+
+
+class RingSeries:
+    """Array-backed ring buffer of sentiment counts at one resolution."""
+
+    def __init__(self, resolution, slots):
+        self.resolution = resolution
+        self.slots = slots
+        self.bucket_ids = array("q", [-1]) * slots
+        self.counts = array("Q", [0]) * (slots * len(SENTIMENTS))
+
+    @property
+    def span(self):
+        return self.resolution * self.slots
+
+    def _slot(self, bucket):
+        i = bucket % self.slots
+        if self.bucket_ids[i] != bucket:
+            # Slot purana bucket hold kar raha hai -> overwrite
+            self.bucket_ids[i] = bucket
+            base = i * len(SENTIMENTS)
+            for k in range(len(SENTIMENTS)):
+                self.counts[base + k] = 0
+        return i * len(SENTIMENTS)
+
+    def add(self, ts, positive=0, negative=0, neutral=0):
+        base = self._slot(int(ts // self.resolution))
+        self.counts[base] += positive
+        self.counts[base + 1] += negative
+        self.counts[base + 2] += neutral
+
+    def points(self, start_ts, end_ts):
+        """Return [(bucket_start_ts, pos, neg, neu), ...] for every bucket in range."""
+        first = int(start_ts // self.resolution)
+        last = int(end_ts // self.resolution)
+        first = max(first, last - self.slots + 1)
+        out = []
+        for bucket in range(first, last + 1):
+            i = bucket % self.slots
+            if self.bucket_ids[i] == bucket:
+                base = i * len(SENTIMENTS)
+                out.append((bucket * self.resolution, self.counts[base], self.counts[base + 1], self.counts[base + 2]))
+            else:
+                out.append((bucket * self.resolution, 0, 0, 0))
+        return out
+
+
+class CitySentimentSeries:
+    """1-minute ring buffer rolled up into 1-hour and 1-day tiers on ingest."""
+
+    def __init__(self):
+        self.tiers = {name: RingSeries(res, slots) for name, res, slots in TIERS}
+        self.lock = threading.Lock()
+
+    def record(self, ts, positive=0, negative=0, neutral=0):
+        with self.lock:
+            for series in self.tiers.values():
+                series.add(ts, positive, negative, neutral)
+
+    def tier_for(self, seconds):
+        """Finest tier whose span covers the requested range."""
+        for name, _, _ in TIERS:
+            if self.tiers[name].span >= seconds:
+                return name
+        return TIERS[-1][0]
+
+    def trend(self, seconds, now=None):
+        now = time.time() if now is None else now
+        tier = self.tier_for(seconds)
+        with self.lock:
+            points = self.tiers[tier].points(now - seconds + 1, now)
+        return tier, points
+
+
+class SentimentStore:
+    """Per-city collection of CitySentimentSeries."""
+
+    def __init__(self):
+        self._cities = {}
+        self._lock = threading.Lock()
+
+    def city(self, city_code):
+        series = self._cities.get(city_code)
+        if series is None:
+            with self._lock:
+                series = self._cities.setdefault(city_code, CitySentimentSeries())
+        return series
+
+    def record_posts(self, city_code, posts, ts=None):
+        """Aggregate a batch of {"sentiment": ...} posts into counts and record them."""
+        counts = [0, 0, 0]
+        for post in posts:
+            idx = SENTIMENT_INDEX.get(post.get("sentiment"))
+            if idx is not None:
+                counts[idx] += 1
+        self.city(city_code).record(time.time() if ts is None else ts, *counts)
+        return counts
+
+    def trend(self, city_code, range_key, now=None):
+        """Build the JSON-ready trend payload for a city and range key."""
+        if range_key not in RANGES:
+            raise ValueError(f"Unsupported range '{range_key}'. Use one of: {', '.join(RANGES)}")
+        tier, points = self.city(city_code).trend(RANGES[range_key], now)
+        totals = dict.fromkeys(SENTIMENTS, 0)
+        series = []
+        for ts, pos, neg, neu in points:
+            totals["positive"] += pos
+            totals["negative"] += neg
+            totals["neutral"] += neu
+            series.append({
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts)),
+                "positive": pos, "negative": neg, "neutral": neu
+            })
+        return {
+            "city_code": city_code,
+            "range": range_key,
+            "resolution": tier,
+            "totals": totals,
+            "points": series,
+        }
@@ -1,19 +1,109 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-import boto3
 import os
+import sys
 from boto3.dynamodb.conditions import Key
 from botocore.exceptions import ClientError
 
+# travelease_common repo root par hai (Docker image mein /app ke andar)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from travelease_common.admission import Overloaded, init_admission, shed_response
+from travelease_common.cache import get_cache
+from travelease_common.debug import init_debug
+from travelease_common.http_cache import ResponseCache, json_response
+from travelease_common.metrics import init_metrics, track_cache
+from travelease_common.serving import fork_safe
+from travelease_common.startup import WARMUP_KEY, dynamodb_resource, register_warmup, warm_dynamodb, warm_up
+from travelease_common.table_snapshot import iter_snapshot_items
+
 app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": "*"}})
+# Per-route latency histograms + GET /metrics
+init_metrics(app, "flight")
+# Slow request span logs + /debug/profile (DEBUG_TOKEN ke saath)
+init_debug(app)
+# Rate limits (global + per client) -> 429; DynamoDB concurrency cap
+init_admission(app)
 
 # ==========================================================
 # 🛑 NAYA: AWS DYNAMODB SETUP 🛑
 # ==========================================================
 FLIGHTS_TABLE_NAME = os.environ.get("FLIGHTS_TABLE_NAME", "TravelEase-Flights")
-dynamodb = boto3.resource('dynamodb')
-flights_table = dynamodb.Table(FLIGHTS_TABLE_NAME)
+# DYNAMODB_ENDPOINT_URL: local stand-in (load tests); unset -> AWS
+# fork_safe: har gunicorn worker apna boto3 resource banata hai (master se share nahi)
+# dynamodb_resource: pooled keep-alive connections + adaptive retries
+dynamodb = fork_safe(dynamodb_resource)
+flights_table = fork_safe(lambda: dynamodb.Table(FLIGHTS_TABLE_NAME))
+
+# Warm start: FLIGHTS_SNAPSHOT set ho to route index snapshot file se banta hai
+# aur searches DynamoDB query nahi karte (local/test envs, fast cold start)
+FLIGHTS_SNAPSHOT = os.environ.get("FLIGHTS_SNAPSHOT")
+flights_by_route = None
+if FLIGHTS_SNAPSHOT:
+    flights_by_route = {}
+    for item in iter_snapshot_items(FLIGHTS_SNAPSHOT):
+        flights_by_route.setdefault(item["route"], []).append(item)
+    print(f"Loaded {sum(map(len, flights_by_route.values()))} flights from snapshot {FLIGHTS_SNAPSHOT}")
+else:
+    # Worker traffic lene se pehle: boto3 models + pooled connections ready
+    register_warmup("dynamodb", lambda: warm_dynamodb(flights_table, {"flight_id": WARMUP_KEY}))
+
+# Search results cache (backend CACHE_BACKEND env se: memory / sqlite / redis)
+FLIGHT_CACHE_TTL = int(os.environ.get("FLIGHT_CACHE_TTL", 300))
+flight_cache = track_cache(get_cache("flights"))
+# Serialized + compressed responses (ETag / 304); browser/CDN max-age chhota
+# rakha hai kyunki seats/prices badal sakte hain
+flight_responses = ResponseCache("flights")
+FLIGHTS_CACHE_CONTROL = os.environ.get("FLIGHTS_CACHE_CONTROL", "public, max-age=60, stale-while-revalidate=120")
+
+def filter_flights(items, flight_type, flight_date=None):
+    """
+    Route ke items mein se flight_type (aur date, agar di ho) wale flights.
+    DynamoDB numbers Decimal() aate hain -> JSON ke liye price int mein.
+    Input items ko touch nahi karta (snapshot index shared hai), naye dicts deta hai.
+    Undated purane items date filter se bahar nahi hote.
+    """
+    results = []
+    for f in items:
+        if f['type'] != flight_type:
+            continue
+        if flight_date and f.get('date', flight_date) != flight_date:
+            continue
+        clean = dict(f)
+        clean['price'] = int(f['price'])
+        results.append(clean)
+    return results
+
+def query_all(**kwargs):
+    """Saare pages (DynamoDB query ek baar mein max 1 MB deta hai)."""
+    items = []
+    while True:
+        response = flights_table.query(**kwargs)
+        items.extend(response.get('Items', []))
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key:
+            return items
+        kwargs['ExclusiveStartKey'] = last_key
+
+
+def query_route(route_str, flight_date=None):
+    """
+    Route ke flights. Date di ho to 'route-date-index' (range key = date) se
+    sirf us din ke items -- poore saal ka schedule read nahi hota.
+    Undated purane items range-key GSI mein hote hi nahi (sparse index), isliye
+    us din ka koi dated flight na mile to 'route-index' wala poora route.
+    """
+    if flight_date:
+        items = query_all(
+            IndexName='route-date-index',
+            KeyConditionExpression=Key('route').eq(route_str) & Key('date').eq(flight_date)
+        )
+        if items:
+            return items
+    return query_all(
+        IndexName='route-index', # Yeh GSI hum Terraform mein banayenge
+        KeyConditionExpression=Key('route').eq(route_str)
+    )
 
 # --- API Endpoints ---
 @app.route('/')
@@ -27,42 +117,51 @@ def search_flights():
     from_dest = request.args.get('from')
     to_dest = request.args.get('to')
     
-    # 🛑 NAYA: 'date' parameter zaroori hai
-    # flight_date = request.args.get('date') 
-    # Abhi ke liye, hum route se search kar rahe hain
+    # Optional 'date' (YYYY-MM-DD): dated schedules (generate_flight_schedule.py)
+    # ke liye filter; purane undated items par date nahi hoti, woh filter nahi hote
+    flight_date = request.args.get('date')
 
     if not all([flight_type, from_dest, to_dest]):
         return jsonify({"error": "Missing required query parameters"}), 400
 
     route_str = f"{from_dest}-{to_dest}"
+    cache_key = f"{route_str}:{flight_type}:{flight_date or ''}"
+
+    entry = flight_responses.get(cache_key)
+    if entry is not None:
+        return json_response(entry, FLIGHTS_CACHE_CONTROL)
+
+    cached = flight_cache.get(cache_key)
+    if cached is not None:
+        entry = flight_responses.put(cache_key, {"flights": cached}, FLIGHT_CACHE_TTL)
+        return json_response(entry, FLIGHTS_CACHE_CONTROL)
     
     # --- DYNAMODB QUERY LOGIC ---
     # Humne table ko 'route' par query karne ke liye design kiya hai (GSI)
     try:
-        response = flights_table.query(
-            IndexName='route-index', # Yeh GSI hum Terraform mein banayenge
-            KeyConditionExpression=Key('route').eq(route_str)
-        )
+        if flights_by_route is not None:
+            items = flights_by_route.get(route_str, [])  # filter_flights copies
+        else:
+            items = query_route(route_str, flight_date)
         
-        # Query ke baad, 'type' se filter karein
-        results = [f for f in response.get('Items', []) if f['type'] == flight_type]
-        
-        # DynamoDB numbers ko Decimal() type mein return karta hai, JSON ke liye int/float mein convert karein
-        # Yeh ek helper function se behtar ho sakta hai, but for simplicity:
-        clean_results = []
-        for f in results:
-            f['price'] = int(f['price'])
-            clean_results.append(f)
-            
+        # Query ke baad 'type' (aur optional 'date') se filter + clean
+        clean_results = filter_flights(items, flight_type, flight_date)
+    except Overloaded as e:
+        # DynamoDB slots full: purana (expired) response ho to wahi, warna 429
+        return shed_response(e, flight_responses.get(cache_key, allow_stale=True), "flights")
     except ClientError as e:
         print(f"DYNAMODB ERROR querying flights: {e}")
         return jsonify({"error": "Could not fetch flights."}), 500
     
-    if not results: 
+    if not clean_results: 
         print(f"No flights found for route: {route_str} and type: {flight_type}")
-        
-    return jsonify({"flights": clean_results})
+
+    flight_cache.set(cache_key, clean_results, FLIGHT_CACHE_TTL)
+    entry = flight_responses.put(cache_key, {"flights": clean_results}, FLIGHT_CACHE_TTL)
+    return json_response(entry, FLIGHTS_CACHE_CONTROL)
 
 # --- Main Execution ---
+# Dev server; production: python -m travelease_common.serving flight
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5002)
+    warm_up()
+    app.run(host='0.0.0.0', port=int(os.environ.get("PORT", 5002)))
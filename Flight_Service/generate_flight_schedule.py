@@ -0,0 +1,274 @@
+"""
+Vectorized synthetic flight schedule generator.
+
+N days x saare routes x M flights per route/day, NumPy se ek saath generate
+hote hain (per-flight Python loop nahi). Output compressed NDJSON (.ndjson.gz)
+ya Parquet (.parquet, agar pyarrow installed hai) mein likha jata hai, jo
+populate_flights_db.py --from-file aur benchmarks dono use kar sakte hain.
+
+    python generate_flight_schedule.py --days 365 --flights-per-day 10 -o flights.ndjson.gz
+    python generate_flight_schedule.py --days 30 -o flights.parquet
+
+Offline tool hai (service image ka hissa nahi): `pip install numpy` (+ `pyarrow`
+Parquet ke liye) chahiye.
+
+flight_id deterministic hai: <route>-<YYYYMMDD>-<seq>, isliye same file
+dobara load karne par items overwrite hote hain, duplicate nahi.
+"""
+import argparse
+import datetime
+import gzip
+import json
+import os
+import time
+
+import numpy as np
+
+from populate_flights_db import (
+    DOMESTIC_AIRLINES, GENERIC_ROUTE_PROFILES, INTERNATIONAL_AIRLINES, INTERNATIONAL_HUBS,
+    iter_routes,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# Weekday price multipliers (Mon..Sun): Fri/Sun peak, Tue/Wed cheapest
+WEEKDAY_PRICE_FACTOR = np.array([1.00, 0.95, 0.95, 1.00, 1.12, 1.05, 1.15])
+# Departure-hour multipliers: red-eye sasta, morning/evening peak mehenga
+HOUR_PRICE_FACTOR = np.array(
+    [0.85, 0.82, 0.80, 0.80, 0.85, 0.95, 1.08, 1.12, 1.10, 1.02, 1.00, 0.98,
+     0.97, 0.97, 0.98, 1.00, 1.04, 1.10, 1.12, 1.10, 1.04, 0.98, 0.92, 0.88]
+)
+MINUTE_SLOTS = np.array([0, 15, 30, 45])
+TIME_LABELS = np.array([f"{m // 60:02d}:{m % 60:02d}" for m in range(24 * 60)], dtype=object)
+
+
+def route_profile_key(flight_type, origin, dest):
+    """Same profile rules as generate_flights()."""
+    if flight_type == "domestic":
+        if {origin, dest} in [{"BOM", "HYD"}, {"BOM", "GOI"}, {"MAA", "HYD"}]:
+            return "domestic_short"
+        return "domestic_medium"
+    intl_hub = dest if dest in INTERNATIONAL_HUBS else origin
+    if intl_hub in ["DXB"]: return "international_short"
+    if intl_hub in ["HKT", "SUB"]: return "international_medium"
+    if intl_hub in ["SYD", "MEL", "NRT", "HND"]: return "international_long"
+    if intl_hub in ["AKL"]: return "international_xl"
+    return "domestic_medium"
+
+
+class RouteTable:
+    """Per-route arrays (base price/duration, airline pool offsets) for vectorized lookups."""
+
+    def __init__(self):
+        self.routes, self.types = [], []
+        base_price, base_duration, pool_offset, pool_size = [], [], [], []
+        airlines = []
+        for flight_type, route_key in iter_routes():
+            origin, dest = route_key.split("-")
+            price, duration = GENERIC_ROUTE_PROFILES[route_profile_key(flight_type, origin, dest)]
+            if flight_type == "domestic":
+                pool = DOMESTIC_AIRLINES
+            else:
+                pool = INTERNATIONAL_AIRLINES.get(dest if dest in INTERNATIONAL_HUBS else origin, ["Intl. Airline"])
+            self.routes.append(route_key)
+            self.types.append(flight_type)
+            base_price.append(price)
+            base_duration.append(duration)
+            pool_offset.append(len(airlines))
+            pool_size.append(len(pool))
+            airlines.extend(pool)
+
+        self.routes = np.array(self.routes, dtype=object)
+        self.types = np.array(self.types, dtype=object)
+        self.base_price = np.array(base_price, dtype=np.int64)
+        self.base_duration = np.array(base_duration, dtype=np.int64)
+        self.pool_offset = np.array(pool_offset, dtype=np.int64)
+        self.pool_size = np.array(pool_size, dtype=np.int64)
+        self.airlines = np.array(airlines, dtype=object)
+        self.airline_prefix = np.array([a.split(" ")[0][:2].upper() for a in airlines], dtype=object)
+
+    def __len__(self):
+        return len(self.routes)
+
+
+def generate_day(routes, date, flights_per_route, rng):
+    """
+    All flights for one date as a dict of column arrays.
+    Row order: route-major, then flight sequence within the route.
+    """
+    n_routes = len(routes)
+    n = n_routes * flights_per_route
+    route_idx = np.repeat(np.arange(n_routes), flights_per_route)
+    seq = np.tile(np.arange(flights_per_route), n_routes)
+
+    airline_idx = routes.pool_offset[route_idx] + (rng.random(n) * routes.pool_size[route_idx]).astype(np.int64)
+    dep_hour = rng.integers(0, 24, n)
+    dep_min = dep_hour * 60 + MINUTE_SLOTS[rng.integers(0, 4, n)]
+    duration = routes.base_duration[route_idx] + rng.integers(-30, 31, n)
+    arr_min = dep_min + duration
+
+    price = (routes.base_price[route_idx] + rng.integers(-2000, 2001, n)).astype(np.float64)
+    price *= WEEKDAY_PRICE_FACTOR[date.weekday()] * HOUR_PRICE_FACTOR[dep_hour]
+
+    return {
+        "route_idx": route_idx,
+        "seq": seq,
+        "airline_idx": airline_idx,
+        "flight_no": rng.integers(100, 10000, n),
+        "price": np.round(price).astype(np.int64),
+        "duration": duration,
+        "dep_min": dep_min,
+        "arr_min": arr_min % (24 * 60),
+    }
+
+
+def generate_schedule(days, flights_per_route=10, start_date=None, seed=2025):
+    """Yield (date, columns) per day; memory stays at one day's worth of rows."""
+    start_date = start_date or datetime.date.today()
+    routes = RouteTable()
+    rng = np.random.default_rng(seed)
+    for d in range(days):
+        date = start_date + datetime.timedelta(days=d)
+        yield routes, date, generate_day(routes, date, flights_per_route, rng)
+
+
+# Har flight record ke fields, isi order mein (_day_rows tuples bhi yahi order)
+RECORD_FIELDS = ("flight_id", "type", "name", "flightNumber", "route", "date", "price",
+                 "duration", "departureTime", "arrivalTime")
+
+
+def _day_rows(routes, date, cols):
+    """One day's column arrays -> one tuple per flight (RECORD_FIELDS order)."""
+    date_str = date.isoformat()
+    date_key = date.strftime("%Y%m%d")
+    route = routes.routes[cols["route_idx"]].tolist()
+    ftype = routes.types[cols["route_idx"]].tolist()
+    airline = routes.airlines[cols["airline_idx"]].tolist()
+    prefix = routes.airline_prefix[cols["airline_idx"]].tolist()
+    dep = TIME_LABELS[cols["dep_min"]].tolist()
+    arr = TIME_LABELS[cols["arr_min"]].tolist()
+    hours, minutes = np.divmod(cols["duration"], 60)
+    for r, t, a, p, no, price, h, m, dp, ar, seq in zip(
+            route, ftype, airline, prefix, cols["flight_no"].tolist(), cols["price"].tolist(),
+            hours.tolist(), minutes.tolist(), dep, arr, cols["seq"].tolist()):
+        yield (f"{r}-{date_key}-{seq:03d}", t, a, f"{p}-{no}", r, date_str, price, f"{h}h {m}m", dp, ar)
+
+
+def iter_records(routes, date, cols):
+    """Convert one day's column arrays into DynamoDB-ready flight dicts."""
+    for row in _day_rows(routes, date, cols):
+        yield dict(zip(RECORD_FIELDS, row))
+
+
+# ------------------------
+# FILE OUTPUT
+# ------------------------
+
+def iter_ndjson_lines(routes, date, cols):
+    """
+    Same fields as iter_records(), formatted straight into JSON lines.
+    Saare string values hamare apne tables se aate hain (koi quote/escape nahi),
+    isliye json.dumps per record ki zarurat nahi (kaafi tez).
+    """
+    for fid, t, a, fno, r, d, price, duration, dp, ar in _day_rows(routes, date, cols):
+        yield (f'{{"flight_id":"{fid}","type":"{t}","name":"{a}","flightNumber":"{fno}",'
+               f'"route":"{r}","date":"{d}","price":{price},"duration":"{duration}",'
+               f'"departureTime":"{dp}","arrivalTime":"{ar}"}}')
+
+
+def write_ndjson(path, schedule, compresslevel=1):
+    total = 0
+    opener = gzip.open if path.endswith(".gz") else open
+    kwargs = {"compresslevel": compresslevel} if path.endswith(".gz") else {}
+    with opener(path, "wt", encoding="utf-8", **kwargs) as f:
+        for routes, date, cols in schedule:
+            lines = list(iter_ndjson_lines(routes, date, cols))
+            f.write("\n".join(lines))
+            f.write("\n")
+            total += len(lines)
+    return total
+
+
+def write_parquet(path, schedule):
+    if pa is None:
+        raise RuntimeError("Parquet output needs pyarrow (pip install pyarrow)")
+    writer = None
+    total = 0
+    try:
+        for routes, date, cols in schedule:
+            date_key = date.strftime("%Y%m%d")
+            hours, minutes = np.divmod(cols["duration"], 60)
+            route = routes.routes[cols["route_idx"]]
+            table = pa.table({
+                "flight_id": [f"{r}-{date_key}-{s:03d}" for r, s in zip(route.tolist(), cols["seq"].tolist())],
+                "type": pa.array(routes.types[cols["route_idx"]].tolist()).dictionary_encode(),
+                "name": pa.array(routes.airlines[cols["airline_idx"]].tolist()).dictionary_encode(),
+                "flightNumber": [f"{p}-{n}" for p, n in zip(routes.airline_prefix[cols["airline_idx"]].tolist(),
+                                                           cols["flight_no"].tolist())],
+                "route": pa.array(route.tolist()).dictionary_encode(),
+                "date": pa.array([date.isoformat()] * len(route)).dictionary_encode(),
+                "price": cols["price"],
+                "duration": [f"{h}h {m}m" for h, m in zip(hours.tolist(), minutes.tolist())],
+                "departureTime": TIME_LABELS[cols["dep_min"]].tolist(),
+                "arrivalTime": TIME_LABELS[cols["arr_min"]].tolist(),
+            })
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema, compression="zstd")
+            writer.write_table(table)
+            total += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return total
+
+
+def iter_flight_file(path):
+    """Stream flight dicts back out of a .ndjson[.gz] or .parquet file."""
+    if path.endswith(".parquet"):
+        if pq is None:
+            raise RuntimeError("Reading Parquet needs pyarrow (pip install pyarrow)")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=10000):
+            yield from batch.to_pylist()
+        return
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a dated synthetic flight schedule")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--flights-per-day", type=int, default=10, help="Flights per route per day")
+    parser.add_argument("--start-date", default=None, help="YYYY-MM-DD (default: today)")
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("-o", "--output", default="flights.ndjson.gz",
+                        help="*.ndjson, *.ndjson.gz or *.parquet")
+    parser.add_argument("--generate-only", action="store_true",
+                        help="Skip file output (measures generation speed only)")
+    args = parser.parse_args(argv)
+
+    start_date = datetime.date.fromisoformat(args.start_date) if args.start_date else None
+    schedule = generate_schedule(args.days, args.flights_per_day, start_date, args.seed)
+
+    start = time.perf_counter()
+    if args.generate_only:
+        total = sum(len(cols["price"]) for _, _, cols in schedule)
+    elif args.output.endswith(".parquet"):
+        total = write_parquet(args.output, schedule)
+    else:
+        total = write_ndjson(args.output, schedule)
+    elapsed = time.perf_counter() - start
+
+    print(f"{total:,} flights in {elapsed:.2f}s ({total / elapsed:,.0f} flights/s)")
+    if not args.generate_only:
+        print(f"Wrote {args.output} ({os.path.getsize(args.output) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
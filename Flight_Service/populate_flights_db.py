@@ -1,8 +1,14 @@
 import boto3
 import random
+import sys
 from itertools import permutations
+import argparse
 import datetime
+import os
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
 # ==========================================================
 # 🛑 NOTE: Is script ko manually chalayein 🛑
@@ -11,11 +17,28 @@ import uuid
 #    (e.g., via `aws configure`)
 # 2. `pip install boto3` karein
 # 3. `python populate_flights_db.py` chalayein
+#
+# Options (python populate_flights_db.py --help):
+#   --workers 8              parallel writer threads
+#   --endpoint-url URL       local DynamoDB stand-in (e.g. http://localhost:8000)
+#   --checkpoint FILE        completed routes yahan likhe jaate hain; dobara
+#                            chalane par wahi routes skip ho jaate hain
+#   --fresh                  checkpoint ignore karke sab kuch dobara likhein
+#   --from-file FILE         generate_flight_schedule.py ki dated schedule file load karein
+#   --sync [--dry-run]       table se diff karke sirf changed items likhein
+#   --sync --prune           ...aur jo items desired set mein nahi, unhe delete
+#                            bhi karein (dhyan se: doosri schedules mit jaati hain)
 # ==========================================================
 
+# travelease_common repo root par hai
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from travelease_common.dynamo_sync import sync_table
+
 FLIGHTS_TABLE_NAME = "TravelEase-Flights" # Yeh naam Terraform file se match hona chahiye
-dynamodb = boto3.resource('dynamodb')
-flights_table = dynamodb.Table(FLIGHTS_TABLE_NAME)
+DEFAULT_CHECKPOINT = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".populate_flights.checkpoint")
+BATCH_SIZE = 25         # DynamoDB BatchWriteItem limit
+MAX_RETRIES = 8
+BASE_BACKOFF = 0.05     # seconds
 
 # --- Data for Flight Generation (Aapke original code se) ---
 DOMESTIC_AIRLINES = ["IndiGo", "Vistara", "Air India", "SpiceJet", "Akasa Air", "AirAsia India"]
@@ -41,7 +64,10 @@ GENERIC_ROUTE_PROFILES = {
     "international_xl": (65000, 950)
 }
 
-def generate_flights(flight_type, route_key, num_flights=10):
+def generate_flights(flight_type, route_key, num_flights=10, rng=None):
+    # rng per route seed kiya ja sakta hai -> same seed par same flight_ids,
+    # isliye resumed load duplicate items nahi banata (sirf overwrite karta hai)
+    rng = rng or random
     flights = []
     origin, dest = route_key.split('-')
     
@@ -60,28 +86,28 @@ def generate_flights(flight_type, route_key, num_flights=10):
 
     for _ in range(num_flights):
         if flight_type == "domestic":
-            airline = random.choice(DOMESTIC_AIRLINES)
+            airline = rng.choice(DOMESTIC_AIRLINES)
         else:
             intl_hub = dest if dest in INTERNATIONAL_HUBS else origin
-            airline = random.choice(INTERNATIONAL_AIRLINES.get(intl_hub, ["Intl. Airline"]))
+            airline = rng.choice(INTERNATIONAL_AIRLINES.get(intl_hub, ["Intl. Airline"]))
         
         flight_prefix = airline.split(' ')[0][:2].upper()
-        flight_number = f"{flight_prefix}-{random.randint(100, 9999)}"
+        flight_number = f"{flight_prefix}-{rng.randint(100, 9999)}"
 
-        price_variation = random.randint(-2000, 2000)
-        duration_variation = random.randint(-30, 30)
+        price_variation = rng.randint(-2000, 2000)
+        duration_variation = rng.randint(-30, 30)
         
         final_price = base_price + price_variation
         final_duration_min = base_duration + duration_variation
         hours, minutes = divmod(final_duration_min, 60)
 
-        departure_hour = random.randint(0, 23)
-        departure_minute = random.choice([0, 15, 30, 45])
+        departure_hour = rng.randint(0, 23)
+        departure_minute = rng.choice([0, 15, 30, 45])
         departure_time = datetime.datetime(2025, 1, 1, departure_hour, departure_minute)
         arrival_time = departure_time + datetime.timedelta(minutes=final_duration_min)
         
         flight = {
-            "flight_id": str(uuid.uuid4()), # Primary Key
+            "flight_id": str(uuid.UUID(int=rng.getrandbits(128), version=4)), # Primary Key
             "type": flight_type,
             "name": airline,
             "flightNumber": flight_number,
@@ -95,32 +121,222 @@ def generate_flights(flight_type, route_key, num_flights=10):
         flights.append(flight)
     return flights
 
-def main():
-    ALL_FLIGHTS = []
-    print("Generating flight data...")
+# ==========================================================
+# STREAMING BULK LOADER
+# ==========================================================
+
+def iter_routes():
+    """Yield (flight_type, route_key) for every route, in a stable order."""
     # 1. Domestic
     for origin, dest in permutations(DOMESTIC_HUBS, 2):
-        ALL_FLIGHTS.extend(generate_flights("domestic", f"{origin}-{dest}", 10))
+        yield "domestic", f"{origin}-{dest}"
     # 2. International (To)
     for origin in DOMESTIC_HUBS:
         for dest in INTERNATIONAL_HUBS:
-            ALL_FLIGHTS.extend(generate_flights("international", f"{origin}-{dest}", 10))
+            yield "international", f"{origin}-{dest}"
     # 3. International (From)
     for origin in INTERNATIONAL_HUBS:
         for dest in DOMESTIC_HUBS:
-            ALL_FLIGHTS.extend(generate_flights("international", f"{origin}-{dest}", 10))
-            
-    print(f"Generated {len(ALL_FLIGHTS)} flights. Uploading to DynamoDB...")
-
-    # DynamoDB Batch Writer ka istemal karein (efficient)
-    with flights_table.batch_writer() as batch:
-        for flight in ALL_FLIGHTS:
-            # Price ko int se Decimal mein convert karein (DynamoDB requirement)
-            # Lekin boto3 v2.3+ ints ko handle kar leta hai. Hum ise simple rakhenge.
-            # flight['price'] = Decimal(str(flight['price'])) 
-            batch.put_item(Item=flight)
-
-    print("SUCCESS: All flight data uploaded to DynamoDB table:", FLIGHTS_TABLE_NAME)
+            yield "international", f"{origin}-{dest}"
+
+
+def load_checkpoint(path):
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, "r", encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+class Checkpoint:
+    """Append-only file of completed route keys (one per line)."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._fh = open(path, "a", encoding="utf-8") if path else None
+
+    def mark_done(self, route_key):
+        if not self._fh:
+            return
+        with self._lock:
+            self._fh.write(route_key + "\n")
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+
+    def close(self):
+        if self._fh:
+            self._fh.close()
+
+
+class BatchWriter:
+    """
+    Thread-safe BatchWriteItem wrapper.
+    Har thread ka apna boto3 resource hota hai (resources thread-safe nahi hain).
+    UnprocessedItems exponential backoff + jitter ke saath retry hote hain.
+    """
+
+    def __init__(self, table_name, region=None, endpoint_url=None):
+        self.table_name = table_name
+        self.region = region
+        self.endpoint_url = endpoint_url
+        self._local = threading.local()
+        self.retries = 0
+
+    def _resource(self):
+        res = getattr(self._local, "resource", None)
+        if res is None:
+            session = boto3.session.Session()
+            res = session.resource("dynamodb", region_name=self.region, endpoint_url=self.endpoint_url)
+            self._local.resource = res
+        return res
+
+    def write(self, items):
+        for i in range(0, len(items), BATCH_SIZE):
+            self._write_batch(items[i:i + BATCH_SIZE])
+
+    def _write_batch(self, items):
+        request = {self.table_name: [{"PutRequest": {"Item": item}} for item in items]}
+        for attempt in range(MAX_RETRIES + 1):
+            response = self._resource().batch_write_item(RequestItems=request)
+            request = response.get("UnprocessedItems") or {}
+            if not request:
+                return
+            self.retries += 1
+            time.sleep(BASE_BACKOFF * (2 ** attempt) * (0.5 + random.random()))
+        raise RuntimeError(f"{sum(len(v) for v in request.values())} items still unprocessed after {MAX_RETRIES} retries")
+
+
+def load_units(writer, units, workers=8, checkpoint_path=DEFAULT_CHECKPOINT, fresh=False, report_every=5.0):
+    """
+    Write work units through a worker pool with checkpointing.
+    units yields (unit_key, make_items); make_items() is only called on a
+    worker thread, so items are generated lazily and never all held at once.
+    Completed unit keys are checkpointed, so an interrupted load resumes
+    where it stopped. Returns (items_written, elapsed_seconds).
+    """
+    if fresh and checkpoint_path and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    done = load_checkpoint(checkpoint_path)
+    if done:
+        print(f"Resuming: {len(done)} units already loaded (checkpoint: {checkpoint_path})")
+    checkpoint = Checkpoint(checkpoint_path)
+
+    def _load_unit(unit_key, make_items):
+        items = make_items()
+        writer.write(items)
+        checkpoint.mark_done(unit_key)
+        return len(items)
+
+    written = 0
+    start = last_report = time.perf_counter()
+    pending = set()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for unit_key, make_items in units:
+                if unit_key in done:
+                    continue
+                # Bounded in-flight work -> memory sirf ~2x workers units ki
+                if len(pending) >= workers * 2:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    written += sum(f.result() for f in finished)
+                pending.add(pool.submit(_load_unit, unit_key, make_items))
+
+                now = time.perf_counter()
+                if now - last_report >= report_every:
+                    print(f"  ... {written:,} items ({written / (now - start):,.0f} items/s)")
+                    last_report = now
+            for f in pending:
+                written += f.result()
+    finally:
+        checkpoint.close()
+
+    elapsed = time.perf_counter() - start
+    rate = written / elapsed if elapsed else 0.0
+    print(f"Wrote {written:,} items in {elapsed:.1f}s ({rate:,.0f} items/s, {writer.retries} retried batches)")
+    return written, elapsed
+
+
+def _route_rng(seed, route_key):
+    return random.Random(f"{seed}:{route_key}")
+
+
+def iter_generated_flights(flights_per_route=10, seed=2025):
+    """Same flights load_flights() writes, as one stream (used by --sync)."""
+    for flight_type, route_key in iter_routes():
+        yield from generate_flights(flight_type, route_key, flights_per_route, _route_rng(seed, route_key))
+
+
+def load_flights(writer, flights_per_route=10, workers=8, checkpoint_path=DEFAULT_CHECKPOINT,
+                 fresh=False, seed=2025, report_every=5.0):
+    """Generate and load flights_per_route flights for every route (one unit per route)."""
+    def _units():
+        for flight_type, route_key in iter_routes():
+            rng = _route_rng(seed, route_key)
+            yield route_key, lambda t=flight_type, r=route_key, g=rng: generate_flights(t, r, flights_per_route, g)
+    return load_units(writer, _units(), workers, checkpoint_path, fresh, report_every)
+
+
+def load_flight_file(writer, path, chunk_size=500, workers=8, checkpoint_path=DEFAULT_CHECKPOINT,
+                     fresh=False, report_every=5.0):
+    """Bulk load a file written by generate_flight_schedule.py (one unit per chunk)."""
+    from generate_flight_schedule import iter_flight_file
+
+    def _units():
+        chunk = []
+        n = 0
+        for item in iter_flight_file(path):
+            chunk.append(item)
+            if len(chunk) == chunk_size:
+                yield f"{os.path.basename(path)}:{n}", lambda c=chunk: c
+                chunk, n = [], n + 1
+        if chunk:
+            yield f"{os.path.basename(path)}:{n}", lambda c=chunk: c
+    return load_units(writer, _units(), workers, checkpoint_path, fresh, report_every)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Populate the TravelEase flights table")
+    parser.add_argument("--table", default=FLIGHTS_TABLE_NAME)
+    parser.add_argument("--region", default=os.environ.get("AWS_REGION"))
+    parser.add_argument("--endpoint-url", default=os.environ.get("DYNAMODB_ENDPOINT_URL"))
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--flights-per-route", type=int, default=10)
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT)
+    parser.add_argument("--fresh", action="store_true", help="Ignore and reset the checkpoint")
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--from-file", default=None,
+                        help="Load a pre-generated schedule (.ndjson[.gz] / .parquet) instead")
+    parser.add_argument("--sync", action="store_true",
+                        help="Diff against the table and write only new/changed items")
+    parser.add_argument("--prune", action="store_true",
+                        help="With --sync: also delete flights not in the generated set / file")
+    parser.add_argument("--dry-run", action="store_true", help="With --sync: report the diff, write nothing")
+    args = parser.parse_args(argv)
+
+    if args.sync:
+        table = boto3.resource("dynamodb", region_name=args.region, endpoint_url=args.endpoint_url).Table(args.table)
+        if args.from_file:
+            from generate_flight_schedule import iter_flight_file
+            items = iter_flight_file(args.from_file)
+        else:
+            items = iter_generated_flights(args.flights_per_route, args.seed)
+        report = sync_table(table, items, key_name="flight_id", dry_run=args.dry_run, prune=args.prune)
+        print(report.summary())
+        return
+
+    writer = BatchWriter(args.table, args.region, args.endpoint_url)
+    if args.from_file:
+        print(f"Uploading flight data from {args.from_file}...")
+        load_flight_file(writer, args.from_file, workers=args.workers,
+                         checkpoint_path=args.checkpoint, fresh=args.fresh)
+    else:
+        print("Generating and uploading flight data...")
+        load_flights(writer, args.flights_per_route, args.workers, args.checkpoint, args.fresh, args.seed)
+
+    # Poora load ho gaya -> checkpoint ki zarurat nahi
+    if args.checkpoint and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+    print("SUCCESS: All flight data uploaded to DynamoDB table:", args.table)
 
 if __name__ == '__main__':
     main()
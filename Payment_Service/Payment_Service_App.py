@@ -4,29 +4,40 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import os
-import uuid
-from decimal import Decimal
-
-# ---- Optional: Prometheus metrics setup ----
-try:
-    from prometheus_flask_exporter import PrometheusMetrics
-    metrics_class = PrometheusMetrics
-except ImportError:
-    print("PrometheusMetrics not found. Using dummy metrics class.")
-    class DummyMetrics:
-        def __init__(self, app=None):
-            if app:
-                print("Dummy metrics attached.")
-        def init_app(self, app):
-            pass
-    metrics_class = DummyMetrics
+import sys
+from decimal import Decimal, InvalidOperation
+
+# travelease_common repo root par hai (Docker image mein /app ke andar)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+# ---- Prometheus metrics (prometheus_client na ho to no-op) + debug endpoints + rate limits ----
+from travelease_common.admission import init_admission
+from travelease_common.debug import init_debug
+from travelease_common.metrics import init_metrics
+from travelease_common.startup import register_warmup, warm_up
+from card_checks import check_cards, warm_card_checks
+from payment_ledger import IdempotencyConflict, PaymentLedger, fingerprint
 
 # ---- Flask App Initialization ----
 app = Flask(__name__)
 CORS(app)
 
-# Initialize Prometheus metrics
-metrics = metrics_class(app)
+# Initialize Prometheus metrics (per-route histograms + GET /metrics)
+init_metrics(app, "payment")
+# Slow request span logs + /debug/profile (DEBUG_TOKEN ke saath)
+init_debug(app)
+# Rate limits (global + per client) -> 429
+init_admission(app)
+
+# Har authorization (single + batch) yahan append hoti hai; Idempotency-Key replays
+payment_ledger = PaymentLedger()
+PAYMENT_BATCH_MAX = int(os.environ.get("PAYMENT_BATCH_MAX", 1000))
+# Ek payment ki upper limit ("1e400" jaise amounts approve na hon)
+PAYMENT_MAX_AMOUNT = Decimal(os.environ.get("PAYMENT_MAX_AMOUNT", "1000000"))
+# Group / agency checkout: batch body ke top-level par ho to har payment ka default
+BATCH_SHARED_FIELDS = ("flight_id", "flight_details", "seat_number", "email")
+
+# BIN trie + numpy (lazy import) traffic se pehle ready
+register_warmup("card_checks", warm_card_checks)
 
 # ---- Health + Root Endpoints ----
 @app.route('/')
@@ -38,15 +49,44 @@ def ping():
     """Health check endpoint for ALB"""
     return jsonify({"message": "Payment Service is running!"}), 200
 
+def parse_amount(raw):
+    """Decimal amount, or None if it is not a finite number."""
+    try:
+        amount = Decimal(str(raw))
+    except InvalidOperation:
+        return None
+    return amount if amount.is_finite() else None
+
+
+def amount_error(amount):
+    """Error message for a missing / non-positive / too large amount, else None."""
+    if amount is None or amount <= 0:
+        return "Payment failed: Missing or invalid data."
+    if amount > PAYMENT_MAX_AMOUNT:
+        return f"Payment failed: Amount exceeds the maximum of {PAYMENT_MAX_AMOUNT}."
+    return None
+
+
+def amount_number(amount):
+    """Decimal -> int / float for JSON (jsonify Decimal ko string bana deta hai)."""
+    if amount is None:
+        return None
+    return int(amount) if amount == amount.to_integral_value() else float(amount)
+
+
+def validate_card_number(card_number):
+    """Returns an error message, or None if the card number is valid (same rules as the batch)."""
+    return check_cards([card_number])[0]["error"]
+
 # ---- Main Payment API ----
 @app.route('/api/payment', methods=['POST'])
 def payment():
     """
     Mock payment processor for the TravelEase app.
-    Validates card details strictly:
-      - No alphabets allowed
-      - Card must be 16 digits (spaces allowed in input)
-    Accepts any valid 16-digit numeric card.
+    Card checks batch endpoint wale hi hain (card_checks.check_cards):
+      - No alphabets allowed, 12-19 digits (spaces allowed in input)
+      - Brand ki valid length (BIN prefix se) aur Luhn checksum
+    Optional Idempotency-Key header: retry par wahi transaction_id (ledger).
     """
     try:
         data = request.get_json()
@@ -55,44 +95,141 @@ def payment():
 
         # Extract fields from frontend
         card_number = data.get('card_number', '').strip()
-        amount = Decimal(str(data.get('amount', 0)))
+        amount = parse_amount(data.get('amount', 0))
         flight_id = data.get('flight_id')
         flight_details = data.get('flight_details')
         seat_number = data.get('seat_number')
         user_email = data.get('email')
 
         # Validate required fields
-        if not all([flight_id, flight_details, seat_number, user_email, amount > 0]):
+        if not all([flight_id, flight_details, seat_number, user_email, amount is not None and amount > 0]):
             return jsonify({"message": "Payment failed: Missing or invalid data from frontend."}), 400
+        if amount > PAYMENT_MAX_AMOUNT:
+            return jsonify({"message": amount_error(amount)}), 400
 
-        # Normalize and validate card number
-        card_number_clean = card_number.replace(" ", "")
-        if any(ch.isalpha() for ch in card_number_clean):
-            return jsonify({"message": "Invalid card number. Alphabets are not allowed."}), 400
-        if not card_number_clean.isdigit() or len(card_number_clean) != 16:
-            return jsonify({"message": "Invalid card number. Must be exactly 16 digits."}), 400
+        # Normalize and validate card number (format, brand length, Luhn)
+        check = check_cards([card_number])[0]
+        if not check["ok"]:
+            return jsonify({"message": check["error"]}), 400
 
-        # All checks passed — approve payment
-        transaction_id = f"TXN-{str(uuid.uuid4())[:8].upper()}"
+        # All checks passed — approve payment (same Idempotency-Key -> same transaction)
+        card_digits = check["number"]
+        try:
+            entry, _ = payment_ledger.record(
+                request.headers.get("Idempotency-Key"),
+                fingerprint(card_digits, amount, flight_id, seat_number),
+                {"status": "approved", "amount": amount, "card_last4": card_digits[-4:], "brand": check["brand"],
+                 "issuer": check["issuer"], "flight_id": flight_id, "seat_number": seat_number,
+                 "user_email": user_email, "message": "Payment Successful"},
+            )
+        except IdempotencyConflict:
+            return jsonify({"message": "Idempotency-Key already used for a different payment."}), 409
 
         return jsonify({
             "message": "Payment Successful",
-            "transaction_id": transaction_id,
+            "transaction_id": entry.transaction_id,
             "flight_id": flight_id,
             "flight_details": flight_details,
             "seat_number": seat_number,
             "user_email": user_email,
-            "amount_paid": amount
+            "amount_paid": amount_number(amount)
         }), 200
 
     except Exception as e:
+        # Exception text sirf log mein, client ko nahi
         print(f"Error in /api/payment: {e}")
+        return jsonify({"message": "Payment failed due to an internal error."}), 500
+
+
+# ---- Batch Payment API (group / agency checkouts) ----
+def authorize_batch(payments, defaults=None, batch_key=None, ledger=None):
+    """
+    Validate and authorize many payments in one pass: card checks for the
+    whole batch together (Luhn vectorized, BIN trie), then one ledger write.
+    Idempotency key per payment: its "idempotency_key", else
+    "<batch_key>:<index>" if the batch has one. Returns one result per payment.
+    """
+    ledger = ledger if ledger is not None else payment_ledger
+    defaults = defaults or {}
+    items = [dict(defaults, **p) if isinstance(p, dict) else None for p in payments]
+    checks = check_cards([item.get("card_number") if item else "" for item in items])
+
+    requests = []
+    for i, (item, check) in enumerate(zip(items, checks)):
+        item = item or {}
+        amount = parse_amount(item.get("amount", 0))
+        fields = {
+            "status": "declined", "amount": amount, "card_last4": check["number"][-4:] if check["ok"] else None,
+            "brand": check["brand"], "issuer": check["issuer"], "flight_id": item.get("flight_id"),
+            "seat_number": item.get("seat_number"), "user_email": item.get("email"),
+        }
+        if not all([item.get("flight_id"), item.get("flight_details"), item.get("seat_number"), item.get("email")]):
+            fields["message"] = "Payment failed: Missing or invalid data."
+        elif amount_error(amount):
+            fields["message"] = amount_error(amount)
+        elif not check["ok"]:
+            fields["message"] = check["error"]
+        else:
+            fields["status"], fields["message"] = "approved", "Payment Successful"
+        key = item.get("idempotency_key") or (f"{batch_key}:{i}" if batch_key else None)
+        request_hash = fingerprint(check["number"], amount, item.get("flight_id"), item.get("seat_number"))
+        requests.append((key, request_hash, fields))
+
+    results = []
+    for i, ((entry, replayed), (key, _, fields)) in enumerate(zip(ledger.record_many(requests), requests)):
+        if entry is None:
+            results.append({"index": i, "status": "conflict", "idempotency_key": key,
+                            "message": "Idempotency key already used for a different payment."})
+            continue
+        results.append({
+            "index": i,
+            "status": entry.status,
+            "message": entry.message,
+            "transaction_id": entry.transaction_id,
+            "brand": entry.brand,
+            "issuer": entry.issuer,
+            "card_last4": entry.card_last4,
+            "amount_paid": amount_number(entry.amount),
+            "flight_id": entry.flight_id,
+            "seat_number": entry.seat_number,
+            "user_email": entry.user_email,
+            "replayed": replayed,
+        })
+    return results
+
+
+@app.route('/api/payment/batch', methods=['POST'])
+def payment_batch():
+    """
+    Authorize up to PAYMENT_BATCH_MAX payments in one request:
+      {"flight_id": ..., "payments": [{"card_number", "amount", "seat_number", "email", ...}, ...]}
+    Shared fields (BATCH_SHARED_FIELDS) top-level par ho sakte hain. Har
+    payment ka status alag (approved / declined / conflict); batch 200 hai.
+    """
+    try:
+        data = request.get_json(silent=True)
+        payments = data.get("payments") if isinstance(data, dict) else None
+        if not isinstance(payments, list) or not payments:
+            return jsonify({"message": "Payment failed: 'payments' must be a non-empty list."}), 400
+        if len(payments) > PAYMENT_BATCH_MAX:
+            return jsonify({"message": f"Too many payments in one batch (max {PAYMENT_BATCH_MAX})."}), 400
+
+        defaults = {field: data[field] for field in BATCH_SHARED_FIELDS if field in data}
+        results = authorize_batch(payments, defaults, request.headers.get("Idempotency-Key"))
+        statuses = [result["status"] for result in results]
         return jsonify({
-            "message": "Payment failed due to an internal error.",
-            "error": str(e)
-        }), 500
+            "results": results,
+            "approved": statuses.count("approved"),
+            "declined": statuses.count("declined"),
+            "conflicts": statuses.count("conflict"),
+        }), 200
 
+    except Exception as e:
+        print(f"Error in /api/payment/batch: {e}")
+        return jsonify({"message": "Batch payment failed due to an internal error."}), 500
 
 
+# Dev server; production: python -m travelease_common.serving payment
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5003)
\ No newline at end of file
+    warm_up()
+    app.run(host="0.0.0.0", port=int(os.environ.get("PORT", 5003)))
\ No newline at end of file
@@ -0,0 +1,176 @@
+# Payment_Service/card_checks.py
+"""
+Batch card validation: format + Luhn checksum + BIN (brand / issuer) lookup.
+
+    results = check_cards(["4111 1111 1111 1111", "5500 0000 0000 0004", ...])
+    # [{"ok": True, "number": "4111...", "brand": "visa", "issuer": None, "error": None}, ...]
+
+- Luhn: numpy installed ho aur batch VECTOR_MIN se bada ho to saare numbers
+  (leading zeros se 19 digits tak pad) ek (n, 19) digit matrix mein --
+  doubling lookup table + row sum, per-card Python loop nahi. Warna
+  str.translate wala scalar path.
+- BIN index: digit prefix trie, longest prefix jeetta hai (e.g. "6011"
+  Discover, "60" RuPay). Built-in brand ranges + optional issuer CSV
+  (BIN_TABLE_PATH; columns prefix,brand,issuer; brand khali ho to trie wala).
+  Brand ki valid lengths bhi yahin se (Amex 15, Visa 13/16/19, ...).
+
+numpy import lazy hai (payment service ka cold start); gunicorn warm-up
+use worker ke traffic lene se pehle load kar deta hai.
+"""
+import csv
+import importlib.util
+import logging
+import os
+
+from travelease_common.startup import lazy, lazy_import
+
+np = lazy_import("numpy") if importlib.util.find_spec("numpy") else None
+
+VECTOR_MIN = 64        # isse chhote batch par numpy setup ka overhead zyada
+MIN_LENGTH, MAX_LENGTH = 12, 19
+BIN_DEPTH = 8          # trie mein itne digits tak hi prefixes
+
+# (brand, first prefix, last prefix, valid lengths) -- same-length prefix ranges
+BRAND_RANGES = [
+    ("visa", "4", "4", (13, 16, 19)),
+    ("mastercard", "51", "55", (16,)),
+    ("mastercard", "2221", "2720", (16,)),
+    ("amex", "34", "34", (15,)),
+    ("amex", "37", "37", (15,)),
+    ("rupay", "60", "60", (16,)),
+    ("rupay", "508", "508", (16,)),
+    ("rupay", "81", "82", (16,)),
+    ("discover", "6011", "6011", (16, 19)),
+    ("discover", "644", "649", (16, 19)),
+    ("discover", "65", "65", (16, 19)),
+    ("jcb", "3528", "3589", (16, 17, 18, 19)),
+    ("diners", "300", "305", (14, 16, 19)),
+    ("diners", "36", "36", (14, 16, 19)),
+    ("diners", "38", "39", (14, 16, 19)),
+]
+
+_DOUBLED = str.maketrans("0123456789", "0246813579")  # 2*d, digits ka sum (Luhn)
+
+
+# ------------------------
+# LUHN
+# ------------------------
+def luhn_ok(number):
+    """Luhn checksum of one digit string."""
+    total = sum(number[-1::-2].encode("ascii")) + sum(number[-2::-2].translate(_DOUBLED).encode("ascii"))
+    return (total - 48 * len(number)) % 10 == 0
+
+
+def luhn_valid(numbers):
+    """[bool] per digit string (12-19 digits each); vectorized when numpy is there."""
+    if np is None or len(numbers) < VECTOR_MIN:
+        return [luhn_ok(number) for number in numbers]
+    # Leading zeros checksum nahi badalte -> sab MAX_LENGTH tak pad, ek hi (n, 19) matrix
+    joined = "".join([number.zfill(MAX_LENGTH) for number in numbers]).encode("ascii")
+    digits = np.frombuffer(joined, dtype=np.uint8).reshape(len(numbers), MAX_LENGTH) - 48
+    doubled = np.array([0, 2, 4, 6, 8, 1, 3, 5, 7, 9], dtype=np.uint8)
+    digits[:, MAX_LENGTH - 2::-2] = doubled[digits[:, MAX_LENGTH - 2::-2]]
+    return (digits.sum(axis=1, dtype=np.uint32) % 10 == 0).tolist()
+
+
+# ------------------------
+# BIN INDEX
+# ------------------------
+class BinTrie:
+    """Digit prefix trie: prefix -> {"brand", "issuer", "lengths"}; lookup = longest match."""
+
+    def __init__(self):
+        self._root = {}
+
+    def insert(self, prefix, info):
+        node = self._root
+        for digit in prefix[:BIN_DEPTH]:
+            node = node.setdefault(digit, {})
+        node[None] = info
+
+    def lookup(self, number):
+        node, found = self._root, None
+        for digit in number[:BIN_DEPTH]:
+            node = node.get(digit)
+            if node is None:
+                break
+            found = node.get(None, found)
+        return found
+
+
+def _prefix_range(first, last):
+    width = len(first)
+    return [str(n).zfill(width) for n in range(int(first), int(last) + 1)]
+
+
+def load_bin_index(path=None):
+    """Built-in brand ranges plus issuer rows from BIN_TABLE_PATH (if set)."""
+    trie = BinTrie()
+    for brand, first, last, lengths in BRAND_RANGES:
+        for prefix in _prefix_range(first, last):
+            trie.insert(prefix, {"brand": brand, "issuer": None, "lengths": lengths})
+
+    path = path or os.environ.get("BIN_TABLE_PATH")
+    if path:
+        try:
+            with open(path, newline="", encoding="utf-8") as f:
+                rows = 0
+                for row in csv.DictReader(f):
+                    prefix = (row.get("prefix") or "").strip()
+                    if not (prefix.isascii() and prefix.isdigit()):
+                        continue
+                    parent = trie.lookup(prefix) or {"brand": None, "lengths": None}
+                    trie.insert(prefix, {
+                        "brand": (row.get("brand") or "").strip().lower() or parent["brand"],
+                        "issuer": (row.get("issuer") or "").strip() or None,
+                        "lengths": parent["lengths"],
+                    })
+                    rows += 1
+            logging.info(f"[BIN] {rows} issuer prefixes loaded from {path}")
+        except OSError as e:
+            logging.warning(f"[BIN] Could not read {path}: {e}")
+    return trie
+
+
+bin_index = lazy(load_bin_index)
+
+
+def warm_card_checks():
+    """Build the BIN trie and import numpy (first vectorized Luhn) before traffic."""
+    check_cards(["4111 1111 1111 1111"] * VECTOR_MIN)
+
+
+# ------------------------
+# BATCH CHECK
+# ------------------------
+def check_cards(card_numbers):
+    """
+    One result dict per card number: ok, number (digits only), brand,
+    issuer and error (message, None if ok). Spaces allowed in input.
+    """
+    results, pending = [], []
+    lookup = bin_index.get().lookup
+    for raw in card_numbers:
+        number = str(raw or "").replace(" ", "")
+        result = {"ok": False, "number": number, "brand": None, "issuer": None, "error": None}
+        results.append(result)
+        if not (number.isascii() and number.isdigit()) or not MIN_LENGTH <= len(number) <= MAX_LENGTH:
+            if any(ch.isalpha() for ch in number):
+                result["error"] = "Invalid card number. Alphabets are not allowed."
+            else:
+                result["error"] = f"Invalid card number. Must be {MIN_LENGTH}-{MAX_LENGTH} digits."
+            continue
+        info = lookup(number)
+        if info is not None:
+            result["brand"], result["issuer"] = info["brand"], info["issuer"]
+            if info["lengths"] and len(number) not in info["lengths"]:
+                result["error"] = f"Invalid {info['brand']} card number length."
+                continue
+        pending.append(result)
+
+    for result, ok in zip(pending, luhn_valid([r["number"] for r in pending])):
+        if ok:
+            result["ok"] = True
+        else:
+            result["error"] = "Invalid card number. Checksum failed."
+    return results
@@ -0,0 +1,112 @@
+# Payment_Service/payment_ledger.py
+"""
+Append-only in-process ledger of payment authorizations + idempotency keys.
+
+    entry, replayed = payment_ledger.record(key, fingerprint, {"status": "approved", ...})
+
+- Entries immutable hain (namedtuple) aur sirf end par append hote hain;
+  seq har process mein 1 se badhta hai. entries(since) reconciliation ke liye.
+- Idempotency: same key + same request fingerprint -> pehli entry wapas
+  (replayed=True), naya transaction nahi. Same key + alag request ->
+  IdempotencyConflict. Declines bhi record hote hain, taaki retry ko wahi
+  jawab mile.
+- Fingerprint sirf hash hai (card number ledger mein nahi, sirf last4).
+- Retention: PAYMENT_LEDGER_MAX_ENTRIES (200,000) se zyada hon to sabse
+  purani entries (aur unki idempotency keys) nikal jaati hain.
+
+Ledger per process hai aur restart par khali. Isliye payment service ek hi
+gunicorn worker chalati hai (serving.py, single_worker) -- doosre worker ko
+pehle worker ki keys dikhti hi nahi. Durable / multi-task idempotency ke liye
+DynamoDB conditional put chahiye -- yeh mock processor ke liye kaafi hai.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import deque, namedtuple
+
+LEDGER_MAX_ENTRIES = int(os.environ.get("PAYMENT_LEDGER_MAX_ENTRIES", 200000))
+
+# System fields pehle; baaki caller deta hai (na de to None)
+RECORD_FIELDS = ["status", "amount", "card_last4", "brand", "issuer", "flight_id", "seat_number",
+                 "user_email", "message"]
+LedgerEntry = namedtuple(
+    "LedgerEntry", ["seq", "transaction_id", "idempotency_key", "fingerprint", "created_at"] + RECORD_FIELDS,
+    defaults=[None] * len(RECORD_FIELDS),
+)
+
+
+class IdempotencyConflict(Exception):
+    """Idempotency key already used for a different request."""
+
+
+def fingerprint(card_number, amount, flight_id, seat_number):
+    """Hash identifying a payment request (for idempotency replays)."""
+    raw = f"{card_number}|{amount}|{flight_id}|{seat_number}".encode("utf-8")
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def new_transaction_id():
+    # 12 hex (48 bit): 8 hex par 100k ke batch mein hi collision ho jaate
+    return f"TXN-{os.urandom(6).hex().upper()}"
+
+
+class PaymentLedger:
+    def __init__(self, max_entries=LEDGER_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = deque()
+        self._by_key = {}  # idempotency key -> LedgerEntry
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def _append(self, key, request_hash, fields):
+        self._seq += 1
+        transaction_id = new_transaction_id() if fields.get("status") == "approved" else None
+        entry = LedgerEntry(self._seq, transaction_id, key, request_hash, time.time(), **fields)
+        self._entries.append(entry)
+        if key:
+            self._by_key[key] = entry
+        while len(self._entries) > self.max_entries:
+            old = self._entries.popleft()
+            if old.idempotency_key and self._by_key.get(old.idempotency_key) is old:
+                del self._by_key[old.idempotency_key]
+        return entry
+
+    def record(self, key, request_hash, fields):
+        """
+        (entry, replayed). key None -> always a new entry. Raises
+        IdempotencyConflict if key was used with another fingerprint.
+        """
+        with self._lock:
+            existing = self._by_key.get(key) if key else None
+            if existing is not None:
+                if existing.fingerprint != request_hash:
+                    raise IdempotencyConflict(key)
+                return existing, True
+            return self._append(key, request_hash, fields), False
+
+    def record_many(self, requests):
+        """
+        Batch version of record(), one lock for the whole batch.
+        requests: [(key, fingerprint, fields)]; returns [(entry, replayed)],
+        with (None, False) for conflicting keys.
+        """
+        out = []
+        with self._lock:
+            for key, request_hash, fields in requests:
+                existing = self._by_key.get(key) if key else None
+                if existing is None:
+                    out.append((self._append(key, request_hash, fields), False))
+                elif existing.fingerprint == request_hash:
+                    out.append((existing, True))
+                else:
+                    out.append((None, False))
+        return out
+
+    def entries(self, since=0):
+        """Entries with seq > since, oldest first."""
+        with self._lock:
+            return [entry for entry in self._entries if entry.seq > since]
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,11 @@
+"""
+Microbenchmarks for the services' hot paths.
+
+    python -m benchmarks run [-o results.json] [--sizes 10,100,1000] [-k flights]
+    python -m benchmarks compare base.json head.json [--threshold 0.10]
+
+Har benchmark synthetic data par kai sizes mein chalta hai; results (commit
+ke saath) JSON mein save hote hain. compare do runs (jaise do commits) ko
+match karke regressions flag karta hai aur regression par exit code 1 deta
+hai (CI gate ke liye).
+"""
@@ -0,0 +1,143 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from benchmarks.suite import BENCHMARKS, DEFAULT_REPEAT, MIN_REPEAT_TIME, REPO_DIR, format_seconds, run_suite, select
+
+RESULTS_DIR = os.path.join(REPO_DIR, "benchmarks", "results")
+
+
+def _git(*args):
+    try:
+        return subprocess.run(["git", *args], cwd=REPO_DIR, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _meta():
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def cmd_run(args):
+    names = select(args.k)
+    if not names:
+        print(f"No benchmarks match {args.k}; available: {', '.join(BENCHMARKS)}")
+        return 2
+    sizes = [int(s) for s in args.sizes.split(",")] if args.sizes else None
+
+    meta = _meta()
+    print(f"[BENCH] commit {meta['commit'][:10] or '?'}{' (dirty)' if meta['dirty'] else ''}, "
+          f"Python {meta['python']}")
+    results = run_suite(names, sizes, args.repeat, args.min_time)
+    _save(results, args.output)
+    return 0
+
+
+def _save(results, output, prefix=""):
+    meta = _meta()
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        label = (meta["commit"][:10] or "nogit") + ("-dirty" if meta["dirty"] else "")
+        output = os.path.join(RESULTS_DIR, f"{prefix}{label}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2, sort_keys=True)
+    print(f"[OK] Results written to {output}")
+
+
+def cmd_startup(args):
+    # Lazy: loadtest stand-ins (moto) sirf is command ke liye chahiye
+    from benchmarks.startup import run_startup
+    from travelease_common.serving import SERVICES
+
+    services = args.service or sorted(SERVICES)
+    print(f"[BENCH] startup ({args.serving}), {args.repeat} cold starts per service")
+    _save(run_startup(services, args.serving, args.repeat), args.output, prefix="startup-")
+    return 0
+
+
+def compare(base, head, threshold=0.10):
+    """
+    Rows for every benchmark present in both runs. Regression sirf tab jab
+    median aur best dono threshold se zyada slow hon (ek noisy repeat se
+    false alarm nahi).
+    """
+    rows = []
+    for key in sorted(set(base) & set(head), key=lambda k: (head[k]["benchmark"], head[k]["size"])):
+        median_ratio = head[key]["median"] / base[key]["median"]
+        best_ratio = head[key]["best"] / base[key]["best"]
+        if median_ratio > 1 + threshold and best_ratio > 1 + threshold:
+            status = "REGRESSION"
+        elif median_ratio < 1 - threshold and best_ratio < 1 - threshold:
+            status = "faster"
+        else:
+            status = "~"
+        rows.append((key, base[key]["median"], head[key]["median"], median_ratio, status))
+    return rows
+
+
+def cmd_compare(args):
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.head, encoding="utf-8") as f:
+        head = json.load(f)
+
+    print(f"base: {base['meta'].get('commit', '')[:10]}  head: {head['meta'].get('commit', '')[:10]}  "
+          f"threshold: {args.threshold:.0%}")
+    rows = compare(base["results"], head["results"], args.threshold)
+    print(f"\n{'benchmark':42s} {'base':>10s} {'head':>10s} {'change':>8s}")
+    for key, base_s, head_s, ratio, status in rows:
+        print(f"{key:42s} {format_seconds(base_s):>10s} {format_seconds(head_s):>10s} "
+              f"{(ratio - 1) * 100:+7.1f}%  {status if status != '~' else ''}")
+
+    only = sorted(set(base["results"]) ^ set(head["results"]))
+    if only:
+        print(f"\n{len(only)} benchmark(s) not in both runs, skipped")
+    regressions = [row for row in rows if row[4] == "REGRESSION"]
+    if regressions:
+        print(f"\n[FAIL] {len(regressions)} regression(s) above {args.threshold:.0%}")
+        return 1
+    print("\n[OK] No regressions")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="TravelEase hot-path microbenchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Run benchmarks and save JSON results")
+    run.add_argument("-k", action="append", default=[], help="Only benchmarks whose name contains this (repeatable)")
+    run.add_argument("--sizes", default=None, help="Comma-separated sizes, overrides each benchmark's defaults")
+    run.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    run.add_argument("--min-time", type=float, default=MIN_REPEAT_TIME, help="Minimum seconds per repeat")
+    run.add_argument("-o", "--output", default=None, help="Default: benchmarks/results/<commit>.json")
+
+    startup = sub.add_parser("startup", help="Cold start: spawn -> health check -> first request")
+    startup.add_argument("-s", "--service", action="append", default=[],
+                         choices=("booking", "crowdpulse", "flight", "payment"), help="Repeatable; default all")
+    startup.add_argument("--serving", choices=("dev", "gunicorn"), default="gunicorn")
+    startup.add_argument("--repeat", type=int, default=3)
+    startup.add_argument("-o", "--output", default=None, help="Default: benchmarks/results/startup-<commit>.json")
+
+    cmp_ = sub.add_parser("compare", help="Compare two result files and flag regressions")
+    cmp_.add_argument("base")
+    cmp_.add_argument("head")
+    cmp_.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown that counts as a regression")
+
+    args = parser.parse_args(argv)
+    commands = {"run": cmd_run, "startup": cmd_startup, "compare": cmd_compare}
+    return commands[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Cold start benchmark: process spawn -> health check pass -> first request.
+
+Har service ke liye (repeat baar, fresh process):
+- import:  fresh interpreter mein service module ka import
+- ready:   spawn se /ping 200 tak (ECS scale-out par ALB health check yahi dekhta hai)
+- first:   ready ke baad pehli real request (cold boto3 clients / connections /
+           lazy imports yahan dikhte hain; warm-up ke baad yeh chhota hona chahiye)
+
+DynamoDB / SMTP / YouTube loadtest stand-ins se aate hain (koi AWS nahi).
+Results `python -m benchmarks compare` wale format mein hain.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+from benchmarks.suite import REPO_DIR, format_seconds
+from loadtest.harness import ServiceProcess, service_env
+from loadtest.standins import DynamoStandIn, SmtpSink, YouTubeStandIn
+from travelease_common.serving import SERVICES
+
+POLL_INTERVAL = 0.02
+
+# service -> (method, path, payload) for the first real request
+FIRST_REQUEST = {
+    "flight": ("GET", "/api/flights?type=domestic&from=DEL&to=BOM", None),
+    "booking": ("GET", "/smart-trip?destination_code=GOI", None),
+    "payment": ("POST", "/api/payment", {"card_number": "4111 1111 1111 1111", "amount": 4999,
+                                         "flight_id": "F0000001", "flight_details": "Startup benchmark",
+                                         "seat_number": "1A", "email": "startup@example.com"}),
+    "crowdpulse": ("GET", "/api/crowdpulse/DEL", None),
+}
+
+
+def _request(url, method="GET", payload=None, timeout=30):
+    data = json.dumps(payload).encode() if payload is not None else None
+    req = urllib.request.Request(url, data=data, method=method,
+                                 headers={"Content-Type": "application/json"} if data else {})
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as res:
+            res.read()
+            return res.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def time_import(service, env):
+    config = SERVICES[service]
+    source_dir = os.path.join(REPO_DIR, config["dir"])
+    code = ("import sys, time; sys.path.insert(0, sys.argv[1]); start = time.perf_counter(); "
+            f"import {config['module']}; print(time.perf_counter() - start)")
+    out = subprocess.run([sys.executable, "-c", code, source_dir], cwd=source_dir, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return float(out.strip().splitlines()[-1])
+
+
+def time_ready(service, env, log_dir, serving, timeout=60.0):
+    """(seconds from spawn to /ping answering 200, seconds for the first real request)."""
+    proc = ServiceProcess(service, env, log_dir, serving)
+    start = time.perf_counter()
+    proc.start()
+    try:
+        deadline = start + timeout
+        while True:
+            if proc.process.poll() is not None:
+                raise RuntimeError(f"{service} exited with code {proc.process.returncode}; see {proc.log_path}")
+            try:
+                if _request(proc.url + proc.health_path, timeout=1) == 200:
+                    break
+            except OSError:
+                pass
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f"{service} not ready within {timeout}s; see {proc.log_path}")
+            time.sleep(POLL_INTERVAL)
+        ready = time.perf_counter() - start
+
+        method, path, payload = FIRST_REQUEST[service]
+        first_start = time.perf_counter()
+        status = _request(proc.url + path, method, payload)
+        first = time.perf_counter() - first_start
+        if status >= 500:
+            raise RuntimeError(f"{service} first request {method} {path} returned {status}; see {proc.log_path}")
+        return ready, first
+    finally:
+        proc.stop()
+
+
+def _timings(samples, metric, service, serving):
+    return {"best": min(samples), "median": statistics.median(samples), "loops": 1,
+            "repeat": len(samples), "benchmark": f"startup.{service}.{metric}", "size": serving}
+
+
+def run_startup(services, serving="gunicorn", repeat=3, progress=print):
+    """Returns {"startup.<service>.<metric>[<serving>]": timings}."""
+    log_dir = tempfile.mkdtemp(prefix="travelease-startup-")
+    dynamo = DynamoStandIn(log_path=os.path.join(log_dir, "dynamodb.log"))
+    smtp = SmtpSink().start()
+    youtube = YouTubeStandIn().start()
+    results = {}
+    try:
+        dynamo.start()
+        dynamo.create_tables()
+        dynamo.seed(2)
+        env = service_env(dynamo.endpoint_url, smtp.port, youtube.url, {"CACHE_BACKEND": "memory"})
+        for service in services:
+            imports = [time_import(service, env) for _ in range(repeat)]
+            runs = [time_ready(service, env, log_dir, serving) for _ in range(repeat)]
+            for metric, samples in (("import", imports), ("ready", [r for r, _ in runs]),
+                                    ("first", [f for _, f in runs])):
+                timings = _timings(samples, metric, service, serving)
+                key = f"{timings['benchmark']}[{serving}]"
+                results[key] = timings
+                progress(f"  {key:42s} {format_seconds(timings['median']):>10s}  "
+                         f"(best {format_seconds(timings['best'])})")
+    finally:
+        dynamo.stop()
+        smtp.shutdown()
+        youtube.shutdown()
+    return results
@@ -0,0 +1,341 @@
+"""
+Benchmark definitions and the timing runner.
+
+Har benchmark ek setup(size) function hai jo synthetic data banata hai aur
+ek zero-arg callable lautata hai (ek "op"). Runner loops calibrate karta
+hai taaki har repeat kam se kam MIN_REPEAT_TIME chale, phir per-op best aur
+median time record karta hai.
+
+Setup op par `payload_bytes` set kar sakta hai (codec benchmarks); runner
+use timings ke saath "bytes" mein record karta hai.
+
+Service modules lazily import hote hain (sirf selected benchmarks ke), dummy
+AWS region/credentials ke saath -- koi network call nahi hota.
+"""
+import os
+import random
+import statistics
+import sys
+import time
+from decimal import Decimal
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MIN_REPEAT_TIME = 0.05  # seconds
+DEFAULT_REPEAT = 7
+
+BENCHMARKS = {}  # name -> (setup, default sizes)
+
+
+def benchmark(name, sizes):
+    def _register(setup):
+        BENCHMARKS[name] = (setup, sizes)
+        return setup
+    return _register
+
+
+def _import_service(module, subdir):
+    os.environ.setdefault("AWS_DEFAULT_REGION", "eu-north-1")
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+    os.environ.setdefault("CACHE_BACKEND", "memory")
+    path = os.path.join(REPO_DIR, subdir)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+    if REPO_DIR not in sys.path:
+        sys.path.insert(0, REPO_DIR)
+    return __import__(module)
+
+
+def _synthetic_flights(size, rng):
+    routes = [f"{a}-{b}" for a in ("DEL", "BOM", "MAA") for b in ("GOI", "DXB", "SYD")]
+    return [{
+        "flight_id": f"F{i:07d}",
+        "type": rng.choice(("domestic", "international")),
+        "name": rng.choice(("IndiGo", "Vistara", "Emirates")),
+        "flightNumber": f"6E-{rng.randint(100, 9999)}",
+        "route": rng.choice(routes),
+        "price": Decimal(rng.randint(3000, 90000)),
+        "duration": "2h 15m",
+        "departureTime": "09:30",
+        "arrivalTime": "11:45",
+        "date": f"2025-01-{rng.randint(1, 28):02d}",
+    } for i in range(size)]
+
+
+# ------------------------
+# BENCHMARKS
+# ------------------------
+@benchmark("flights.filter_clean", sizes=(10, 100, 1000))
+def _bench_filter_flights(size):
+    app = _import_service("Flight_Service_App", "Flight_Service")
+    items = _synthetic_flights(size, random.Random(size))
+    return lambda: app.filter_flights(items, "domestic", None)
+
+
+@benchmark("flights.filter_clean_dated", sizes=(10, 100, 1000))
+def _bench_filter_flights_dated(size):
+    app = _import_service("Flight_Service_App", "Flight_Service")
+    items = _synthetic_flights(size, random.Random(size))
+    return lambda: app.filter_flights(items, "domestic", "2025-01-15")
+
+
+@benchmark("smart_trip.decimal_to_float", sizes=(10, 100, 1000))
+def _bench_smart_trip_numbers(size):
+    app = _import_service("Booking_Service_App", "Booking_Service")
+    rng = random.Random(size)
+    items = [{"trip_id": f"TRIP-{i:04d}", "destination_code": "GOI", "name": f"Trip {i}",
+              "description": "Synthetic trip", "price": Decimal(rng.randint(500, 30000)),
+              "rating": Decimal("4.5"), "suggestion_type": "Hotel"} for i in range(size)]
+    return lambda: [app.plain_numbers(item) for item in items]
+
+
+def _synthetic_trips(size, rng):
+    types = ("Hotel", "Tour", "Activity", "Ticket", "Food")
+    return [{"trip_id": f"TRIP-{i:05d}", "destination_code": "GOI", "name": f"Trip {i}",
+             "description": "Synthetic trip", "price": float(rng.randint(500, 30000)),
+             "booking_count": float(rng.randint(0, 200)), "suggestion_type": rng.choice(types)}
+            for i in range(size)]
+
+
+@benchmark("smart_trip.rank_build", sizes=(42, 1000, 10000))
+def _bench_smart_trip_rank_build(size):
+    # Catalog refresh / fare drift par ek destination ka index rebuild
+    _import_service("Booking_Service_App", "Booking_Service")
+    from smart_trip_ranker import SmartTripRanker
+    items = _synthetic_trips(size, random.Random(size))
+
+    def _op():
+        SmartTripRanker().top("GOI", 10, loader=lambda: items)
+    return _op
+
+
+@benchmark("smart_trip.ranked_top_k", sizes=(42, 1000, 10000))
+def _bench_smart_trip_top_k(size):
+    # Request path: built index se type-mixed top 10 (catalog size se independent hona chahiye)
+    _import_service("Booking_Service_App", "Booking_Service")
+    from smart_trip_ranker import SmartTripRanker
+    items = _synthetic_trips(size, random.Random(size))
+    ranker = SmartTripRanker()
+    ranker.top("GOI", 10, loader=lambda: items)
+    return lambda: ranker.top("GOI", 10)
+
+
+@benchmark("payment.validate_card", sizes=(100, 1000, 10000))
+def _bench_validate_card(size):
+    app = _import_service("Payment_Service_App", "Payment_Service")
+    rng = random.Random(size)
+    cards = []
+    for _ in range(size):
+        digits = "".join(rng.choice("0123456789") for _ in range(16))
+        kind = rng.random()
+        if kind < 0.8:
+            cards.append(" ".join(digits[i:i + 4] for i in range(0, 16, 4)))
+        elif kind < 0.9:
+            cards.append(digits[:15] + "x")
+        else:
+            cards.append(digits[:12])
+    return lambda: [app.validate_card_number(c) for c in cards]
+
+
+def _synthetic_payments(size, rng):
+    # ~90% valid (Luhn check digit sahi), baaki galat check digit / format
+    prefixes = ("4", "51", "55", "2221", "6011", "60", "508", "37")
+    payments = []
+    for i in range(size):
+        prefix = rng.choice(prefixes)
+        length = 15 if prefix == "37" else 16
+        body = prefix + "".join(rng.choice("0123456789") for _ in range(length - len(prefix) - 1))
+        check = next(d for d in "0123456789" if _luhn_digits_ok(body + d))
+        if rng.random() < 0.1:
+            check = str((int(check) + 1) % 10)
+        number = body + check
+        payments.append({"card_number": " ".join(number[j:j + 4] for j in range(0, length, 4)),
+                         "amount": rng.randint(2000, 90000), "seat_number": f"{i % 30 + 1}{'ABCDEF'[i % 6]}",
+                         "email": f"traveller{i}@example.com"})
+    return payments
+
+
+def _luhn_digits_ok(number):
+    total = 0
+    for i, ch in enumerate(reversed(number)):
+        d = int(ch) * (2 if i % 2 else 1)
+        total += d - 9 if d > 9 else d
+    return total % 10 == 0
+
+
+@benchmark("payment.luhn_batch", sizes=(1000, 100000))
+def _bench_luhn_batch(size):
+    _import_service("Payment_Service_App", "Payment_Service")
+    from card_checks import luhn_valid
+    numbers = [p["card_number"].replace(" ", "") for p in _synthetic_payments(size, random.Random(size))]
+    return lambda: luhn_valid(numbers)
+
+
+@benchmark("payment.authorize_batch", sizes=(1000, 100000))
+def _bench_authorize_batch(size):
+    # /api/payment/batch ka core: card checks + BIN lookup + ledger append (har op naya ledger)
+    app = _import_service("Payment_Service_App", "Payment_Service")
+    from payment_ledger import PaymentLedger
+    payments = _synthetic_payments(size, random.Random(size))
+    defaults = {"flight_id": "F0000001", "flight_details": "DEL to GOI - IndiGo 6E-123"}
+    return lambda: app.authorize_batch(payments, defaults, "bench", PaymentLedger())
+
+
+@benchmark("payment.batch_endpoint", sizes=(100, 1000))
+def _bench_batch_endpoint(size):
+    # Poora HTTP path (JSON parse + authorize + jsonify) Flask test client se
+    os.environ["RATE_LIMIT_RPS"] = os.environ["CLIENT_RATE_LIMIT_RPS"] = "0"
+    app = _import_service("Payment_Service_App", "Payment_Service")
+    client = app.app.test_client()
+    body = {"flight_id": "F0000001", "flight_details": "DEL to GOI - IndiGo 6E-123",
+            "payments": _synthetic_payments(size, random.Random(size))}
+
+    def _op():
+        res = client.post("/api/payment/batch", json=body)
+        assert res.status_code == 200, res.status_code
+    return _op
+
+
+@benchmark("crowdpulse.get_social_posts", sizes=(1, 10, 100))
+def _bench_social_posts(size):
+    app = _import_service("crowdpulse_app", os.path.join("CrowdPulse", "backend"))
+    cities = list(app.CITY_MAP.values())
+    names = [cities[i % len(cities)] for i in range(size)]
+    return lambda: [app.get_social_posts(name) for name in names]
+
+
+@benchmark("flights.generate_flights", sizes=(10, 100, 1000))
+def _bench_generate_flights(size):
+    module = _import_service("populate_flights_db", "Flight_Service")
+    return lambda: module.generate_flights("international", "DEL-DXB", size, random.Random(42))
+
+
+@benchmark("email.build_mime", sizes=(1, 10, 100))
+def _bench_email_mime(size):
+    module = _import_service("email_sender_gmail", "Booking_Service")
+    details = {"booking_reference": "BK-ABC123", "flight_id": "F0000001",
+               "amount_paid": 22000, "transaction_id": "TXN-1A2B3C4D"}
+
+    def _op():
+        for i in range(size):
+            msg = module.build_confirmation_message("noreply@travelease.local", f"user{i}@example.com", details)
+            msg.as_bytes()  # send_message() bhi yahi serialization karta hai
+    return _op
+
+
+@benchmark("http.response_entry", sizes=(10, 100, 1000))
+def _bench_response_entry(size):
+    # Memo miss ka cost (serialize + ETag + gzip); memo hit / 304 par yeh nahi hota
+    app = _import_service("Flight_Service_App", "Flight_Service")
+    from travelease_common.http_cache import ResponseEntry
+    payload = {"flights": app.filter_flights(_synthetic_flights(size, random.Random(size)), "domestic")}
+    return lambda: ResponseEntry(payload, 0).encoded("gzip")
+
+
+def _codec_payload(size):
+    # Flight service ka response, seedha DynamoDB item types (price Decimal) ke saath
+    return {"flights": _synthetic_flights(size, random.Random(size))}
+
+
+def _with_bytes(op, body):
+    op.payload_bytes = len(body)
+    return op
+
+
+@benchmark("codec.json.encode", sizes=(10, 100, 1000))
+def _bench_json_encode(size):
+    import json
+    from travelease_common.cache import _json_default
+    payload = _codec_payload(size)
+
+    def _op():
+        return json.dumps(payload, default=_json_default, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return _with_bytes(_op, _op())
+
+
+@benchmark("codec.msgpack.encode", sizes=(10, 100, 1000))
+def _bench_msgpack_encode(size):
+    from travelease_common.http_cache import pack
+    payload = _codec_payload(size)
+
+    def _op():
+        return pack(payload)
+    return _with_bytes(_op, _op())
+
+
+@benchmark("codec.json.decode", sizes=(10, 100, 1000))
+def _bench_json_decode(size):
+    from travelease_common.http_cache import ResponseEntry, decode_body
+    body = ResponseEntry(_codec_payload(size), 0).body
+
+    def _op():
+        return decode_body(body, "application/json")
+    return _with_bytes(_op, body)
+
+
+@benchmark("codec.msgpack.decode", sizes=(10, 100, 1000))
+def _bench_msgpack_decode(size):
+    from travelease_common.http_cache import MSGPACK, decode_body, pack
+    body = pack(_codec_payload(size))
+
+    def _op():
+        return decode_body(body, MSGPACK)
+    return _with_bytes(_op, body)
+
+
+# ------------------------
+# RUNNER
+# ------------------------
+def time_op(op, repeat=DEFAULT_REPEAT, min_time=MIN_REPEAT_TIME):
+    """Per-op timings (seconds): {"best", "median", "loops", "repeat"}."""
+    op()  # warm-up (imports, caches)
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            op()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2 if elapsed == 0 else max(2, int(min_time / elapsed * 1.2))
+
+    samples = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            op()
+        samples.append((time.perf_counter() - start) / loops)
+    return {"best": min(samples), "median": statistics.median(samples), "loops": loops, "repeat": repeat}
+
+
+def select(patterns):
+    if not patterns:
+        return list(BENCHMARKS)
+    return [name for name in BENCHMARKS if any(p in name for p in patterns)]
+
+
+def run_suite(names, sizes=None, repeat=DEFAULT_REPEAT, min_time=MIN_REPEAT_TIME, progress=print):
+    """Returns {"<name>[<size>]": timings} for the given benchmarks."""
+    results = {}
+    for name in names:
+        setup, default_sizes = BENCHMARKS[name]
+        for size in sizes or default_sizes:
+            op = setup(size)
+            timings = time_op(op, repeat, min_time)
+            timings.update({"benchmark": name, "size": size})
+            payload_bytes = getattr(op, "payload_bytes", None)
+            if payload_bytes is not None:
+                timings["bytes"] = payload_bytes
+            key = f"{name}[{size}]"
+            results[key] = timings
+            progress(f"  {key:42s} {format_seconds(timings['median']):>10s}  "
+                     f"(best {format_seconds(timings['best'])}, {timings['loops']} loops)"
+                     f"{f', {payload_bytes} bytes' if payload_bytes is not None else ''}")
+    return results
+
+
+def format_seconds(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
@@ -0,0 +1,3 @@
+"""
+Deploy tooling used by update_frontend_and_deploy.py.
+"""
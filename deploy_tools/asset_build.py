@@ -0,0 +1,242 @@
+"""
+Frontend build stage: index.html -> build/ with minified, fingerprinted assets.
+
+1. index.html ke inline <style> aur <script> blocks extract hote hain
+2. minify (rcssmin/rjsmin installed hon to woh, warna built-in conservative minifier)
+3. content hash filenames: assets/app.<hash>.css, assets/app.<hash>.js
+4. ALB endpoint ek chhoti generated config file (assets/config.<hash>.js ->
+   window.TRAVELEASE_CONFIG) se inject hota hai; HTML/JS par koi regex
+   URL rewrite nahi. Source index.html mein uski jagah inline dev default
+   hai (CONFIG_PLACEHOLDER), isliye local dev mein koi config.js 404 nahi.
+
+HTML no-cache rehta hai, baaki sab fingerprinted (immutable) -- repeat
+visitors ko sirf HTML revalidate karna padta hai.
+
+    python -m deploy_tools.asset_build --alb-url http://my-alb... [--out build]
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+BUILD_DIR = "build"
+ASSETS_DIR = "assets"
+# index.html ka inline dev default (bina build ke bhi page chalta hai); build isse config file se badalta hai
+CONFIG_PLACEHOLDER = "<script>window.TRAVELEASE_CONFIG = window.TRAVELEASE_CONFIG || {};</script>"
+INLINE_STYLE_RE = re.compile(r"<style>(.*?)</style>", re.S)
+INLINE_SCRIPT_RE = re.compile(r"<script>(.*?)</script>", re.S)
+
+# Files copied as-is: source path (relative to repo) -> build path / S3 key
+STATIC_FILES = {
+    os.path.join("CrowdPulse", "frontend", "crowdpulse_widget.html"): "crowdpulse_widget.html",
+    os.path.join("images", "travelease_logo.png"): "images/travelease_logo.png",
+}
+
+
+# ------------------------
+# MINIFIERS
+# ------------------------
+def minify_css(css):
+    if rcssmin is not None:
+        return rcssmin.cssmin(css)
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};:,>])\s*", r"\1", css)
+    css = css.replace(";}", "}")
+    return css.strip()
+
+
+# Regex literal sirf in characters ke baad shuru ho sakta hai
+_REGEX_PREFIX = set("(,=:[!&|?{};+-*%<>~^")
+
+
+def _scan_template(js, i):
+    """Scan a template literal body from i; returns (end_index, "end" | "expr")."""
+    n = len(js)
+    while i < n:
+        if js[i] == "\\":
+            i += 2
+        elif js[i] == "`":
+            return i + 1, "end"
+        elif js.startswith("${", i):
+            return i + 2, "expr"
+        else:
+            i += 1
+    return n, "end"
+
+
+def minify_js(js):
+    """
+    Conservative JS minifier: comments hatata hai aur har line trim karta hai,
+    lekin newlines rakhta hai (ASI safe). Strings, template literals (nested
+    ${...} samet) aur regex literals ko bilkul touch nahi karta.
+    """
+    if rjsmin is not None:
+        return rjsmin.jsmin(js)
+    out = []
+    i, n = 0, len(js)
+    last_sig = ""
+    depth = 0
+    template_depths = []  # brace depth jahan ek ${ expression shuru hua
+    while i < n:
+        c = js[i]
+        nxt = js[i + 1] if i + 1 < n else ""
+        if c == "`" or (c == "}" and template_depths and depth == template_depths[-1]):
+            if c == "}":
+                template_depths.pop()
+            j, kind = _scan_template(js, i + 1)
+            if kind == "expr":
+                template_depths.append(depth)
+            out.append(js[i:j])
+            i = j
+            last_sig = "`"
+        elif c in "'\"":
+            j = i + 1
+            while j < n and js[j] != c and js[j] != "\n":
+                j += 2 if js[j] == "\\" else 1
+            out.append(js[i:j + 1])
+            i = j + 1
+            last_sig = c
+        elif c == "/" and nxt == "/":
+            while i < n and js[i] != "\n":
+                i += 1
+        elif c == "/" and nxt == "*":
+            end = js.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+            out.append(" ")
+        elif c == "/" and (last_sig in _REGEX_PREFIX or last_sig == ""):
+            j, in_class = i + 1, False
+            while j < n and (in_class or js[j] != "/") and js[j] != "\n":
+                if js[j] == "\\":
+                    j += 1
+                elif js[j] == "[":
+                    in_class = True
+                elif js[j] == "]":
+                    in_class = False
+                j += 1
+            out.append(js[i:j + 1])
+            i = j + 1
+            last_sig = "/"
+        elif c == "\n":
+            # Line trim: trailing whitespace hatao, blank lines skip karo.
+            # Template literal ka text upar ek chunk mein jata hai, isliye
+            # uske andar ke newlines/whitespace yahan kabhi nahi aate.
+            while out and out[-1] in (" ", "\t", "\r"):
+                out.pop()
+            if out and out[-1] != "\n":
+                out.append("\n")
+            i += 1
+        elif c.isspace() and (not out or out[-1] in ("\n", " ", "\t")):
+            i += 1  # leading / repeated whitespace
+        else:
+            if c == "{":
+                depth += 1
+            elif c == "}":
+                depth -= 1
+            out.append(" " if c.isspace() else c)
+            if not c.isspace():
+                last_sig = c
+            i += 1
+
+    return "".join(out).strip()
+
+
+# ------------------------
+# BUILD
+# ------------------------
+def _fingerprint(content):
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:10]
+
+
+def _write_asset(out_dir, stem, ext, content):
+    name = f"{ASSETS_DIR}/{stem}.{_fingerprint(content)}.{ext}"
+    with open(os.path.join(out_dir, name), "w", encoding="utf-8") as f:
+        f.write(content)
+    return name
+
+
+def build_frontend(repo_dir, alb_url, out_dir=None):
+    """
+    Build index.html + assets into out_dir.
+    Returns {local_path: s3_key} for everything that should be deployed.
+    """
+    out_dir = out_dir or os.path.join(repo_dir, BUILD_DIR)
+    if os.path.isdir(out_dir):
+        shutil.rmtree(out_dir)
+    os.makedirs(os.path.join(out_dir, ASSETS_DIR))
+
+    with open(os.path.join(repo_dir, "index.html"), "r", encoding="utf-8") as f:
+        html = f.read()
+
+    # 1. CSS: saare inline <style> blocks ek file mein, pehle block ki jagah <link>
+    styles = INLINE_STYLE_RE.findall(html)
+    if styles:
+        css_name = _write_asset(out_dir, "app", "css", minify_css("\n".join(styles)))
+        first = [True]
+
+        def _style_to_link(_match):
+            if first[0]:
+                first[0] = False
+                return f'<link rel="stylesheet" href="{css_name}">'
+            return ""
+        html = INLINE_STYLE_RE.sub(_style_to_link, html)
+
+    # 2. Runtime config (ALB endpoint) -- dev default inline script ki jagah, JS extract se pehle
+    config_js = f"window.TRAVELEASE_CONFIG = {json.dumps({'ALB_URL': alb_url})};\n"
+    config_tag = f'<script src="{_write_asset(out_dir, "config", "js", config_js)}"></script>'
+    if CONFIG_PLACEHOLDER in html:
+        html = html.replace(CONFIG_PLACEHOLDER, config_tag)
+    else:
+        html = html.replace("</head>", f"    {config_tag}\n</head>", 1)
+
+    # 3. JS: har inline <script> apni jagah par external file ban jata hai (order same)
+    def _script_to_src(match):
+        js_name = _write_asset(out_dir, "app", "js", minify_js(match.group(1)))
+        return f'<script src="{js_name}"></script>'
+    html = INLINE_SCRIPT_RE.sub(_script_to_src, html)
+
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(html)
+
+    files = {}
+    for src, key in STATIC_FILES.items():
+        src_path = os.path.join(repo_dir, src)
+        if not os.path.exists(src_path):
+            print(f"[WARN] File not found: {src}")
+            continue
+        dst_path = os.path.join(out_dir, *key.split("/"))
+        os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+        shutil.copyfile(src_path, dst_path)
+
+    for root, _, names in os.walk(out_dir):
+        for name in names:
+            path = os.path.join(root, name)
+            files[path] = os.path.relpath(path, out_dir).replace(os.sep, "/")
+    return files
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the TravelEase frontend")
+    parser.add_argument("--repo-dir", default=".")
+    parser.add_argument("--alb-url", required=True)
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args(argv)
+
+    files = build_frontend(args.repo_dir, args.alb_url, args.out)
+    for path, key in sorted(files.items(), key=lambda kv: kv[1]):
+        print(f"  {key:45s} {os.path.getsize(path) / 1024:8.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Parallel, content-hash-aware S3 deploy for the frontend.
+
+- Har file ka exact upload body (compression ke baad) hash hota hai. Skip
+  tabhi jab bucket listing (list_objects_v2: ETag + size) mein object wahi
+  body ho AUR local manifest (.deploy_manifest.json) / HEAD headers bhi
+  match karein. Manifest akela kaafi nahi: bahar se badla ya delete hua
+  object listing se pakda jata hai aur dobara upload hota hai.
+- Text assets (html/js/css/json/svg) gzip se pre-compress hote hain aur
+  `Content-Encoding: gzip` ke saath upload hote hain. Brotli variants nahi:
+  S3 website hosting Accept-Encoding par negotiate nahi karta, `<key>.br`
+  kabhi serve hi nahi hota (uske liye CloudFront chahiye).
+- Fingerprinted assets (name.<hash>.ext) ko 1 saal ka immutable
+  Cache-Control milta hai; HTML hamesha revalidate hota hai.
+- Uploads ek thread pool se concurrently hote hain.
+- endpoint_url se local S3 stand-in (MinIO, moto server) par test ho sakta hai.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+
+MANIFEST_NAME = ".deploy_manifest.json"
+COMPRESSIBLE_TYPES = ("text/html", "text/css", "application/javascript", "text/javascript",
+                      "application/json", "image/svg+xml")
+FINGERPRINT_RE = re.compile(r"\.[0-9a-f]{8,}\.[a-z0-9]+$")
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+CACHE_HTML = "no-cache"
+CACHE_DEFAULT = "public, max-age=86400"
+MIN_COMPRESS_BYTES = 1024
+
+
+def guess_content_type(path):
+    if path.endswith(".js"):
+        return "application/javascript"
+    return mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+
+def cache_control_for(key, content_type):
+    if FINGERPRINT_RE.search(key):
+        return CACHE_IMMUTABLE
+    if content_type == "text/html":
+        return CACHE_HTML
+    return CACHE_DEFAULT
+
+
+class Upload:
+    """One object to put: key, body bytes and headers."""
+
+    def __init__(self, key, body, content_type, cache_control, content_encoding=None):
+        self.key = key
+        self.body = body
+        self.content_type = content_type
+        self.cache_control = cache_control
+        self.content_encoding = content_encoding
+        self.md5 = hashlib.md5(body).hexdigest()
+
+    def signature(self):
+        # Headers bhi signature mein -> sirf Cache-Control badle to bhi re-upload
+        return {"md5": self.md5, "content_type": self.content_type,
+                "cache_control": self.cache_control, "content_encoding": self.content_encoding}
+
+
+def build_uploads(files):
+    """
+    files: {local_path: s3_key}. Returns the list of Upload objects
+    (text assets gzip-compressed).
+    """
+    uploads = []
+    for local_path, key in files.items():
+        with open(local_path, "rb") as f:
+            raw = f.read()
+        content_type = guess_content_type(local_path)
+        cache_control = cache_control_for(key, content_type)
+
+        if content_type in COMPRESSIBLE_TYPES and len(raw) >= MIN_COMPRESS_BYTES:
+            # mtime=0 -> same input, same bytes, same ETag
+            uploads.append(Upload(key, gzip.compress(raw, compresslevel=9, mtime=0),
+                                  content_type, cache_control, "gzip"))
+        else:
+            uploads.append(Upload(key, raw, content_type, cache_control))
+    return uploads
+
+
+def load_manifest(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(path, manifest):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+class S3Deployer:
+    def __init__(self, bucket, manifest_path=MANIFEST_NAME, workers=8, endpoint_url=None,
+                 region=None, check_remote=False, force=False):
+        self.bucket = bucket
+        self.manifest_path = manifest_path
+        self.workers = workers
+        self.check_remote = check_remote
+        self.force = force
+        # boto3 clients thread-safe hain -> ek client saare workers share karte hain
+        self.s3 = boto3.client("s3", endpoint_url=endpoint_url, region_name=region)
+        self._lock = threading.Lock()
+
+    def _list_remote(self):
+        """{key: (etag, size)} for the whole bucket (ek request per 1000 keys)."""
+        remote = {}
+        try:
+            for page in self.s3.get_paginator("list_objects_v2").paginate(Bucket=self.bucket):
+                for obj in page.get("Contents", []):
+                    remote[obj["Key"]] = (obj["ETag"].strip('"'), obj["Size"])
+        except Exception as e:
+            # Listing na mile to kuch bhi skip nahi (sab upload) -- safe side
+            print(f"⚠️ Could not list s3://{self.bucket} ({e}); uploading every file")
+            return {}
+        return remote
+
+    def _remote_matches(self, upload):
+        try:
+            head = self.s3.head_object(Bucket=self.bucket, Key=upload.key)
+        except Exception:
+            return False
+        return (head.get("ETag", "").strip('"') == upload.md5
+                and head.get("CacheControl") == upload.cache_control
+                and head.get("ContentEncoding") == upload.content_encoding)
+
+    def _put(self, upload):
+        kwargs = {
+            "Bucket": self.bucket,
+            "Key": upload.key,
+            "Body": upload.body,
+            "ContentType": upload.content_type,
+            "CacheControl": upload.cache_control,
+        }
+        if upload.content_encoding:
+            kwargs["ContentEncoding"] = upload.content_encoding
+        self.s3.put_object(**kwargs)
+
+    def _deploy_one(self, upload, bucket_manifest, remote):
+        if not self.force and remote.get(upload.key) == (upload.md5, len(upload.body)):
+            # Body bucket mein wahi hai; headers manifest (ya HEAD) se confirm
+            if bucket_manifest.get(upload.key) == upload.signature():
+                return "skipped"
+            if self.check_remote and self._remote_matches(upload):
+                with self._lock:
+                    bucket_manifest[upload.key] = upload.signature()
+                return "skipped"
+        self._put(upload)
+        with self._lock:
+            bucket_manifest[upload.key] = upload.signature()
+        return "uploaded"
+
+    def deploy(self, files):
+        """Upload changed files; returns {"uploaded": [...], "skipped": [...], "bytes": n}."""
+        uploads = build_uploads(files)
+        manifest = load_manifest(self.manifest_path)
+        bucket_manifest = manifest.setdefault(self.bucket, {})
+        remote = {} if self.force else self._list_remote()
+        result = {"uploaded": [], "skipped": [], "bytes": 0}
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                outcomes = pool.map(lambda u: (u, self._deploy_one(u, bucket_manifest, remote)), uploads)
+                for upload, outcome in outcomes:
+                    result[outcome].append(upload.key)
+                    if outcome == "uploaded":
+                        result["bytes"] += len(upload.body)
+        finally:
+            # Partial failure par bhi jo upload hua woh manifest mein rahe
+            save_manifest(self.manifest_path, manifest)
+        return result
@@ -0,0 +1,211 @@
+"""
+Chhota task-graph executor for the deploy script.
+
+Har step ek named task hai jiske declared dependencies hain; jo steps ek
+doosre par depend nahi karte (populate scripts, S3 upload) woh thread pool
+mein parallel chalte hain. Har task ka output (print aur subprocess dono)
+`[task] ...` prefix ke saath stream hota hai, timings record hoti hain, aur
+end mein critical path report hota hai -- yaani deploy time kis chain ne
+liya.
+
+    graph = TaskGraph()
+    graph.add("terraform", get_outputs)
+    graph.add("build", lambda r: build(r["terraform"]), deps=["terraform"])
+    graph.run()
+    print(graph.report())
+"""
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+_print_lock = threading.Lock()
+_current = threading.local()
+
+
+class _PrefixedStream:
+    """
+    sys.stdout wrapper: jis thread mein task chal raha hai uska naam har line
+    ke aage lagata hai. Adhi lines thread-wise buffer hoti hain taaki do tasks
+    ka output ek line mein mix na ho.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._partial = {}
+
+    def write(self, text):
+        prefix = getattr(_current, "name", None)
+        if prefix is None:
+            with _print_lock:
+                return self.stream.write(text)
+        key = threading.get_ident()
+        buf = self._partial.get(key, "") + text
+        *lines, rest = buf.split("\n")
+        self._partial[key] = rest
+        if lines:
+            with _print_lock:
+                self.stream.write("".join(f"[{prefix}] {line}\n" for line in lines))
+        return len(text)
+
+    def flush_thread(self):
+        rest = self._partial.pop(threading.get_ident(), "")
+        if rest:
+            self.write(rest + "\n")
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def stream_command(cmd, cwd=None, env=None):
+    """Run cmd (str -> shell, list -> exec), streaming its output line by line. Returns exit code."""
+    process = subprocess.Popen(cmd, cwd=cwd, env=env, shell=isinstance(cmd, str),
+                               stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    for line in process.stdout:
+        print(line, end="")
+    return process.wait()
+
+
+class Task:
+    def __init__(self, name, func, deps=()):
+        self.name = name
+        self.func = func
+        self.deps = list(deps)
+        self.status = "pending"  # pending | ok | failed | skipped
+        self.result = None
+        self.error = None
+        self.start = None
+        self.end = None
+
+    @property
+    def duration(self):
+        if self.start is None or self.end is None:
+            return 0.0
+        return self.end - self.start
+
+
+class TaskGraph:
+    def __init__(self):
+        self.tasks = {}
+        self.started_at = None
+        self.finished_at = None
+
+    def add(self, name, func, deps=()):
+        """func(results) -- results: {dep_name: return value} of finished tasks."""
+        if name in self.tasks:
+            raise ValueError(f"Duplicate task: {name}")
+        self.tasks[name] = Task(name, func, deps)
+        return self
+
+    def _validate(self):
+        for task in self.tasks.values():
+            for dep in task.deps:
+                if dep not in self.tasks:
+                    raise ValueError(f"Task '{task.name}' depends on unknown task '{dep}'")
+        # Cycle check (DFS)
+        state = {}
+
+        def _visit(name, path):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Dependency cycle: {' -> '.join(path + [name])}")
+            state[name] = "visiting"
+            for dep in self.tasks[name].deps:
+                _visit(dep, path + [name])
+            state[name] = "done"
+
+        for name in self.tasks:
+            _visit(name, [])
+
+    def _run_task(self, task, results, stream):
+        _current.name = task.name
+        task.start = time.perf_counter()
+        try:
+            task.result = task.func(results)
+            task.status = "ok"
+        except (Exception, SystemExit) as e:
+            # sys.exit() bhi task failure hai, poora deploy process nahi
+            task.status = "failed"
+            task.error = e
+            print(f"[ERROR] {type(e).__name__}: {e}")
+        finally:
+            task.end = time.perf_counter()
+            stream.flush_thread()
+            _current.name = None
+        return task
+
+    def run(self, max_workers=None):
+        """
+        Run all tasks respecting dependencies. A failed task marks its
+        dependents as skipped; independent branches keep running.
+        Returns True if every task succeeded.
+        """
+        self._validate()
+        stream = _PrefixedStream(sys.stdout)
+        old_stdout, sys.stdout = sys.stdout, stream
+        results = {}
+        pending = dict(self.tasks)
+        running = {}
+        self.started_at = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers or len(self.tasks) or 1) as pool:
+                while pending or running:
+                    for name, task in list(pending.items()):
+                        dep_status = [self.tasks[d].status for d in task.deps]
+                        if any(s in ("failed", "skipped") for s in dep_status):
+                            task.status = "skipped"
+                            del pending[name]
+                        # status worker thread set karta hai; results yahin bharte hain ->
+                        # dep tabhi ready jab uska future yahan process ho chuka ho
+                        elif all(d in results for d in task.deps):
+                            deps_results = {d: results[d] for d in task.deps}
+                            running[pool.submit(self._run_task, task, deps_results, stream)] = name
+                            del pending[name]
+                    if not running:
+                        continue
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        task = future.result()
+                        del running[future]
+                        if task.status == "ok":
+                            results[task.name] = task.result
+        finally:
+            sys.stdout = old_stdout
+            self.finished_at = time.perf_counter()
+        return all(t.status == "ok" for t in self.tasks.values())
+
+    def critical_path(self):
+        """
+        Chain of tasks that actually determined the total time: last task to
+        finish, then (recursively) whichever of its deps finished last.
+        """
+        finished = [t for t in self.tasks.values() if t.end is not None]
+        if not finished:
+            return []
+        task = max(finished, key=lambda t: t.end)
+        path = [task]
+        while task.deps:
+            deps = [self.tasks[d] for d in task.deps if self.tasks[d].end is not None]
+            if not deps:
+                break
+            task = max(deps, key=lambda t: t.end)
+            path.append(task)
+        return list(reversed(path))
+
+    def report(self):
+        lines = ["", "[TIMINGS]"]
+        width = max((len(n) for n in self.tasks), default=4)
+        for task in sorted(self.tasks.values(), key=lambda t: (t.start is None, t.start or 0)):
+            offset = "" if task.start is None else f"+{task.start - self.started_at:6.1f}s"
+            lines.append(f"  {task.name:{width}s}  {task.status:8s} {offset:>8s}  {task.duration:7.1f}s")
+        total = (self.finished_at or time.perf_counter()) - self.started_at
+        path = self.critical_path()
+        chain = " -> ".join(f"{t.name} ({t.duration:.1f}s)" for t in path)
+        lines.append(f"  Critical path: {chain or '-'}")
+        lines.append(f"  Total: {total:.1f}s wall, {sum(t.duration for t in self.tasks.values()):.1f}s of task time")
+        return "\n".join(lines)
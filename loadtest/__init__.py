@@ -0,0 +1,10 @@
+"""
+End-to-end load testing for the TravelEase services.
+
+    python -m loadtest --concurrency 20 --rate 10 --duration 60
+
+Flight, Booking, Payment aur CrowdPulse local processes ki tarah start hote
+hain, in-memory stand-ins ke against (DynamoDB -> moto server, SMTP sink,
+YouTube search stub), aur asli user flow chalta hai:
+search -> payment -> book -> smart-trip -> crowdpulse -> cancel.
+"""
@@ -0,0 +1,110 @@
+"""
+    python -m loadtest [--concurrency 10] [--rate 0] [--duration 30] [--json out.json]
+
+--rate 0 (default) closed model hai: concurrency workers back-to-back
+sessions chalate hain. --rate N open model: N sessions/sec arrive hote hain.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+from loadtest.harness import (
+    SERVICES, LatencyStats, ServiceProcess, UserFlow, format_report, percentile, run_load, service_env,
+    upstream_env,
+)
+from loadtest.standins import DynamoStandIn, SmtpSink, YouTubeStandIn
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="End-to-end TravelEase load test against local stand-ins")
+    parser.add_argument("--concurrency", type=int, default=10, help="Parallel virtual users (workers)")
+    parser.add_argument("--rate", type=float, default=0.0, help="Session arrivals/sec (0 = closed model)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load")
+    parser.add_argument("--warmup", type=float, default=0.0, help="Seconds of unmeasured load before the run")
+    parser.add_argument("--flights-per-route", type=int, default=10)
+    parser.add_argument("--smtp-latency", type=float, default=0.0, help="Seconds per email in the SMTP stand-in")
+    parser.add_argument("--youtube-latency", type=float, default=0.0, help="Seconds per YouTube search")
+    parser.add_argument("--no-crowdpulse", action="store_true",
+                        help="Do not start CrowdPulse (/api/destination returns partial results)")
+    parser.add_argument("--serving", choices=("dev", "gunicorn"), default="dev",
+                        help="dev: app.run(); gunicorn: python -m travelease_common.serving")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="Extra env for the services (e.g. CACHE_BACKEND=sqlite); repeatable")
+    parser.add_argument("--log-dir", default=None, help="Service logs (default: temp dir)")
+    parser.add_argument("--json", default=None, help="Write the results as JSON to this file")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    log_dir = args.log_dir or tempfile.mkdtemp(prefix="travelease-loadtest-")
+    os.makedirs(log_dir, exist_ok=True)
+    extra_env = dict(kv.split("=", 1) for kv in args.env)
+    names = [n for n in SERVICES if not (args.no_crowdpulse and n == "crowdpulse")]
+
+    dynamo = DynamoStandIn(log_path=os.path.join(log_dir, "dynamodb.log"))
+    smtp = SmtpSink(latency=args.smtp_latency).start()
+    youtube = YouTubeStandIn(latency=args.youtube_latency).start()
+    services = []
+    try:
+        print(f"[SETUP] DynamoDB stand-in on {dynamo.endpoint_url}")
+        dynamo.start()
+        dynamo.create_tables()
+        flights = dynamo.seed(args.flights_per_route)
+        routes = sorted({(f["type"], f["route"]) for f in flights})
+        print(f"[SETUP] Seeded {len(flights)} flights on {len(routes)} routes")
+
+        env = service_env(dynamo.endpoint_url, smtp.port, youtube.url, extra_env)
+        services = [ServiceProcess(name, env, log_dir, args.serving) for name in names]
+        urls = {s.name: s.url for s in services}
+        for service in services:
+            service.env.update(upstream_env(urls))
+            service.start()
+        for service in services:
+            service.wait_ready()
+            print(f"[SETUP] {service.name} service on {service.url}")
+
+        if args.warmup > 0:
+            print(f"[WARMUP] {args.warmup:.0f}s")
+            run_load(UserFlow(urls, routes, LatencyStats()),
+                     args.concurrency, args.rate, args.warmup, args.seed)
+
+        mode = f"open model, {args.rate:g} sessions/s" if args.rate > 0 else "closed model"
+        print(f"[RUN] {args.duration:.0f}s, concurrency {args.concurrency}, {mode}")
+        stats = LatencyStats()
+        flow = UserFlow(urls, routes, stats)
+        elapsed, sessions, failed, queue_delays = run_load(flow, args.concurrency, args.rate,
+                                                           args.duration, args.seed)
+    finally:
+        for service in services:
+            service.stop()
+        dynamo.stop()
+        smtp.shutdown()
+        youtube.shutdown()
+
+    summary = stats.summary(elapsed)
+    print(format_report(summary, elapsed, sessions))
+    if failed:
+        print(f"[WARN] {failed} sessions failed; service logs in {log_dir}")
+    if queue_delays:
+        print(f"Queue delay: p50 {1000 * percentile(queue_delays, 50):.1f} ms, "
+              f"p99 {1000 * percentile(queue_delays, 99):.1f} ms")
+    print(f"Emails sent: {smtp.messages}, YouTube searches: {youtube.requests}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "timestamp": time.time(),
+                "config": vars(args),
+                "elapsed_s": elapsed,
+                "sessions": sessions,
+                "failed_sessions": failed,
+                "endpoints": summary,
+            }, f, indent=2)
+        print(f"[OK] Results written to {args.json}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
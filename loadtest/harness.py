@@ -0,0 +1,270 @@
+"""
+Service processes, the user-flow driver and latency statistics.
+
+Load model:
+- rate > 0  -> open model: sessions Poisson arrivals se `rate`/sec par aate
+  hain, `concurrency` workers unhe chalate hain (workers busy hon to sessions
+  queue mein wait karte hain; queue delay alag report hota hai).
+- rate == 0 -> closed model: har worker back-to-back sessions chalata hai.
+"""
+import json
+import os
+import queue
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+
+from loadtest.standins import REGION, REPO_DIR, free_port, wait_for_http
+
+# name -> (script relative to repo, health path)
+SERVICES = {
+    "flight": (os.path.join("Flight_Service", "Flight_Service_App.py"), "/ping"),
+    "booking": (os.path.join("Booking_Service", "Booking_Service_App.py"), "/ping"),
+    "payment": (os.path.join("Payment_Service", "Payment_Service_App.py"), "/ping"),
+    "crowdpulse": (os.path.join("CrowdPulse", "backend", "crowdpulse_app.py"), "/ping"),
+}
+
+
+# ------------------------
+# SERVICE PROCESSES
+# ------------------------
+class ServiceProcess:
+    """serving: "dev" (script ka app.run) ya "gunicorn" (travelease_common.serving launcher)."""
+
+    def __init__(self, name, env, log_dir, serving="dev"):
+        self.name = name
+        self.serving = serving
+        self.script, self.health_path = SERVICES[name]
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.env = dict(env, PORT=str(self.port))
+        self.log_path = os.path.join(log_dir, f"{name}.log")
+        self.process = None
+
+    def start(self):
+        script = os.path.join(REPO_DIR, self.script)
+        if self.serving == "gunicorn":
+            cmd, cwd = [sys.executable, "-m", "travelease_common.serving", self.name], REPO_DIR
+        else:
+            cmd, cwd = [sys.executable, script], os.path.dirname(script)
+        log = open(self.log_path, "w")
+        self.process = subprocess.Popen(cmd, cwd=cwd, env=self.env, stdout=log, stderr=subprocess.STDOUT)
+        return self
+
+    def wait_ready(self, timeout=60.0):
+        try:
+            wait_for_http(self.url + self.health_path, timeout, self.process)
+        except Exception as e:
+            raise RuntimeError(f"{self.name} service failed to start ({e}); see {self.log_path}")
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+def upstream_env(urls):
+    """Booking ke /api/destination aggregator ke liye doosri services ke URLs."""
+    return {"FLIGHT_SERVICE_URL": urls.get("flight", ""), "CROWDPULSE_SERVICE_URL": urls.get("crowdpulse", "")}
+
+
+def service_env(dynamodb_url, smtp_port, youtube_url, extra=None):
+    env = dict(os.environ)
+    env.update({
+        "DYNAMODB_ENDPOINT_URL": dynamodb_url,
+        "AWS_ACCESS_KEY_ID": "loadtest",
+        "AWS_SECRET_ACCESS_KEY": "loadtest",
+        "AWS_DEFAULT_REGION": REGION,
+        "AWS_REGION": REGION,
+        "EMAIL_USER": "loadtest@travelease.local",
+        "EMAIL_PASS": "loadtest",
+        "SMTP_HOST": "127.0.0.1",
+        "SMTP_PORT": str(smtp_port),
+        "SMTP_STARTTLS": "0",
+        "YOUTUBE_API_KEY": "loadtest",
+        "YOUTUBE_API_ENDPOINT": youtube_url,
+        "PYTHONUNBUFFERED": "1",
+        # Saara load ek client (127.0.0.1) se aata hai aur YouTube stand-in ka
+        # koi quota nahi -> rate limits off; --env se wapas on kar sakte ho
+        "RATE_LIMIT_RPS": "0",
+        "CLIENT_RATE_LIMIT_RPS": "0",
+        "LIMIT_YOUTUBE_RPS": "0",
+        # Aggregator -> Flight / CrowdPulse calls trusted (per-client bucket skip)
+        "INTERNAL_API_KEY": "loadtest-internal",
+    })
+    env.update(extra or {})
+    return env
+
+
+# ------------------------
+# STATS
+# ------------------------
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class LatencyStats:
+    def __init__(self):
+        self.samples = {}  # endpoint -> [seconds]
+        self.errors = {}   # endpoint -> count
+        self.lock = threading.Lock()
+
+    def record(self, endpoint, seconds, ok):
+        with self.lock:
+            self.samples.setdefault(endpoint, []).append(seconds)
+            if not ok:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def summary(self, elapsed):
+        rows = {}
+        for endpoint, values in self.samples.items():
+            values = sorted(values)
+            rows[endpoint] = {
+                "count": len(values),
+                "errors": self.errors.get(endpoint, 0),
+                "rps": len(values) / elapsed if elapsed else 0.0,
+                "mean_ms": 1000 * sum(values) / len(values),
+                "p50_ms": 1000 * percentile(values, 50),
+                "p95_ms": 1000 * percentile(values, 95),
+                "p99_ms": 1000 * percentile(values, 99),
+                "max_ms": 1000 * values[-1],
+            }
+        return rows
+
+
+def format_report(summary, elapsed, sessions):
+    lines = [f"\n{'endpoint':24s} {'count':>7s} {'err':>5s} {'rps':>8s} "
+             f"{'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s} {'max ms':>8s}"]
+    for endpoint, row in summary.items():
+        lines.append(f"{endpoint:24s} {row['count']:7d} {row['errors']:5d} {row['rps']:8.1f} "
+                     f"{row['p50_ms']:8.1f} {row['p95_ms']:8.1f} {row['p99_ms']:8.1f} {row['max_ms']:8.1f}")
+    lines.append(f"\n{sessions} sessions in {elapsed:.1f}s ({sessions / elapsed if elapsed else 0:.1f} sessions/s)")
+    return "\n".join(lines)
+
+
+# ------------------------
+# USER FLOW
+# ------------------------
+def _call(stats, endpoint, method, url, payload=None, timeout=30):
+    data = json.dumps(payload).encode() if payload is not None else None
+    req = urllib.request.Request(url, data=data, method=method,
+                                 headers={"Content-Type": "application/json"} if data else {})
+    start = time.perf_counter()
+    status, body = 0, None
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as res:
+            status, raw = res.status, res.read()
+        body = json.loads(raw) if raw else None
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except (OSError, ValueError):
+        pass
+    stats.record(endpoint, time.perf_counter() - start, 200 <= status < 300)
+    return status, body
+
+
+class UserFlow:
+    """
+    search -> payment -> book -> cancel, like index.html does. Search
+    /api/destination aggregator se hota hai: flights + smart-trip +
+    CrowdPulse ek request mein (Booking service parallel fetch karti hai).
+    """
+
+    def __init__(self, urls, routes, stats):
+        self.urls = urls
+        self.routes = routes  # [(flight_type, "FROM-TO")]
+        self.stats = stats
+
+    def run(self, rng):
+        flight_type, route = rng.choice(self.routes)
+        origin, dest = route.split("-")
+        status, body = _call(self.stats, "GET /api/destination/<c>", "GET",
+                             f"{self.urls['booking']}/api/destination/{dest}?from={origin}&type={flight_type}")
+        flights = (body or {}).get("flights") or []
+        if status != 200 or not flights:
+            return False
+        flight = rng.choice(flights)
+        email = f"user-{uuid.uuid4().hex[:8]}@loadtest.local"
+        seat = f"{rng.randint(1, 30)}{rng.choice('ABCDEF')}"
+        details = f"{flight['name']} {flight['flightNumber']} {route}"
+
+        status, payment = _call(self.stats, "POST /api/payment", "POST", f"{self.urls['payment']}/api/payment", {
+            "card_number": "4111 1111 1111 1111", "amount": flight["price"], "flight_id": flight["flight_id"],
+            "flight_details": details, "seat_number": seat, "email": email,
+        })
+        if status != 200:
+            return False
+
+        status, booking = _call(self.stats, "POST /book", "POST", f"{self.urls['booking']}/book", {
+            "flight_id": payment["flight_id"], "flight_details": payment["flight_details"],
+            "seat_number": payment["seat_number"], "amount_paid": payment["amount_paid"],
+            "transaction_id": payment["transaction_id"], "user_email": payment["user_email"],
+        })
+        if status != 200:
+            return False
+
+        status, _ = _call(self.stats, "POST /cancel", "POST", f"{self.urls['booking']}/cancel", {
+            "booking_reference": booking["booking_reference"], "user_email": email,
+        })
+        return status == 200
+
+
+def run_load(flow, concurrency=10, rate=0.0, duration=30.0, seed=None):
+    """
+    Drive `flow` for `duration` seconds. Returns (elapsed, sessions,
+    failed_sessions, queue_delays) -- queue_delays sirf open model mein.
+    """
+    stop_at = time.perf_counter() + duration
+    arrivals = queue.Queue()
+    counts = {"sessions": 0, "failed": 0}
+    queue_delays = []
+    lock = threading.Lock()
+
+    def _worker(worker_id):
+        rng = random.Random(None if seed is None else seed + worker_id)
+        while True:
+            if rate > 0:
+                arrived_at = arrivals.get()
+                if arrived_at is None:
+                    return
+                delay = time.perf_counter() - arrived_at
+            elif time.perf_counter() >= stop_at:
+                return
+            ok = flow.run(rng)
+            with lock:
+                counts["sessions"] += 1
+                counts["failed"] += 0 if ok else 1
+                if rate > 0:
+                    queue_delays.append(delay)
+
+    start = time.perf_counter()
+    workers = [threading.Thread(target=_worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for w in workers:
+        w.start()
+
+    if rate > 0:
+        rng = random.Random(seed)
+        next_at = start
+        while next_at < stop_at:
+            time.sleep(max(0.0, next_at - time.perf_counter()))
+            arrivals.put(time.perf_counter())
+            next_at += rng.expovariate(rate)
+        # Jo sessions duration ke andar aaye woh poore honge; queue khali ho
+        # jaaye to workers ko band karo
+        for _ in workers:
+            arrivals.put(None)
+    for w in workers:
+        w.join()
+    return time.perf_counter() - start, counts["sessions"], counts["failed"], sorted(queue_delays)
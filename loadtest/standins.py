@@ -0,0 +1,234 @@
+"""
+Local stand-ins for the services' external dependencies.
+
+- DynamoDB: moto server (alag process, taaki load driver ke GIL se na lade),
+  tables wahi schema ke saath jo terraform/dynamodb.tf banata hai, aur
+  seeded flights / smart trips.
+- SMTP: chhota sink jo har message accept karke count karta hai
+  (optional latency, Gmail round-trip simulate karne ke liye).
+- YouTube: /youtube/v3/search ka stub jo fixed results deta hai
+  (optional latency).
+"""
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import boto3
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REGION = "eu-north-1"  # Booking service isi region par fixed hai
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_http(url, timeout=30.0, process=None):
+    """Poll url until it answers (any HTTP status) or timeout."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"Process for {url} exited with code {process.returncode}")
+        try:
+            urllib.request.urlopen(url, timeout=1)
+            return
+        except urllib.error.HTTPError:
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"{url} did not come up within {timeout}s")
+
+
+# ------------------------
+# DYNAMODB (moto)
+# ------------------------
+class DynamoStandIn:
+    def __init__(self, port=None, log_path=os.devnull):
+        self.port = port or free_port()
+        self.endpoint_url = f"http://127.0.0.1:{self.port}"
+        self.log_path = log_path
+        self.process = None
+
+    def start(self):
+        try:
+            import moto.server  # noqa: F401
+        except ImportError:
+            raise RuntimeError("DynamoDB stand-in needs moto[server]: pip install 'moto[server]'")
+        log = open(self.log_path, "w")
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "moto.server", "-H", "127.0.0.1", "-p", str(self.port)],
+            stdout=log, stderr=subprocess.STDOUT)
+        wait_for_http(self.endpoint_url, process=self.process)
+        return self
+
+    def stop(self):
+        if self.process is not None:
+            self.process.terminate()
+            self.process.wait(timeout=10)
+
+    def resource(self):
+        return boto3.resource("dynamodb", region_name=REGION, endpoint_url=self.endpoint_url,
+                              aws_access_key_id="loadtest", aws_secret_access_key="loadtest")
+
+    def create_tables(self):
+        """Same key schema as terraform/dynamodb.tf."""
+        dynamodb = self.resource()
+        dynamodb.create_table(
+            TableName="TravelEase-Flights", BillingMode="PAY_PER_REQUEST",
+            KeySchema=[{"AttributeName": "flight_id", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "flight_id", "AttributeType": "S"},
+                                  {"AttributeName": "route", "AttributeType": "S"},
+                                  {"AttributeName": "date", "AttributeType": "S"}],
+            GlobalSecondaryIndexes=[{"IndexName": "route-index",
+                                     "KeySchema": [{"AttributeName": "route", "KeyType": "HASH"}],
+                                     "Projection": {"ProjectionType": "ALL"}},
+                                    {"IndexName": "route-date-index",
+                                     "KeySchema": [{"AttributeName": "route", "KeyType": "HASH"},
+                                                   {"AttributeName": "date", "KeyType": "RANGE"}],
+                                     "Projection": {"ProjectionType": "ALL"}}])
+        dynamodb.create_table(
+            TableName="BookingsDB", BillingMode="PAY_PER_REQUEST",
+            KeySchema=[{"AttributeName": "booking_reference", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "booking_reference", "AttributeType": "S"}])
+        dynamodb.create_table(
+            TableName="SmartTripsDB", BillingMode="PAY_PER_REQUEST",
+            KeySchema=[{"AttributeName": "trip_id", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "trip_id", "AttributeType": "S"},
+                                  {"AttributeName": "destination_code", "AttributeType": "S"}],
+            GlobalSecondaryIndexes=[{"IndexName": "destination-index",
+                                     "KeySchema": [{"AttributeName": "destination_code", "KeyType": "HASH"}],
+                                     "Projection": {"ProjectionType": "ALL"}}])
+
+    def seed(self, flights_per_route=10, seed=2025):
+        """Load the same generated flights and smart trips the populate scripts write."""
+        sys.path.insert(0, REPO_DIR)
+        sys.path.insert(0, os.path.join(REPO_DIR, "Flight_Service"))
+        from populate_flights_db import iter_generated_flights
+        from populate_smart_trips_db import all_smart_trips
+        from travelease_common.dynamo_sync import to_dynamo
+
+        dynamodb = self.resource()
+        flights = list(iter_generated_flights(flights_per_route, seed))
+        for table_name, key, items in (("TravelEase-Flights", "flight_id", flights),
+                                       ("SmartTripsDB", "trip_id", all_smart_trips)):
+            with dynamodb.Table(table_name).batch_writer(overwrite_by_pkeys=[key]) as batch:
+                for item in items:
+                    batch.put_item(Item=to_dynamo(item))
+        return flights
+
+
+# ------------------------
+# SMTP SINK
+# ------------------------
+class _SmtpHandler(socketserver.StreamRequestHandler):
+    """Bas itna SMTP jitna smtplib login + send_message ke liye chahiye."""
+
+    def _reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        self._reply("220 travelease-loadtest ESMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            cmd = line.decode("utf-8", "replace").strip()
+            verb = cmd.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self._reply("250-travelease-loadtest")
+                self._reply("250 AUTH PLAIN LOGIN")
+            elif verb == "HELO":
+                self._reply("250 travelease-loadtest")
+            elif verb == "AUTH":
+                self._reply("235 2.7.0 Authentication successful")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b".\n", b""):
+                    pass
+                if self.server.latency:
+                    time.sleep(self.server.latency)
+                with self.server.lock:
+                    self.server.messages += 1
+                self._reply("250 OK queued")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:  # MAIL, RCPT, RSET, NOOP
+                self._reply("250 OK")
+
+
+class SmtpSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, port=0, latency=0.0):
+        super().__init__(("127.0.0.1", port), _SmtpHandler)
+        self.latency = latency
+        self.messages = 0
+        self.lock = threading.Lock()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+# ------------------------
+# YOUTUBE SEARCH STUB
+# ------------------------
+class _YouTubeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if not self.path.startswith("/youtube/v3/search"):
+            self.send_error(404)
+            return
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        with self.server.lock:
+            self.server.requests += 1
+        items = [{
+            "id": {"videoId": f"loadtest{i}"},
+            "snippet": {"title": f"Load test vlog {i}",
+                        "thumbnails": {"high": {"url": f"https://i.ytimg.com/vi/loadtest{i}/hqdefault.jpg"}}},
+        } for i in range(5)]
+        body = json.dumps({"items": items}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class YouTubeStandIn(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0, latency=0.0):
+        super().__init__(("127.0.0.1", port), _YouTubeHandler)
+        self.latency = latency
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
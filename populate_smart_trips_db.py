@@ -1,5 +1,8 @@
+import argparse
+import sys
 import boto3
 from decimal import Decimal
+from travelease_common.dynamo_sync import sync_table
 
 # --- Configuration ---
 TABLE_NAME = "SmartTripsDB"  # Must match your dynamodb.tf file
@@ -226,5 +229,34 @@ def populate_table():
     except Exception as e:
         print(f"Error during batch write: {e}")
 
+def sync_smart_trips(dry_run=False, prune=False):
+    """Write only new/changed trips; prune=True also deletes trips removed from the lists above."""
+    try:
+        dynamodb = boto3.resource('dynamodb', region_name=REGION_NAME)
+        table = dynamodb.Table(TABLE_NAME)
+        report = sync_table(table, all_smart_trips, key_name="trip_id", dry_run=dry_run, prune=prune,
+                            # Booking service /book par likhta hai; sync use reset na kare
+                            preserve_fields=("booking_count",))
+    except Exception as e:
+        # Non-zero exit: deploy TaskGraph failed sync ko success na maane
+        print(f"Error during sync: {e}")
+        sys.exit(1)
+
+    print(report.summary())
+    if report.writes:
+        print(report.details())
+
+
 if __name__ == "__main__":
-    populate_table()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Populate SmartTripsDB")
+    parser.add_argument("--sync", action="store_true",
+                        help="Diff against the table and write only new/changed trips")
+    parser.add_argument("--prune", action="store_true",
+                        help="With --sync: also delete trips no longer in the lists above")
+    parser.add_argument("--dry-run", action="store_true", help="With --sync: report the diff, write nothing")
+    args = parser.parse_args()
+
+    if args.sync:
+        sync_smart_trips(args.dry_run, args.prune)
+    else:
+        populate_table()
\ No newline at end of file
@@ -120,6 +120,21 @@ resource "aws_lb_listener_rule" "booking_rule" {
     }
   }
 }
+# Destination aggregator (Booking service); alag rule kyunki ek rule mein max 5 path values
+resource "aws_lb_listener_rule" "booking_destination_rule" {
+  listener_arn = aws_lb_listener.http.arn
+  priority     = 11
+
+  action {
+    type             = "forward"
+    target_group_arn = aws_lb_target_group.booking_tg.arn
+  }
+  condition {
+    path_pattern {
+      values = ["/api/destination*"]
+    }
+  }
+}
 resource "aws_lb_listener_rule" "flight_rule" {
   listener_arn = aws_lb_listener.http.arn
   priority     = 20
@@ -35,6 +35,20 @@ resource "aws_ecs_task_definition" "booking_service_task" {
         {
           name  = "EMAIL_PASS",
           value = var.email_pass # From variables.tf
+        },
+        # /api/destination aggregator: Flight + CrowdPulse ALB ke through
+        {
+          name  = "FLIGHT_SERVICE_URL",
+          value = "http://${aws_lb.alb.dns_name}"
+        },
+        {
+          name  = "CROWDPULSE_SERVICE_URL",
+          value = "http://${aws_lb.alb.dns_name}"
+        },
+        # Upstream calls par X-Internal-Key (security.tf)
+        {
+          name  = "INTERNAL_API_KEY",
+          value = random_password.internal_api_key.result
         }
       ]
       # --- END OF UPDATE ---
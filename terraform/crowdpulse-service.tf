@@ -41,6 +41,10 @@ resource "aws_ecs_task_definition" "crowdpulse_service_task" {
         {
           name  = "YOUTUBE_API_KEY",
           value = var.youtube_api_key # From variables.tf
+        },
+        {
+          name  = "INTERNAL_API_KEY",
+          value = random_password.internal_api_key.result # From security.tf
         }
       ]
 
@@ -13,11 +13,23 @@ resource "aws_dynamodb_table" "flights_table" {
     name = "route"
     type = "S"
   }
+  attribute {
+    name = "date"
+    type = "S"
+  }
   global_secondary_index {
     name            = "route-index"
     hash_key        = "route"
     projection_type = "ALL"
   }
+  # Dated schedules (generate_flight_schedule.py): route + date par seedha query.
+  # Sparse hai -- undated items sirf route-index mein.
+  global_secondary_index {
+    name            = "route-date-index"
+    hash_key        = "route"
+    range_key       = "date"
+    projection_type = "ALL"
+  }
   tags = { Name = "${var.project_name}-flights-table" }
 }
 
@@ -46,6 +58,16 @@ resource "aws_dynamodb_table" "smart_trips_db" {
     name = "trip_id"
     type = "S"
   }
+  attribute {
+    name = "destination_code"
+    type = "S"
+  }
+  # Booking service ek destination ke trips isi se query karti hai (poora table scan nahi)
+  global_secondary_index {
+    name            = "destination-index"
+    hash_key        = "destination_code"
+    projection_type = "ALL"
+  }
 }
 
 # 4. IAM Policy (Sahi ki hui)
@@ -62,6 +84,7 @@ resource "aws_iam_policy" "dynamodb_access_policy" {
           "dynamodb:Query",
           "dynamodb:Scan",
           "dynamodb:GetItem",
+          "dynamodb:BatchGetItem",
           "dynamodb:PutItem",
           "dynamodb:UpdateItem",
           "dynamodb:DeleteItem"
@@ -70,7 +93,9 @@ resource "aws_iam_policy" "dynamodb_access_policy" {
           aws_dynamodb_table.flights_table.arn,
           aws_dynamodb_table.bookings_db.arn,     # <-- Sahi naam
           aws_dynamodb_table.smart_trips_db.arn,  # <-- Sahi naam
-          "${aws_dynamodb_table.flights_table.arn}/index/route-index"
+          "${aws_dynamodb_table.flights_table.arn}/index/route-index",
+          "${aws_dynamodb_table.flights_table.arn}/index/route-date-index",
+          "${aws_dynamodb_table.smart_trips_db.arn}/index/destination-index"
         ]
       }
     ]
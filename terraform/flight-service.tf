@@ -20,7 +20,8 @@ resource "aws_ecs_task_definition" "flight_service_task" {
       essential = true
       portMappings = [{ containerPort = 5002, hostPort = 5002 }]
       environment = [
-        { name = "FLIGHTS_TABLE_NAME", value = aws_dynamodb_table.flights_table.name }
+        { name = "FLIGHTS_TABLE_NAME", value = aws_dynamodb_table.flights_table.name },
+        { name = "INTERNAL_API_KEY", value = random_password.internal_api_key.result }
       ]
       logConfiguration = {
         logDriver = "awslogs",
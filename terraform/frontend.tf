@@ -53,12 +53,19 @@ resource "aws_s3_bucket_policy" "allow_public_access" {
 # --- FIXED SECTION ---
 # Upload all necessary frontend files
 
+# index.html ka inline dev config yahin ALB URL ke saath bhara jata hai, taaki
+# terraform wala upload bhi sahi ALB call kare (update_frontend_and_deploy.py
+# baad mein minified / fingerprinted build upload karta hai)
 resource "aws_s3_object" "index_html" {
-  bucket       = aws_s3_bucket.frontend_bucket.id
-  key          = "index.html"
-  source       = "${path.module}/../index.html" # Path from terraform dir to root
-  etag         = filemd5("${path.module}/../index.html")
-  content_type = "text/html"
+  bucket = aws_s3_bucket.frontend_bucket.id
+  key    = "index.html"
+  content = replace(
+    file("${path.module}/../index.html"), # Path from terraform dir to root
+    "<script>window.TRAVELEASE_CONFIG = window.TRAVELEASE_CONFIG || {};</script>",
+    "<script>window.TRAVELEASE_CONFIG = ${jsonencode({ ALB_URL = "http://${aws_lb.alb.dns_name}" })};</script>"
+  )
+  content_type  = "text/html"
+  cache_control = "no-cache"
 }
 
 resource "aws_s3_object" "crowdpulse_widget" {
@@ -5,6 +5,11 @@ terraform {
       source  = "hashicorp/aws"
       version = "~> 6.0"
     }
+    # random_id (frontend bucket suffix), random_password (internal API key)
+    random = {
+      source  = "hashicorp/random"
+      version = "~> 3.6"
+    }
   }
 }
 
@@ -100,4 +100,11 @@ resource "aws_security_group_rule" "ingress_crowdpulse_service" {
   security_group_id        = aws_security_group.ecs_sg.id
   source_security_group_id = aws_security_group.alb_sg.id 
   description              = "Allow ALB to talk to CrowdPulse service on 5010"
-}
\ No newline at end of file
+}
+# Service-to-service key: Booking ka aggregator ALB ke through Flight /
+# CrowdPulse call karta hai (sab ek hi IP se) -- is key wali requests
+# per-client rate limit skip karti hain (travelease_common/admission.py)
+resource "random_password" "internal_api_key" {
+  length  = 32
+  special = false
+}
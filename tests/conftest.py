@@ -0,0 +1,15 @@
+# tests/conftest.py
+# Repo root (travelease_common) + service dirs import path par -- services
+# apne modules flat import karti hain (e.g. `import card_checks`)
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (REPO_DIR, os.path.join(REPO_DIR, "Payment_Service"), os.path.join(REPO_DIR, "Booking_Service"),
+             os.path.join(REPO_DIR, "CrowdPulse", "backend")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "eu-north-1")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
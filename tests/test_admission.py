@@ -0,0 +1,172 @@
+# tests/test_admission.py -- token buckets, per-client limits, internal callers, dependency guards
+import threading
+
+import pytest
+
+from travelease_common import admission
+from travelease_common.admission import (
+    ClientBuckets, DependencyGuard, Overloaded, TokenBucket, admit, check_request, client_key,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(admission.time, "monotonic", fake)
+    return fake
+
+
+@pytest.fixture
+def request_limits(monkeypatch):
+    """Fresh request buckets: global 100 rps, client 1 rps / burst 2, one worker."""
+    monkeypatch.setenv("RATE_LIMIT_RPS", "100")
+    monkeypatch.setenv("RATE_LIMIT_BURST", "100")
+    monkeypatch.setenv("CLIENT_RATE_LIMIT_RPS", "1")
+    monkeypatch.setenv("CLIENT_RATE_LIMIT_BURST", "2")
+    monkeypatch.setenv("TRAVELEASE_WORKERS", "1")
+    monkeypatch.setattr(admission, "_global_bucket", None)
+    monkeypatch.setattr(admission, "_client_buckets", None)
+    monkeypatch.setattr(admission, "INTERNAL_API_KEY", "s3cret")
+
+
+# ------------------------
+# TOKEN BUCKETS
+# ------------------------
+def test_bucket_allows_burst_then_reports_wait(clock):
+    bucket = TokenBucket(rate=2, burst=3)
+    assert [bucket.take() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.take() == pytest.approx(0.5)
+
+
+def test_bucket_refills_with_time_up_to_burst(clock):
+    bucket = TokenBucket(rate=2, burst=3)
+    for _ in range(3):
+        bucket.take()
+    clock.now += 1.0                      # +2 tokens
+    assert bucket.take(2) == 0.0
+    clock.now += 100                      # burst se zyada nahi
+    assert [bucket.take() for _ in range(4)][-1] > 0
+
+
+def test_zero_rate_means_unlimited(clock):
+    bucket = TokenBucket(rate=0, burst=0)
+    assert all(bucket.take() == 0.0 for _ in range(1000))
+
+
+def test_client_buckets_are_independent_and_lru_bounded(clock, monkeypatch):
+    monkeypatch.setattr(admission, "MAX_CLIENTS", 2)
+    buckets = ClientBuckets(rate=1, burst=1)
+    assert buckets.take("a") == 0.0
+    assert buckets.take("a") > 0
+    assert buckets.take("b") == 0.0
+    buckets.take("c")                     # "a" evict ho jaata hai
+    assert buckets.take("a") == 0.0
+
+
+# ------------------------
+# REQUEST ADMISSION
+# ------------------------
+def test_client_key_uses_last_forwarded_hop():
+    assert client_key("1.1.1.1, 10.0.0.5", "10.0.0.9") == "10.0.0.5"
+    assert client_key(None, "10.0.0.9") == "10.0.0.9"
+    assert client_key("", None) == "unknown"
+
+
+def test_per_client_limit_and_exempt_paths(clock, request_limits):
+    check_request("1.2.3.4", "/api/flights")
+    check_request("1.2.3.4", "/api/flights")
+    with pytest.raises(Overloaded) as exc:
+        check_request("1.2.3.4", "/api/flights")
+    assert (exc.value.scope, exc.value.reason) == ("client", "rate")
+    check_request("5.6.7.8", "/api/flights")   # doosra client unaffected
+    for path in ("/ping", "/metrics", "/debug/spans"):
+        check_request("1.2.3.4", path)
+
+
+def test_internal_callers_skip_the_client_bucket(clock, request_limits):
+    assert admission.internal_caller("s3cret")
+    assert not admission.internal_caller("wrong")
+    assert not admission.internal_caller(None)
+    assert not admission.internal_caller("nön-ascii")
+    for _ in range(20):
+        check_request("10.0.0.5", "/api/flights", internal=admission.internal_caller("s3cret"))
+
+
+def test_internal_callers_still_hit_the_global_bucket(clock, request_limits, monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_BURST", "3")
+    with pytest.raises(Overloaded) as exc:
+        for _ in range(10):
+            check_request("10.0.0.5", "/api/flights", internal=True)
+    assert exc.value.scope == "global"
+
+
+def test_no_key_configured_means_nobody_is_internal(monkeypatch):
+    monkeypatch.setattr(admission, "INTERNAL_API_KEY", "")
+    assert not admission.internal_caller("")
+    assert not admission.internal_caller("anything")
+
+
+# ------------------------
+# DEPENDENCY GUARDS
+# ------------------------
+def test_guard_concurrency_rejects_after_bounded_wait():
+    guard = DependencyGuard("test", concurrency=1, rate=0, burst=0, wait=0.01)
+    guard.acquire()
+    with pytest.raises(Overloaded) as exc:
+        guard.acquire()
+    assert exc.value.reason == "concurrency"
+    guard.release()
+    guard.acquire()
+    guard.release()
+
+
+def test_guard_rate_limit(clock):
+    guard = DependencyGuard("test", concurrency=0, rate=1, burst=1, wait=0.01)
+    guard.acquire()
+    with pytest.raises(Overloaded) as exc:
+        guard.acquire()
+    assert exc.value.reason == "rate"
+    assert exc.value.retry_after == pytest.approx(1.0)
+
+
+def test_admit_releases_the_slot_even_on_error(monkeypatch):
+    monkeypatch.setattr(admission, "_guards", {})
+    monkeypatch.setenv("LIMIT_WIDGET_CONCURRENCY", "1")
+    with pytest.raises(ValueError):
+        with admit("widget"):
+            raise ValueError("call failed")
+    with admit("widget"):
+        pass
+
+
+def test_guard_caps_parallel_callers():
+    guard = DependencyGuard("test", concurrency=2, rate=0, burst=0, wait=0.5)
+    inside, peak, lock = [0], [0], threading.Lock()
+    barrier = threading.Event()
+
+    def work():
+        guard.acquire()
+        try:
+            with lock:
+                inside[0] += 1
+                peak[0] = max(peak[0], inside[0])
+            barrier.wait(0.05)
+            with lock:
+                inside[0] -= 1
+        finally:
+            guard.release()
+
+    threads = [threading.Thread(target=work) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak[0] == 2
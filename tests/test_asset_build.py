@@ -0,0 +1,106 @@
+# tests/test_asset_build.py -- built-in JS/CSS minifiers and the frontend build output
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from deploy_tools import asset_build
+from deploy_tools.asset_build import CONFIG_PLACEHOLDER, build_frontend, minify_css, minify_js
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+needs_node = pytest.mark.skipif(shutil.which("node") is None, reason="node not installed")
+
+# Minifier ke tricky cases: strings/regex/template literals mein // aur /* */
+TRICKY_JS = r"""
+// leading comment
+const url = "http://example.com/api";   // trailing comment
+const glob = '/* not a comment */';
+const re = /[/*]+\/\//g;             /* block
+   comment */
+const ratio = 10 / 2 / 5;
+const name = "Goa";
+const tpl = `line one
+   keep   this   spacing // not a comment
+${name.replace(/a/g, "A")} and ${`nested ${ratio} // still template`}`;
+function add(a, b) {
+    return a + b;   // sum
+}
+console.log(url, glob, "a//b*c".replace(re, "-"), ratio, add(1, 2));
+console.log(tpl);
+"""
+
+
+@pytest.fixture(autouse=True)
+def builtin_minifiers(monkeypatch):
+    # rjsmin/rcssmin installed hon tab bhi built-in minifier test ho
+    monkeypatch.setattr(asset_build, "rjsmin", None)
+    monkeypatch.setattr(asset_build, "rcssmin", None)
+
+
+def test_minify_js_strips_comments_but_keeps_literals():
+    out = minify_js(TRICKY_JS)
+    assert "leading comment" not in out and "// sum" not in out and "block" not in out
+    assert '"http://example.com/api"' in out
+    assert "'/* not a comment */'" in out
+    assert r"/[/*]+\/\//g" in out
+    assert "   keep   this   spacing // not a comment" in out
+    assert "// still template`}`" in out
+    assert "\n\n" not in out and not out.startswith(" ")
+
+
+def test_minify_js_keeps_newlines_for_asi():
+    assert minify_js("let a = 1\n   let b = 2   \n\n\nlet c = a + b") == "let a = 1\nlet b = 2\nlet c = a + b"
+
+
+def test_minify_js_treats_division_as_division():
+    assert minify_js("x = a / b / c // half") == "x = a / b / c"
+
+
+@needs_node
+def test_minified_js_behaves_like_the_source(tmp_path):
+    def run(source, name):
+        path = tmp_path / name
+        path.write_text(source)
+        return subprocess.run(["node", str(path)], capture_output=True, text=True, check=True).stdout
+    assert run(minify_js(TRICKY_JS), "min.js") == run(TRICKY_JS, "src.js")
+
+
+def test_minify_css():
+    css = "/* header */\n.card  >  .title {\n  color : red ;\n  margin: 0 auto;\n}\n"
+    assert minify_css(css) == ".card>.title{color:red;margin:0 auto}"
+
+
+@pytest.fixture
+def build(tmp_path):
+    out = str(tmp_path / "build")
+    return out, build_frontend(REPO_DIR, "http://alb.example", out)
+
+
+def test_build_extracts_fingerprinted_assets_and_config(build):
+    out, files = build
+    keys = set(files.values())
+    assert {"index.html", "crowdpulse_widget.html", "images/travelease_logo.png"} <= keys
+    with open(os.path.join(out, "index.html"), encoding="utf-8") as f:
+        html = f.read()
+    assert "<script>" not in html and "<style>" not in html and CONFIG_PLACEHOLDER not in html
+    config = [k for k in keys if k.startswith("assets/config.")]
+    assert len(config) == 1 and f'<script src="{config[0]}"></script>' in html
+    with open(os.path.join(out, *config[0].split("/")), encoding="utf-8") as f:
+        assert f.read() == 'window.TRAVELEASE_CONFIG = {"ALB_URL": "http://alb.example"};\n'
+    for key in keys - {"index.html", "crowdpulse_widget.html", "images/travelease_logo.png"}:
+        assert key.count(".") == 2  # assets/app.<hash>.js
+
+
+def test_build_is_deterministic(build, tmp_path):
+    _, files = build
+    again = build_frontend(REPO_DIR, "http://alb.example", str(tmp_path / "again"))
+    assert sorted(files.values()) == sorted(again.values())
+
+
+@needs_node
+def test_built_scripts_parse(build):
+    out, files = build
+    for path, key in files.items():
+        if key.endswith(".js"):
+            subprocess.run(["node", "--check", path], check=True, capture_output=True)
@@ -0,0 +1,48 @@
+# tests/test_booking_smart_trips.py -- load_smart_trips reads every page of the destination GSI
+import boto3
+import pytest
+from boto3.dynamodb.conditions import Key
+from moto import mock_aws
+
+
+@pytest.fixture
+def booking_app(monkeypatch):
+    monkeypatch.setenv("CACHE_BACKEND", "memory")
+    with mock_aws():
+        dynamodb = boto3.resource("dynamodb", region_name="eu-north-1")
+        table = dynamodb.create_table(
+            TableName="SmartTripsDB", BillingMode="PAY_PER_REQUEST",
+            KeySchema=[{"AttributeName": "trip_id", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "trip_id", "AttributeType": "S"},
+                                  {"AttributeName": "destination_code", "AttributeType": "S"}],
+            GlobalSecondaryIndexes=[{"IndexName": "destination-index",
+                                     "KeySchema": [{"AttributeName": "destination_code", "KeyType": "HASH"}],
+                                     "Projection": {"ProjectionType": "ALL"}}])
+        import Booking_Service_App as app
+
+        # fork_safe objects is mock ke andar dobara bane
+        monkeypatch.setattr(app, "smart_trips_table", dynamodb.Table("SmartTripsDB"))
+        monkeypatch.setattr(app, "trips_by_destination", None)
+        yield app, table
+
+
+def test_load_smart_trips_follows_last_evaluated_key(booking_app):
+    app, table = booking_app
+    description = "x" * 4000  # ~4 KB per item -> GOI ke 600 items 1 MB page se bade
+    with table.batch_writer() as batch:
+        for i in range(600):
+            batch.put_item(Item={"trip_id": f"GOI-{i}", "destination_code": "GOI", "price": 1000 + i,
+                                 "suggestion_type": "Hotel", "description": description})
+        for i in range(5):
+            batch.put_item(Item={"trip_id": f"DXB-{i}", "destination_code": "DXB", "price": 500,
+                                 "suggestion_type": "Tour"})
+
+    first_page = table.query(IndexName="destination-index",
+                             KeyConditionExpression=Key("destination_code").eq("GOI"))
+    assert "LastEvaluatedKey" in first_page  # test sach mein multi-page hai
+
+    goa = app.load_smart_trips("GOI")
+    assert len(goa) == 600
+    assert {t["destination_code"] for t in goa} == {"GOI"}
+    assert sorted(t["price"] for t in goa)[-1] == 1599
+    assert len(app.load_smart_trips("DXB")) == 5
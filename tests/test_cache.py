@@ -0,0 +1,78 @@
+# tests/test_cache.py -- RedisCache against the local RESP stand-in
+import time
+from decimal import Decimal
+
+import pytest
+
+from travelease_common.cache import RedisCache
+from travelease_common.resp_server import start_resp_server
+
+
+@pytest.fixture
+def resp_server():
+    server = start_resp_server(port=0)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cache(resp_server):
+    port = resp_server.server_address[1]
+    return RedisCache("test", f"redis://127.0.0.1:{port}/0", timeout=1.0)
+
+
+def test_set_get_round_trip(cache):
+    cache.set("route", {"flights": [{"id": "AI-202", "price": 4500}]}, ttl=60)
+    assert cache.get("route") == {"flights": [{"id": "AI-202", "price": 4500}]}
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_missing_key_is_a_miss(cache):
+    assert cache.get("nope") is None
+    assert cache.misses == 1
+
+
+def test_ttl_expiry(cache):
+    cache.set("short", "value", ttl=0.05)
+    assert cache.get("short") == "value"
+    time.sleep(0.1)
+    assert cache.get("short") is None
+
+
+def test_delete(cache):
+    cache.set("gone", 1, ttl=60)
+    cache.delete("gone")
+    assert cache.get("gone") is None
+
+
+def test_decimal_round_trip(cache):
+    # DynamoDB numbers Decimal aate hain: integral -> int, baaki -> float
+    cache.set("prices", {"whole": Decimal("2500"), "fraction": Decimal("12.5")}, ttl=60)
+    value = cache.get("prices")
+    assert value == {"whole": 2500, "fraction": 12.5}
+    assert isinstance(value["whole"], int)
+
+
+@pytest.mark.parametrize("empty", [[], {}, "", 0, False])
+def test_empty_values_are_hits(cache, empty):
+    # "No flights found" ([]) bhi cache hota hai -- miss nahi ginna chahiye
+    cache.set("empty", empty, ttl=60)
+    assert cache.get("empty") == empty
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_namespaces_do_not_collide(resp_server):
+    url = f"redis://127.0.0.1:{resp_server.server_address[1]}/0"
+    flights, pulses = RedisCache("flights", url), RedisCache("crowdpulse", url)
+    flights.set("GOI", "flight", ttl=60)
+    assert pulses.get("GOI") is None
+
+
+def test_server_down_is_a_miss_not_an_error(resp_server):
+    port = resp_server.server_address[1]
+    resp_server.shutdown()
+    resp_server.server_close()
+    cache = RedisCache("test", f"redis://127.0.0.1:{port}/0", timeout=0.2)
+    cache.set("key", "value", ttl=60)
+    assert cache.get("key") is None
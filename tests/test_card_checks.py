@@ -0,0 +1,73 @@
+# tests/test_card_checks.py -- Luhn (scalar + vectorized) and batch card checks
+import pytest
+
+import card_checks
+from card_checks import VECTOR_MIN, check_cards, load_bin_index, luhn_ok, luhn_valid
+
+VALID = ["4111111111111111", "5500000000000004", "378282246310005", "6011111111111117",
+         "4222222222222", "3530111333300000"]
+
+
+@pytest.mark.parametrize("number", VALID)
+def test_luhn_ok_valid(number):
+    assert luhn_ok(number)
+
+
+@pytest.mark.parametrize("number", ["4111111111111112", "5500000000000005", "378282246310006"])
+def test_luhn_ok_invalid(number):
+    assert not luhn_ok(number)
+
+
+def test_vectorized_luhn_matches_scalar():
+    pytest.importorskip("numpy")
+    # Mixed lengths (12-19) + har valid number ka ek digit badla hua version
+    numbers = []
+    for number in VALID * 20:
+        numbers.append(number)
+        numbers.append(number[:-1] + str((int(number[-1]) + 1) % 10))
+    numbers += ["000000000000", "1234567890123452", "4000000000000000006"]
+    assert len(numbers) >= VECTOR_MIN
+    assert luhn_valid(numbers) == [luhn_ok(n) for n in numbers]
+
+
+def test_scalar_path_without_numpy(monkeypatch):
+    monkeypatch.setattr(card_checks, "np", None)
+    numbers = ["4111111111111111", "4111111111111112"] * VECTOR_MIN
+    assert luhn_valid(numbers) == [True, False] * VECTOR_MIN
+
+
+def test_check_cards_results():
+    results = check_cards([
+        "4111 1111 1111 1111",   # ok, spaces allowed
+        "4111 1111 1111 111a",   # alphabets
+        "4111",                  # too short
+        "3782822463100051",      # amex with 16 digits
+        "4111111111111112",      # checksum
+        None,
+    ])
+    assert [r["ok"] for r in results] == [True, False, False, False, False, False]
+    assert results[0]["number"] == "4111111111111111"
+    assert results[0]["brand"] == "visa"
+    assert results[0]["error"] is None
+    assert "Alphabets" in results[1]["error"]
+    assert "12-19 digits" in results[2]["error"]
+    assert results[3]["error"] == "Invalid amex card number length."
+    assert "Checksum" in results[4]["error"]
+    assert "12-19 digits" in results[5]["error"]
+
+
+def test_bin_longest_prefix_wins():
+    trie = load_bin_index()
+    assert trie.lookup("6011111111111117")["brand"] == "discover"   # "6011"
+    assert trie.lookup("6012111111111111")["brand"] == "rupay"      # "60"
+    assert trie.lookup("2221000000000009")["brand"] == "mastercard"
+    assert trie.lookup("9999999999999999") is None
+
+
+def test_issuer_table_overrides_brand_prefix(tmp_path):
+    path = tmp_path / "bins.csv"
+    path.write_text("prefix,brand,issuer\n411111,,Test Bank\nbad,,Ignored\n")
+    trie = load_bin_index(str(path))
+    info = trie.lookup("4111111111111111")
+    assert (info["brand"], info["issuer"], info["lengths"]) == ("visa", "Test Bank", (13, 16, 19))
+    assert trie.lookup("4222222222222")["issuer"] is None
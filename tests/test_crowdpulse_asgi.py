@@ -0,0 +1,94 @@
+# tests/test_crowdpulse_asgi.py -- async YouTube lookups: slot wait inside the timeout, posts off-loop
+import asyncio
+import threading
+import time
+
+import pytest
+
+import crowdpulse_asgi
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class FakeHttp:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+
+    async def get(self, url, params=None):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return FakeResponse({"items": [{"id": {"videoId": "abc"}, "snippet": {
+            "title": f"{params['q']}", "thumbnails": {"high": {"url": "https://i.ytimg.com/abc.jpg"}}}}]})
+
+
+@pytest.fixture
+def live_youtube(monkeypatch):
+    def _setup(http, slots=2, timeout=0.2):
+        monkeypatch.setattr(crowdpulse_asgi, "YOUTUBE_API_KEY", "key")
+        monkeypatch.setattr(crowdpulse_asgi, "YOUTUBE_TIMEOUT", timeout)
+        monkeypatch.setattr(crowdpulse_asgi, "_http", http)
+        monkeypatch.setattr(crowdpulse_asgi, "_youtube_slots", asyncio.Semaphore(slots))
+        return http
+    return _setup
+
+
+def test_live_lookup_returns_videos(live_youtube):
+    live_youtube(FakeHttp())
+    videos = asyncio.run(crowdpulse_asgi.get_youtube_videos_async("Paris"))
+    assert videos[0]["url"] == "https://www.youtube.com/watch?v=abc"
+
+
+def test_waiting_for_a_slot_is_bounded_by_the_timeout(live_youtube):
+    http = live_youtube(FakeHttp(), slots=1, timeout=0.1)
+
+    async def scenario():
+        await crowdpulse_asgi._youtube_slots.acquire()  # saare slots busy
+        started = time.perf_counter()
+        videos = await crowdpulse_asgi.get_youtube_videos_async("Paris")
+        return videos, time.perf_counter() - started
+
+    videos, elapsed = asyncio.run(scenario())
+    assert elapsed < 1.0
+    assert http.calls == 0
+    assert videos[0]["title"] == "Explore Paris | Travel Highlights"
+
+
+def test_slow_call_falls_back_and_frees_its_slot(live_youtube):
+    live_youtube(FakeHttp(delay=1.0), slots=1, timeout=0.05)
+
+    async def scenario():
+        videos = await crowdpulse_asgi.get_youtube_videos_async("Paris")
+        return videos, crowdpulse_asgi._youtube_slots.locked()
+
+    videos, locked = asyncio.run(scenario())
+    assert videos[0]["url"] == "https://www.youtube.com"
+    assert not locked
+
+
+def test_social_posts_are_scored_off_the_event_loop(live_youtube, monkeypatch):
+    live_youtube(FakeHttp())
+    threads = []
+
+    def fake_posts(city_name):
+        threads.append(threading.get_ident())
+        return [{"text": city_name, "source": "Twitter", "sentiment": "positive"}]
+
+    monkeypatch.setattr(crowdpulse_asgi, "get_social_posts", fake_posts)
+    monkeypatch.setattr(crowdpulse_asgi, "_build_pulse", lambda code, posts, videos: (code, posts, videos))
+
+    async def scenario():
+        return threading.get_ident(), await crowdpulse_asgi._fetch_pulse("CDG")
+
+    loop_thread, (code, posts, videos) = asyncio.run(scenario())
+    assert code == "CDG" and posts[0]["text"] == "Paris" and videos
+    assert threads and threads[0] != loop_thread
@@ -0,0 +1,116 @@
+# tests/test_dynamo_sync.py -- sync_table against an in-process moto table
+from decimal import Decimal
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from travelease_common.dynamo_sync import content_hash, sync_table
+
+
+@pytest.fixture
+def table():
+    with mock_aws():
+        dynamodb = boto3.resource("dynamodb", region_name="eu-north-1")
+        yield dynamodb.create_table(
+            TableName="SmartTripsDB", BillingMode="PAY_PER_REQUEST",
+            KeySchema=[{"AttributeName": "trip_id", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "trip_id", "AttributeType": "S"}])
+
+
+def trips(*prices):
+    return [{"trip_id": f"T{i}", "destination": "GOI", "price": price} for i, price in enumerate(prices)]
+
+
+def items_by_key(table):
+    return {item["trip_id"]: item for item in table.scan()["Items"]}
+
+
+def test_content_hash_ignores_number_type_and_key_order():
+    assert content_hash({"a": 2500, "b": "x"}) == content_hash({"b": "x", "a": Decimal("2500")})
+    assert content_hash({"a": 2500.0}) == content_hash({"a": 2500})
+    assert content_hash({"a": 1, "n": 5}, exclude=("n",)) == content_hash({"a": 1})
+
+
+def test_first_sync_adds_everything(table):
+    report = sync_table(table, trips(100, 200), "trip_id")
+    assert sorted(report.added) == ["T0", "T1"]
+    assert report.writes == 2
+    assert items_by_key(table)["T1"]["price"] == Decimal("200")
+
+
+def test_unchanged_catalog_writes_nothing(table):
+    sync_table(table, trips(100, 200), "trip_id")
+    report = sync_table(table, trips(100, 200), "trip_id")
+    assert report.writes == 0
+    assert report.unchanged == 2
+
+
+def test_changed_item_is_rewritten(table):
+    sync_table(table, trips(100, 200), "trip_id")
+    report = sync_table(table, trips(100, 250), "trip_id")
+    assert report.changed == ["T1"]
+    assert report.added == []
+    assert items_by_key(table)["T1"]["price"] == Decimal("250")
+
+
+def test_extra_items_survive_without_prune(table):
+    table.put_item(Item={"trip_id": "legacy", "price": 1})
+    report = sync_table(table, trips(100), "trip_id")
+    assert report.deleted == []
+    assert "legacy" in items_by_key(table)
+
+
+def test_prune_deletes_items_not_in_desired_set(table):
+    table.put_item(Item={"trip_id": "legacy", "price": 1})
+    report = sync_table(table, trips(100), "trip_id", prune=True)
+    assert report.deleted == ["legacy"]
+    assert set(items_by_key(table)) == {"T0"}
+
+
+def test_dry_run_reports_without_writing(table):
+    table.put_item(Item={"trip_id": "legacy", "price": 1})
+    report = sync_table(table, trips(100), "trip_id", dry_run=True, prune=True)
+    assert (report.added, report.deleted) == (["T0"], ["legacy"])
+    assert set(items_by_key(table)) == {"legacy"}
+
+
+def test_preserve_fields_are_not_a_change_and_survive_rewrites(table):
+    sync_table(table, trips(100, 200), "trip_id")
+    table.update_item(Key={"trip_id": "T0"}, UpdateExpression="ADD booking_count :one",
+                      ExpressionAttributeValues={":one": 3})
+    table.update_item(Key={"trip_id": "T1"}, UpdateExpression="ADD booking_count :one",
+                      ExpressionAttributeValues={":one": 5})
+
+    report = sync_table(table, trips(100, 250), "trip_id", preserve_fields=("booking_count",))
+    assert report.changed == ["T1"]
+    assert report.unchanged == 1
+    items = items_by_key(table)
+    assert items["T0"]["booking_count"] == 3
+    assert items["T1"]["booking_count"] == 5
+    assert items["T1"]["price"] == Decimal("250")
+
+
+def test_duplicate_keys_are_rejected(table):
+    with pytest.raises(ValueError):
+        sync_table(table, trips(100) + trips(200), "trip_id")
+
+
+def test_sync_smart_trips_exits_non_zero_on_error():
+    import populate_smart_trips_db
+
+    with mock_aws():  # SmartTripsDB table hi nahi hai -> sync fail
+        with pytest.raises(SystemExit) as exc:
+            populate_smart_trips_db.sync_smart_trips()
+    assert exc.value.code == 1
+
+
+def test_sync_smart_trips_keeps_booking_counts(table):
+    import populate_smart_trips_db
+
+    populate_smart_trips_db.sync_smart_trips()
+    trip_id = populate_smart_trips_db.all_smart_trips[0]["trip_id"]
+    table.update_item(Key={"trip_id": trip_id}, UpdateExpression="ADD booking_count :n",
+                      ExpressionAttributeValues={":n": 7})
+    populate_smart_trips_db.sync_smart_trips(prune=True)
+    assert items_by_key(table)[trip_id]["booking_count"] == 7
@@ -0,0 +1,75 @@
+# tests/test_http_cache.py -- ETag comparison and Accept-Encoding negotiation
+import pytest
+
+from travelease_common import http_cache
+from travelease_common.http_cache import COMPRESS_MIN_BYTES, choose_encoding, etag_matches
+
+ETAG = 'W/"abc123"'
+BIG = COMPRESS_MIN_BYTES
+
+
+@pytest.mark.parametrize("if_none_match, expected", [
+    ('W/"abc123"', True),
+    ('"abc123"', True),                      # weak comparison: W/ ignore
+    ('"other", W/"abc123"', True),
+    ('"other"', False),
+    ("*", True),
+    ("", False),
+    (None, False),
+])
+def test_etag_matches(if_none_match, expected):
+    assert etag_matches(if_none_match, ETAG) is expected
+
+
+def test_etag_matches_strong_etag():
+    assert etag_matches('W/"xyz"', '"xyz"')
+
+
+def test_small_bodies_are_not_compressed():
+    assert choose_encoding("br, gzip", BIG - 1) is None
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip", "gzip"),
+    ("gzip, deflate", "gzip"),
+    ("identity", None),
+    ("", None),
+    (None, None),
+    ("br;q=0, gzip;q=0", None),
+    ("*", "br"),
+    ("*, br;q=0", "gzip"),
+    ("gzip, br", "br"),
+])
+def test_choose_encoding(accept_encoding, expected):
+    if expected == "br":
+        pytest.importorskip("brotli")
+    assert choose_encoding(accept_encoding, BIG) == expected
+
+
+def test_choose_encoding_without_brotli(monkeypatch):
+    monkeypatch.setattr(http_cache, "brotli", None)
+    assert choose_encoding("br, gzip", BIG) == "gzip"
+    assert choose_encoding("br", BIG) is None
+
+
+def test_conditional_304_and_compressed_200():
+    import gzip
+
+    entry = http_cache.ResponseCache("test").put("k", {"flights": [{"id": i} for i in range(200)]}, 60)
+    status, body, headers = http_cache.conditional(entry, None, "gzip", "no-cache")
+    assert status == 200
+    assert headers["Content-Encoding"] == "gzip"
+    assert headers["Vary"] == "Accept, Accept-Encoding"
+    assert gzip.decompress(body) == entry.body
+
+    status, body, headers = http_cache.conditional(entry, headers["ETag"], "gzip", "no-cache")
+    assert (status, body) == (304, b"")
+
+
+def test_response_cache_expiry_and_stale_reads(monkeypatch):
+    cache = http_cache.ResponseCache("test")
+    cache.put("k", {"a": 1}, ttl=10)
+    now = http_cache.time.time()
+    monkeypatch.setattr(http_cache.time, "time", lambda: now + 3600)
+    assert cache.get("k") is None
+    assert cache.get("k", allow_stale=True) is not None
@@ -0,0 +1,100 @@
+# tests/test_mock_feeder.py -- append-only post log: rotation, read order, formats, torn tails
+import os
+
+import pytest
+
+from mock_feeder import (RECORD_HEADER, PostLog, encode_post, generate_mock_posts, parse_bias,
+                         read_posts)
+
+
+def post(i, mood="positive"):
+    return {"text": f"post {i} ✓", "sentiment": mood, "ts": 1000.0 + i}
+
+
+def segments(log):
+    return sorted(f for f in os.listdir(log.dir) if f.startswith("segment-"))
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "binary"])
+def test_append_rotates_into_sealed_segments_and_reads_in_order(tmp_path, fmt):
+    record = len(encode_post(post(0), fmt))
+    log = PostLog("New York", fmt, str(tmp_path), segment_max_bytes=record * 3)
+    for i in range(10):
+        log.append([post(i)])
+    log.flush()
+
+    ext = "ndjson" if fmt == "ndjson" else "bin"
+    assert log.dir == os.path.join(str(tmp_path), "newyork")
+    assert segments(log) == [f"segment-00000{n}.{ext}" for n in (1, 2, 3)]
+    for name in segments(log):
+        # Sealed segment kabhi limit se bada nahi hota
+        assert os.path.getsize(os.path.join(log.dir, name)) == record * 3
+    assert [p["text"] for p in read_posts("New York", fmt, str(tmp_path))] == [f"post {i} ✓" for i in range(10)]
+    log.close()
+
+
+def test_rotate_is_a_noop_on_an_empty_segment(tmp_path):
+    log = PostLog("Goa", "ndjson", str(tmp_path))
+    assert log.rotate() is None
+    log.append([post(1)])
+    sealed = log.rotate()
+    assert sealed.endswith("segment-000001.ndjson") and os.path.exists(sealed)
+    assert log.rotate() is None
+    assert os.path.getsize(log.active_path) == 0
+    log.close()
+
+
+def test_reopening_continues_the_active_segment(tmp_path):
+    record = len(encode_post(post(0), "ndjson"))
+    log = PostLog("Goa", "ndjson", str(tmp_path), segment_max_bytes=record * 2)
+    log.append([post(0)])
+    log.close()
+    # Naya process: active file ka size yaad rehta hai, numbering aage badhti hai
+    log = PostLog("Goa", "ndjson", str(tmp_path), segment_max_bytes=record * 2)
+    log.append([post(1)])
+    log.append([post(2)])
+    log.close()
+    assert segments(log) == ["segment-000001.ndjson"]
+    assert [p["ts"] for p in read_posts("Goa", "ndjson", str(tmp_path))] == [1000.0, 1001.0, 1002.0]
+
+
+def test_formats_live_side_by_side(tmp_path):
+    for fmt in ("ndjson", "binary"):
+        log = PostLog("Goa", fmt, str(tmp_path))
+        log.append([post(0, "negative" if fmt == "binary" else "neutral")])
+        log.close()
+    assert [p["sentiment"] for p in read_posts("Goa", "ndjson", str(tmp_path))] == ["neutral"]
+    assert [p["sentiment"] for p in read_posts("Goa", "binary", str(tmp_path))] == ["negative"]
+
+
+def test_binary_reader_ignores_a_torn_tail(tmp_path):
+    log = PostLog("Goa", "binary", str(tmp_path))
+    log.append([post(0), post(1)])
+    torn = encode_post(post(2), "binary")
+    log.append_bytes(torn[:RECORD_HEADER.size + 3])
+    log.close()
+    assert [p["ts"] for p in read_posts("Goa", "binary", str(tmp_path))] == [1000.0, 1001.0]
+
+
+def test_read_posts_for_unknown_city_and_bad_format(tmp_path):
+    assert list(read_posts("Atlantis", "ndjson", str(tmp_path))) == []
+    with pytest.raises(ValueError):
+        PostLog("Goa", "xml", str(tmp_path))
+
+
+def test_generate_mock_posts_appends_one_cycle(tmp_path):
+    log = PostLog("Goa", "binary", str(tmp_path))
+    count = generate_mock_posts("Goa", log, "binary")
+    log.close()
+    posts = list(read_posts("Goa", "binary", str(tmp_path)))
+    assert 40 <= count <= 100 and len(posts) == count
+    assert {p["sentiment"] for p in posts} <= {"positive", "negative", "neutral"}
+
+
+def test_parse_bias():
+    assert parse_bias("neutral") == (0.3, 0.2, 0.5)
+    assert parse_bias("positive=0.7,negative=0.1,neutral=0.2") == (0.7, 0.1, 0.2)
+    with pytest.raises(ValueError):
+        parse_bias("happy=1")
+    with pytest.raises(ValueError):
+        parse_bias("positive=0")
@@ -0,0 +1,74 @@
+# tests/test_payment_api.py -- /api/payment and /api/payment/batch apply the same rules
+import pytest
+
+import Payment_Service_App as payment_app
+from payment_ledger import PaymentLedger
+
+BASE = {"flight_id": "AI-202_2026-11-01", "flight_details": "DEL-BOM", "seat_number": "3A", "email": "a@b.com"}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(payment_app, "payment_ledger", PaymentLedger())
+    return payment_app.app.test_client()
+
+
+def pay(client, card, amount=2500, **headers):
+    return client.post("/api/payment", json=dict(BASE, card_number=card, amount=amount), headers=headers)
+
+
+def pay_batch(client, *payments):
+    response = client.post("/api/payment/batch", json={"payments": [dict(BASE, **p) for p in payments]})
+    assert response.status_code == 200
+    return response.get_json()["results"]
+
+
+@pytest.mark.parametrize("card, ok", [
+    ("4111 1111 1111 1111", True),
+    ("4111 1111 1111 1112", False),   # Luhn fail (pehle single path approve kar deta tha)
+    ("378282246310005", True),        # Amex 15 digits
+    ("3782822463100051", False),      # Amex, galat length
+    ("4111 1111 1111 111a", False),
+])
+def test_single_and_batch_agree(client, card, ok):
+    single = pay(client, card)
+    batch = pay_batch(client, {"card_number": card, "amount": 2500})[0]
+    assert (single.status_code == 200) is ok
+    assert (batch["status"] == "approved") is ok
+    if not ok:
+        assert single.get_json()["message"] == batch["message"]
+
+
+def test_amount_paid_is_a_number_in_both_endpoints(client):
+    assert pay(client, "4111111111111111", 2500).get_json()["amount_paid"] == 2500
+    assert pay(client, "4111111111111111", "12.5").get_json()["amount_paid"] == 12.5
+    results = pay_batch(client, {"card_number": "4111111111111111", "amount": 2500},
+                        {"card_number": "4111111111111111", "amount": "12.5"})
+    assert [r["amount_paid"] for r in results] == [2500, 12.5]
+
+
+@pytest.mark.parametrize("amount", ["1e400", "NaN", "abc", -5, 0, 10_000_000])
+def test_invalid_or_huge_amounts_are_rejected(client, amount):
+    assert pay(client, "4111111111111111", amount).status_code == 400
+    assert pay_batch(client, {"card_number": "4111111111111111", "amount": amount})[0]["status"] == "declined"
+
+
+def test_idempotency_key_replays_the_transaction(client):
+    first = pay(client, "4111111111111111", **{"Idempotency-Key": "k1"}).get_json()
+    again = pay(client, "4111111111111111", **{"Idempotency-Key": "k1"}).get_json()
+    assert first["transaction_id"] == again["transaction_id"]
+    assert pay(client, "5500000000000004", **{"Idempotency-Key": "k1"}).status_code == 409
+
+
+def test_internal_errors_do_not_leak_exception_text(client, monkeypatch):
+    def boom(*args, **kwargs):
+        raise RuntimeError("secret internals")
+
+    monkeypatch.setattr(payment_app.payment_ledger, "record", boom)
+    monkeypatch.setattr(payment_app.payment_ledger, "record_many", boom)
+    single = pay(client, "4111111111111111")
+    batch = client.post("/api/payment/batch", json={"payments": [dict(BASE, card_number="4111111111111111",
+                                                                      amount=1)]})
+    for response in (single, batch):
+        assert response.status_code == 500
+        assert "secret" not in response.get_data(as_text=True)
@@ -0,0 +1,90 @@
+# tests/test_s3_deploy.py -- upload bodies/headers and the manifest + remote listing diff (moto S3)
+import gzip
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from deploy_tools.s3_deploy import (CACHE_HTML, CACHE_IMMUTABLE, S3Deployer, build_uploads,
+                                    load_manifest)
+
+BUCKET = "travelease-frontend-test"
+
+
+@pytest.fixture
+def site(tmp_path):
+    files = {
+        "index.html": "<html>" + "hello " * 400 + "</html>",
+        "app.3f9a1c2b7d.js": "console.log('x');" * 100,
+        "logo.png": "not really a png",
+    }
+    mapping = {}
+    for name, body in files.items():
+        path = tmp_path / name
+        path.write_text(body)
+        mapping[str(path)] = name
+    return mapping
+
+
+@pytest.fixture
+def s3(tmp_path):
+    with mock_aws():
+        client = boto3.client("s3", region_name="eu-north-1")
+        client.create_bucket(Bucket=BUCKET, CreateBucketConfiguration={"LocationConstraint": "eu-north-1"})
+        yield client
+
+
+def deployer(tmp_path, **kwargs):
+    return S3Deployer(BUCKET, manifest_path=str(tmp_path / "manifest.json"), workers=2,
+                      region="eu-north-1", **kwargs)
+
+
+def test_build_uploads_compresses_text_and_sets_cache_headers(site):
+    uploads = {u.key: u for u in build_uploads(site)}
+    html, js, png = uploads["index.html"], uploads["app.3f9a1c2b7d.js"], uploads["logo.png"]
+    assert html.content_encoding == "gzip" and html.cache_control == CACHE_HTML
+    assert gzip.decompress(html.body).startswith(b"<html>")
+    assert js.cache_control == CACHE_IMMUTABLE and js.content_type == "application/javascript"
+    assert png.content_encoding is None  # chhota + binary -> as is
+    # Deterministic gzip (mtime=0) -> same md5 har build mein
+    assert build_uploads(site)[0].md5 == html.md5
+
+
+def test_second_deploy_skips_unchanged_files(s3, site, tmp_path):
+    first = deployer(tmp_path).deploy(site)
+    assert sorted(first["uploaded"]) == sorted(site.values())
+    assert s3.head_object(Bucket=BUCKET, Key="index.html")["ContentEncoding"] == "gzip"
+    assert set(load_manifest(str(tmp_path / "manifest.json"))[BUCKET]) == set(site.values())
+
+    second = deployer(tmp_path).deploy(site)
+    assert second["uploaded"] == [] and second["bytes"] == 0
+
+
+def test_objects_deleted_out_of_band_are_reuploaded(s3, site, tmp_path):
+    deployer(tmp_path).deploy(site)
+    s3.delete_object(Bucket=BUCKET, Key="logo.png")
+    result = deployer(tmp_path).deploy(site)
+    assert result["uploaded"] == ["logo.png"]
+    assert s3.get_object(Bucket=BUCKET, Key="logo.png")["Body"].read() == b"not really a png"
+
+
+def test_objects_changed_out_of_band_are_reuploaded(s3, site, tmp_path):
+    deployer(tmp_path).deploy(site)
+    s3.put_object(Bucket=BUCKET, Key="app.3f9a1c2b7d.js", Body=b"tampered")
+    assert deployer(tmp_path).deploy(site)["uploaded"] == ["app.3f9a1c2b7d.js"]
+
+
+def test_check_remote_adopts_matching_objects_without_a_manifest(s3, site, tmp_path):
+    deployer(tmp_path).deploy(site)
+    (tmp_path / "manifest.json").unlink()
+    # Manifest ke bina headers unknown -> check_remote (HEAD) ke bina sab upload
+    assert sorted(deployer(tmp_path).deploy(site)["uploaded"]) == sorted(site.values())
+    (tmp_path / "manifest.json").unlink()
+    result = deployer(tmp_path, check_remote=True).deploy(site)
+    assert result["uploaded"] == []
+    assert set(load_manifest(str(tmp_path / "manifest.json"))[BUCKET]) == set(site.values())
+
+
+def test_force_uploads_everything(s3, site, tmp_path):
+    deployer(tmp_path).deploy(site)
+    assert sorted(deployer(tmp_path, force=True).deploy(site)["uploaded"]) == sorted(site.values())
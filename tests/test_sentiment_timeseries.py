@@ -0,0 +1,151 @@
+# tests/test_sentiment_timeseries.py -- ring buffer tiers, trends, post-log ingestion
+import pytest
+
+import crowdpulse_app
+from mock_feeder import PostLog, PostLogTailer
+from sentiment_timeseries import CitySentimentSeries, RingSeries, SentimentStore
+
+T0 = 1_700_000_000  # fixed "now" (minute boundary se alag)
+
+
+def test_ring_series_buckets_by_resolution():
+    ring = RingSeries(60, 10)
+    ring.add(T0, positive=2)
+    ring.add(T0 + 5, negative=1)
+    ring.add(T0 + 60, neutral=3)
+    start = T0 // 60 * 60
+    assert ring.points(T0, T0 + 60) == [(start, 2, 1, 0), (start + 60, 0, 0, 3)]
+
+
+def test_ring_series_overwrites_stale_slots():
+    ring = RingSeries(60, 10)
+    ring.add(T0, positive=5)
+    # Same slot, ek poora cycle baad -> purane counts reset
+    ring.add(T0 + 600, positive=1)
+    points = ring.points(T0, T0 + 600)
+    assert len(points) == 10  # span se zyada range clamp hoti hai
+    assert points[-1][1:] == (1, 0, 0)
+    assert sum(p[1] for p in points) == 1
+
+
+def test_ring_series_memory_is_fixed():
+    ring = RingSeries(60, 100)
+    before = (len(ring.bucket_ids), len(ring.counts))
+    for i in range(10_000):
+        ring.add(T0 + i * 7, positive=1)
+    assert (len(ring.bucket_ids), len(ring.counts)) == before == (100, 300)
+
+
+def test_city_series_rolls_up_into_every_tier():
+    series = CitySentimentSeries()
+    series.record(T0, positive=1, negative=2)
+    series.record(T0 + 120, positive=3)
+    for name, ring in series.tiers.items():
+        totals = [sum(p[k] for p in ring.points(T0, T0 + 120)) for k in (1, 2, 3)]
+        assert totals == [4, 2, 0], name
+
+
+@pytest.mark.parametrize("seconds, tier", [(3600, "minute"), (24 * 3600, "minute"),
+                                           (7 * 86400, "hour"), (365 * 86400, "day"),
+                                           (10 * 365 * 86400, "day")])
+def test_tier_for_picks_finest_covering_tier(seconds, tier):
+    assert CitySentimentSeries().tier_for(seconds) == tier
+
+
+def test_store_trend_payload():
+    store = SentimentStore()
+    assert store.record_posts("GOI", [{"sentiment": "positive"}, {"sentiment": "neutral"},
+                                      {"sentiment": "bogus"}, {}], T0) == [1, 0, 1]
+    trend = store.trend("GOI", "1h", now=T0)
+    assert trend["resolution"] == "minute"
+    assert len(trend["points"]) == 61  # T0 minute boundary par nahi -> dono taraf partial bucket
+    assert trend["totals"] == {"positive": 1, "negative": 0, "neutral": 1}
+    assert trend["points"][-1]["timestamp"].endswith("Z")
+    # Doosri city alag hai
+    assert store.trend("DEL", "1h", now=T0)["totals"]["positive"] == 0
+    with pytest.raises(ValueError):
+        store.trend("GOI", "2h")
+
+
+# ------------------------
+# INGESTION (feeder post log -> history)
+# ------------------------
+
+def posts(*moods, ts=T0):
+    return [{"text": f"post {i}", "sentiment": m, "ts": ts} for i, m in enumerate(moods)]
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "binary"])
+def test_tailer_returns_only_new_posts_across_rotation(tmp_path, fmt):
+    log = PostLog("Goa", fmt, str(tmp_path), segment_max_bytes=1 << 20)
+    log.append(posts("positive"))
+    log.flush()
+    tailer = PostLogTailer("Goa", fmt, str(tmp_path))  # existing posts skip
+    assert tailer.poll() == []
+
+    log.append(posts("negative", "neutral"))
+    log.flush()
+    assert [p["sentiment"] for p in tailer.poll()] == ["negative", "neutral"]
+
+    # Active file beech mein seal ho jaye: bacha hua hissa sealed segment se aata hai
+    log.append(posts("positive"))
+    log.rotate()
+    log.append(posts("negative"))
+    log.flush()
+    assert [p["sentiment"] for p in tailer.poll()] == ["positive", "negative"]
+    assert tailer.poll() == []
+    log.close()
+
+
+def test_tailer_waits_for_torn_tail(tmp_path):
+    log = PostLog("Goa", "ndjson", str(tmp_path))
+    tailer = PostLogTailer("Goa", "ndjson", str(tmp_path))
+    line = b'{"text":"ok","sentiment":"positive","ts":1.0}\n'
+    log.append_bytes(line[:10])
+    log.flush()
+    assert tailer.poll() == []
+    log.append_bytes(line[10:])
+    log.flush()
+    assert [p["text"] for p in tailer.poll()] == ["ok"]
+    log.close()
+
+
+def test_tailer_from_start_and_missing_log(tmp_path):
+    assert PostLogTailer("Nowhere", "ndjson", str(tmp_path)).poll() == []
+    log = PostLog("Goa", "binary", str(tmp_path))
+    log.append(posts("positive", "positive"))
+    log.rotate()
+    log.close()
+    assert len(PostLogTailer("Goa", "binary", str(tmp_path), from_start=True).poll()) == 2
+
+
+def test_ingest_records_every_logged_post(tmp_path):
+    store = SentimentStore()
+    tailers = crowdpulse_app.make_tailers(str(tmp_path))
+    goa = PostLog("Goa", "ndjson", str(tmp_path))
+    delhi = PostLog("Delhi", "binary", str(tmp_path))
+    goa.append(posts("positive", "negative", ts=T0))
+    goa.append(posts("positive", ts=T0 + 60))
+    delhi.append(posts("neutral"))
+    goa.close()
+    delhi.close()
+
+    assert crowdpulse_app.ingest_post_logs(tailers, store) == 4
+    assert store.trend("GOI", "1h", now=T0 + 60)["totals"] == {"positive": 2, "negative": 1, "neutral": 0}
+    assert store.trend("DEL", "1h", now=T0)["totals"]["neutral"] == 1
+    # Dobara poll -> kuch naya nahi, double count nahi
+    assert crowdpulse_app.ingest_post_logs(tailers, store) == 0
+
+
+def test_pulse_requests_do_not_touch_history(monkeypatch):
+    store = SentimentStore()
+    monkeypatch.setattr(crowdpulse_app, "SENTIMENT_HISTORY", store)
+    monkeypatch.setattr(crowdpulse_app, "get_youtube_videos", lambda city: [])
+    crowdpulse_app.CACHE.delete("HYD")
+    crowdpulse_app.PULSE_RESPONSES.invalidate("HYD")
+    client = crowdpulse_app.app.test_client()
+    # Cache miss aur hit dono -> history sirf feeder log se bharti hai
+    assert client.get("/api/crowdpulse/HYD").status_code == 200
+    assert client.get("/api/crowdpulse/HYD").status_code == 200
+    assert client.get("/api/crowdpulse/HYD/trend?range=1h").get_json()["totals"] == \
+        {"positive": 0, "negative": 0, "neutral": 0}
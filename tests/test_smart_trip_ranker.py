@@ -0,0 +1,114 @@
+# tests/test_smart_trip_ranker.py -- SmartTripRanker scoring, type mix, bumps, rebuilds
+import threading
+import time
+
+import pytest
+
+import smart_trip_ranker
+from smart_trip_ranker import SmartTripRanker, score_item
+
+
+def trip(trip_id, kind="Hotel", price=1000, count=0):
+    return {"trip_id": trip_id, "destination_code": "GOI", "suggestion_type": kind, "price": price,
+            "booking_count": count}
+
+
+CATALOG = [trip("H1", price=1000), trip("H2", price=3000), trip("H3", price=6000),
+           trip("T1", "Tour", 800), trip("F1", "Food", 300)]
+
+
+def test_score_prefers_cheaper_and_popular_items():
+    assert score_item(trip("a", price=1000), 5000) > score_item(trip("b", price=4000), 5000)
+    assert score_item(trip("a", count=50), 5000) > score_item(trip("a", count=0), 5000)
+    # Unknown type -> default weight (hotel se kam)
+    assert score_item(trip("a", kind="Spa"), 5000) < score_item(trip("a"), 5000)
+
+
+def test_top_orders_by_score_within_a_type():
+    ranker = SmartTripRanker()
+    top = ranker.top("GOI", 3, ["hotel"], loader=lambda: CATALOG)
+    assert [t["trip_id"] for t in top] == ["H1", "H2", "H3"]
+    assert top[0]["score"] > top[1]["score"] > top[2]["score"]
+
+
+def test_top_mixes_suggestion_types():
+    ranker = SmartTripRanker()
+    top = ranker.top("GOI", 3, loader=lambda: CATALOG)
+    assert {t["suggestion_type"] for t in top} == {"Hotel", "Tour", "Food"}
+
+
+def test_loader_runs_once_while_index_is_fresh():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return CATALOG
+
+    ranker = SmartTripRanker(ttl=60)
+    ranker.top("GOI", 2, loader=loader)
+    ranker.top("GOI", 2, loader=loader)
+    assert len(calls) == 1
+
+
+def test_expired_index_is_rebuilt():
+    calls = []
+    ranker = SmartTripRanker(ttl=0)
+    for _ in range(2):
+        ranker.top("GOI", 2, loader=lambda: calls.append(1) or CATALOG)
+        time.sleep(0.01)
+    assert len(calls) == 2
+
+
+def test_record_booking_moves_item_up(monkeypatch):
+    monkeypatch.setattr(smart_trip_ranker, "POPULARITY_HALF", 1)
+    ranker = SmartTripRanker()
+    assert [t["trip_id"] for t in ranker.top("GOI", 3, ["hotel"], loader=lambda: CATALOG)][0] == "H1"
+    for _ in range(20):
+        assert ranker.record_booking("GOI", "H3")
+    top = ranker.top("GOI", 3, ["hotel"], loader=lambda: CATALOG)
+    assert top[0]["trip_id"] == "H3"
+    assert top[0]["booking_count"] == 20
+    # Loader ke items (shared cache) touch nahi hote
+    assert CATALOG[2]["booking_count"] == 0
+
+
+def test_record_booking_unknown_destination_or_trip():
+    ranker = SmartTripRanker()
+    assert not ranker.record_booking("GOI", "H1")
+    ranker.top("GOI", 1, loader=lambda: CATALOG)
+    assert not ranker.record_booking("GOI", "missing")
+
+
+def test_fare_drift_rescores_the_destination():
+    ranker = SmartTripRanker()
+    ranker.top("GOI", 1, loader=lambda: CATALOG)
+    before = ranker.top("GOI", 1, ["hotel"])[0]["score"]
+    ranker.observe_fare("GOI", 50000)  # pehla fare: median (~1000) se bahut door -> rebuild
+    after = ranker.top("GOI", 1, ["hotel"])[0]["score"]
+    assert after > before
+
+
+@pytest.mark.parametrize("fare", [0, -10, None])
+def test_invalid_fares_are_ignored(fare):
+    ranker = SmartTripRanker()
+    ranker.observe_fare("GOI", fare)
+    assert "GOI" not in ranker._fares
+
+
+def test_slow_loader_does_not_block_other_destinations():
+    started, release = threading.Event(), threading.Event()
+
+    def slow_loader():
+        started.set()
+        release.wait(5)
+        return CATALOG
+
+    ranker = SmartTripRanker()
+    worker = threading.Thread(target=ranker.top, args=("GOI", 1), kwargs={"loader": slow_loader})
+    worker.start()
+    assert started.wait(5)
+    t0 = time.monotonic()
+    assert ranker.top("DXB", 1, loader=lambda: [trip("D1")])[0]["trip_id"] == "D1"
+    assert time.monotonic() - t0 < 1
+    release.set()
+    worker.join(5)
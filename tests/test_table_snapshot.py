@@ -0,0 +1,107 @@
+# tests/test_table_snapshot.py -- export/import round trip (moto DynamoDB), retries, failures
+import os
+import threading
+from decimal import Decimal
+
+import boto3
+import pytest
+from boto3.dynamodb.types import Binary
+from moto import mock_aws
+
+from travelease_common import table_snapshot
+from travelease_common.table_snapshot import export_table, import_table, iter_snapshot_items
+
+
+def create_table(name):
+    boto3.client("dynamodb").create_table(
+        TableName=name,
+        KeySchema=[{"AttributeName": "flight_id", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "flight_id", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    return boto3.resource("dynamodb").Table(name)
+
+
+def flight(i):
+    return {
+        "flight_id": f"F{i:04d}",
+        "price": Decimal("22000.50") + i,
+        "seats": {"A1", "A2"},
+        "stops": [{"code": "DEL", "minutes": Decimal(45)}],
+        "direct": i % 2 == 0,
+        "note": None,
+        "blob": Binary(b"\x00\x01"),
+        # ~4 KB per item -> scan kai pages mein aata hai (1 MB page limit)
+        "padding": "x" * 4000,
+    }
+
+
+@pytest.fixture
+def source():
+    with mock_aws():
+        table = create_table("TravelEase-Flights")
+        with table.batch_writer() as batch:
+            for i in range(600):
+                batch.put_item(Item=flight(i))
+        yield table
+
+
+@pytest.mark.parametrize("filename, segments", [("flights.ndjson.gz", 4), ("flights.ndjson", 1)])
+def test_export_import_round_trip(source, tmp_path, filename, segments):
+    path = str(tmp_path / filename)
+    assert export_table("TravelEase-Flights", path, segments=segments) == 600
+    assert not os.path.exists(path + ".tmp")
+
+    items = {item["flight_id"]: item for item in iter_snapshot_items(path)}
+    assert len(items) == 600 and items["F0007"] == flight(7)
+
+    restored = create_table("TravelEase-Flights-restore")
+    assert import_table("TravelEase-Flights-restore", path, workers=4, chunk_size=100) == 600
+    assert restored.get_item(Key={"flight_id": "F0599"})["Item"] == flight(599)
+    pages = boto3.client("dynamodb").get_paginator("scan").paginate(
+        TableName="TravelEase-Flights-restore", Select="COUNT")
+    assert sum(page["Count"] for page in pages) == 600
+
+
+def test_failed_export_leaves_no_snapshot(tmp_path):
+    path = str(tmp_path / "missing.ndjson.gz")
+    with mock_aws():
+        with pytest.raises(Exception, match="ResourceNotFound|not found"):
+            export_table("NoSuchTable", path, segments=2)
+    assert os.listdir(tmp_path) == []
+
+
+class FlakyClient:
+    """batch_write_item: pehli call mein aadhe items unprocessed lautata hai."""
+
+    def __init__(self, fail_times=1):
+        self.fail_times = fail_times
+        self.written = []
+
+    def batch_write_item(self, RequestItems):
+        (table, requests), = RequestItems.items()
+        if self.fail_times:
+            self.fail_times -= 1
+            half = len(requests) // 2
+            self.written.extend(requests[:half])
+            return {"UnprocessedItems": {table: requests[half:]}}
+        self.written.extend(requests)
+        return {"UnprocessedItems": {}}
+
+
+def test_unprocessed_items_are_retried(monkeypatch):
+    monkeypatch.setattr(table_snapshot.time, "sleep", lambda s: None)
+    local = threading.local()
+    local.client = FlakyClient(fail_times=2)
+    items = [{"flight_id": {"S": f"F{i}"}} for i in range(30)]
+    assert table_snapshot._write_chunk(local, "T", items, None, None) == 30
+    assert sorted(r["PutRequest"]["Item"]["flight_id"]["S"] for r in local.client.written) == \
+        sorted(f"F{i}" for i in range(30))
+
+
+def test_retries_are_bounded(monkeypatch):
+    monkeypatch.setattr(table_snapshot.time, "sleep", lambda s: None)
+    local = threading.local()
+    local.client = FlakyClient(fail_times=10 ** 6)
+    with pytest.raises(RuntimeError, match="Unprocessed items remain"):
+        table_snapshot._write_chunk(local, "T", [{"flight_id": {"S": "F1"}}, {"flight_id": {"S": "F2"}}], None, None)
@@ -0,0 +1,82 @@
+# tests/test_task_graph.py -- dependency order, parallelism, failure propagation, output prefixes
+import sys
+import threading
+import time
+
+import pytest
+
+from deploy_tools.task_graph import TaskGraph, stream_command
+
+
+def test_results_flow_to_dependents():
+    graph = TaskGraph()
+    graph.add("terraform", lambda r: {"bucket": "b1"})
+    graph.add("build", lambda r: r["terraform"]["bucket"] + "/dist", deps=["terraform"])
+    graph.add("upload", lambda r: (r["build"], sorted(r)), deps=["build"])
+    assert graph.run() is True
+    assert graph.tasks["upload"].result == ("b1/dist", ["build"])  # sirf declared deps
+
+
+def test_independent_tasks_run_in_parallel():
+    barrier = threading.Barrier(3, timeout=5)
+    graph = TaskGraph()
+    for name in ("flights", "trips", "upload"):
+        graph.add(name, lambda r: barrier.wait())  # teeno saath na chalein to BrokenBarrierError
+    assert graph.run()
+
+
+def test_failure_skips_dependents_but_not_other_branches():
+    graph = TaskGraph()
+    graph.add("build", lambda r: 1 / 0)
+    graph.add("upload", lambda r: "never", deps=["build"])
+    graph.add("invalidate", lambda r: "never", deps=["upload"])
+    graph.add("populate", lambda r: sys.exit(3))  # SystemExit bhi sirf task failure
+    graph.add("report", lambda r: "ok")
+    assert graph.run() is False
+    status = {name: t.status for name, t in graph.tasks.items()}
+    assert status == {"build": "failed", "upload": "skipped", "invalidate": "skipped",
+                      "populate": "failed", "report": "ok"}
+    assert isinstance(graph.tasks["build"].error, ZeroDivisionError)
+
+
+@pytest.mark.parametrize("deps, message", [
+    ({"a": ["missing"]}, "unknown task 'missing'"),
+    ({"a": ["b"], "b": ["c"], "c": ["a"]}, "Dependency cycle"),
+])
+def test_invalid_graphs_are_rejected_before_running(deps, message):
+    ran = []
+    graph = TaskGraph()
+    for name, task_deps in deps.items():
+        graph.add(name, lambda r, name=name: ran.append(name), deps=task_deps)
+    with pytest.raises(ValueError, match=message):
+        graph.run()
+    assert ran == []
+
+
+def test_duplicate_task_names_are_rejected():
+    graph = TaskGraph().add("build", lambda r: None)
+    with pytest.raises(ValueError):
+        graph.add("build", lambda r: None)
+
+
+def test_output_is_prefixed_per_task(capsys):
+    graph = TaskGraph()
+    graph.add("one", lambda r: print("hello", end="") or print(" world"))
+    graph.add("two", lambda r: stream_command([sys.executable, "-c", "print('from child')"]))
+    assert graph.run()
+    lines = capsys.readouterr().out.splitlines()
+    assert "[one] hello world" in lines
+    assert "[two] from child" in lines
+    assert graph.tasks["two"].result == 0
+
+
+def test_critical_path_follows_the_slowest_chain():
+    graph = TaskGraph()
+    graph.add("terraform", lambda r: time.sleep(0.02))
+    graph.add("slow_build", lambda r: time.sleep(0.15), deps=["terraform"])
+    graph.add("fast_populate", lambda r: None, deps=["terraform"])
+    graph.add("upload", lambda r: None, deps=["slow_build", "fast_populate"])
+    graph.run()
+    assert [t.name for t in graph.critical_path()] == ["terraform", "slow_build", "upload"]
+    report = graph.report()
+    assert "Critical path: terraform" in report and "upload" in report
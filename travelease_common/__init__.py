@@ -0,0 +1,6 @@
+"""
+Shared helpers for the TravelEase services.
+
+Yeh package repo root par hai aur har service ki Docker image mein
+/app/travelease_common par copy hota hai (build context = repo root).
+"""
@@ -0,0 +1,308 @@
+"""
+Admission control + load shedding, shared by all services.
+
+    init_admission(app)                       # Flask: global + per-client rate limits -> 429
+    with admit("youtube"): search(...)        # per-dependency concurrency cap (+ optional rate)
+    guard_boto3(dynamodb)                     # har DynamoDB call "dynamodb" guard se
+    except Overloaded as e: return shed_response(e, stale_entry)   # stale data ya 429
+
+Overload par request queue mein wait nahi karti (jab tak timeout na ho):
+- request rate limit khali -> turant 429 + Retry-After
+- dependency ke saare slots busy -> ADMISSION_WAIT_MS tak wait, phir
+  Overloaded; route us waqt stale response (http_cache.ResponseCache,
+  allow_stale) de sakta hai, warna 429.
+
+Config (env; 0 = limit off):
+  RATE_LIMIT_RPS / RATE_LIMIT_BURST                 per task, saare clients (300 / 600)
+  CLIENT_RATE_LIMIT_RPS / CLIENT_RATE_LIMIT_BURST   per client IP (20 / 40)
+  LIMIT_<DEP>_CONCURRENCY                           per process, e.g. LIMIT_DYNAMODB_CONCURRENCY
+  LIMIT_<DEP>_RPS / LIMIT_<DEP>_BURST               per task, e.g. LIMIT_YOUTUBE_RPS
+  ADMISSION_WAIT_MS                                 dependency slot ke liye max wait (50)
+
+Defaults: dynamodb 32 concurrent (= DYNAMODB_MAX_POOL), youtube 4 concurrent
+aur ~100 searches/day (search = 100 quota units, daily quota 10,000).
+
+Buckets in-process hain: task-level rates gunicorn workers mein baant di
+jaati hain (TRAVELEASE_WORKERS, serving set karta hai). Client IP:
+X-Forwarded-For ki aakhri entry (ALB wahi add karta hai; pehli entries
+client khud bhej sakta hai).
+
+Service-to-service calls (Booking aggregator -> Flight / CrowdPulse, ALB ke
+through) sab Booking task ke IP se aati hain. INTERNAL_API_KEY set ho to
+Upstream har call par X-Internal-Key header bhejta hai; sahi key wali
+requests per-client bucket skip karti hain (global bucket phir bhi lagta hai).
+
+Metrics: travelease_admission_rejected_total{scope,reason},
+travelease_admission_limit{scope,kind}, travelease_stale_responses_total{namespace}.
+"""
+import hmac
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from travelease_common.metrics import record_limit, record_shed, record_stale
+
+EXEMPT_PATHS = {"/ping", "/metrics", "/api/crowdpulse/health"}
+MAX_CLIENTS = 10000
+INTERNAL_HEADER = "X-Internal-Key"
+INTERNAL_API_KEY = os.environ.get("INTERNAL_API_KEY", "")
+
+# dependency -> (concurrency per process, rps per task, burst per task)
+DEPENDENCY_DEFAULTS = {
+    "dynamodb": (int(os.environ.get("DYNAMODB_MAX_POOL", 32)), 0, 0),
+    "youtube": (4, 100 / 86400, 20),
+}
+
+
+class Overloaded(Exception):
+    """Request / dependency call rejected by admission control."""
+
+    def __init__(self, scope, reason, retry_after=1.0):
+        super().__init__(f"{scope} {reason} limit")
+        self.scope = scope
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def _env_float(name, default):
+    return float(os.environ.get(name, default))
+
+
+def _workers():
+    return max(1, int(os.environ.get("TRAVELEASE_WORKERS", 1)))
+
+
+# ------------------------
+# TOKEN BUCKETS
+# ------------------------
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self, cost=1.0):
+        """0.0 if `cost` tokens were taken, else seconds until they would be available."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= cost:
+                self.tokens -= cost
+                return 0.0
+            return (cost - self.tokens) / self.rate
+
+
+class ClientBuckets:
+    """One TokenBucket per client key (LRU, MAX_CLIENTS)."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, client, cost=1.0):
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = self._buckets[client] = TokenBucket(self.rate, self.burst)
+                while len(self._buckets) > MAX_CLIENTS:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client)
+        return bucket.take(cost)
+
+
+# ------------------------
+# REQUEST ADMISSION
+# ------------------------
+_global_bucket = None
+_client_buckets = None
+_init_lock = threading.Lock()
+
+
+def _request_buckets():
+    global _global_bucket, _client_buckets
+    if _global_bucket is None:
+        with _init_lock:
+            if _global_bucket is None:
+                workers = _workers()
+                rps, burst = _env_float("RATE_LIMIT_RPS", 300), _env_float("RATE_LIMIT_BURST", 600)
+                client_rps = _env_float("CLIENT_RATE_LIMIT_RPS", 20)
+                client_burst = _env_float("CLIENT_RATE_LIMIT_BURST", 40)
+                # Ek client ki requests kisi bhi worker par ja sakti hain -> per-client bhi baanto
+                _client_buckets = ClientBuckets(client_rps / workers, client_burst / workers)
+                _global_bucket = TokenBucket(rps / workers, burst / workers)
+                record_limit("global", "rps", _global_bucket.rate)
+                record_limit("client", "rps", _client_buckets.rate)
+    return _global_bucket, _client_buckets
+
+
+def check_request(client, path, internal=False):
+    """
+    Raise Overloaded if the per-client or global bucket is empty (health/metrics/debug
+    exempt). internal=True (trusted service caller) skips the per-client bucket.
+    """
+    if path in EXEMPT_PATHS or path.startswith("/debug/"):
+        return
+    global_bucket, client_buckets = _request_buckets()
+    wait = 0.0 if internal else client_buckets.take(client)
+    if wait:
+        record_shed("client", "rate")
+        raise Overloaded("client", "rate", wait)
+    wait = global_bucket.take()
+    if wait:
+        record_shed("global", "rate")
+        raise Overloaded("global", "rate", wait)
+
+
+def client_key(forwarded_for, peer):
+    """Client IP: last X-Forwarded-For hop (added by the ALB), else the socket peer."""
+    if forwarded_for:
+        return forwarded_for.rsplit(",", 1)[-1].strip()
+    return peer or "unknown"
+
+
+def internal_caller(key):
+    """True if `key` (X-Internal-Key header) matches INTERNAL_API_KEY; always False when unset."""
+    if not (INTERNAL_API_KEY and key):
+        return False
+    return hmac.compare_digest(key.encode("utf-8"), INTERNAL_API_KEY.encode("utf-8"))
+
+
+# ------------------------
+# DEPENDENCY GUARDS
+# ------------------------
+class DependencyGuard:
+    def __init__(self, name, concurrency, rate, burst, wait):
+        self.name = name
+        self.concurrency = concurrency
+        self.wait = wait
+        self._slots = threading.BoundedSemaphore(concurrency) if concurrency > 0 else None
+        self._bucket = TokenBucket(rate, burst)
+        record_limit(name, "concurrency", concurrency)
+        record_limit(name, "rps", rate)
+
+    def acquire(self, cost=1.0, wait=None):
+        """Take a slot (+ `cost` rate tokens) or raise Overloaded. Pair with release()."""
+        retry_after = self._bucket.take(cost)
+        if retry_after:
+            record_shed(self.name, "rate")
+            raise Overloaded(self.name, "rate", retry_after)
+        if self._slots is not None and not self._slots.acquire(timeout=self.wait if wait is None else wait):
+            record_shed(self.name, "concurrency")
+            raise Overloaded(self.name, "concurrency")
+
+    def release(self):
+        if self._slots is not None:
+            self._slots.release()
+
+
+_guards = {}
+
+
+def guard(name):
+    """The process-wide DependencyGuard for a dependency (configured from env)."""
+    g = _guards.get(name)
+    if g is None:
+        with _init_lock:
+            g = _guards.get(name)
+            if g is None:
+                concurrency, rps, burst = DEPENDENCY_DEFAULTS.get(name, (0, 0, 0))
+                prefix = f"LIMIT_{name.upper()}_"
+                workers = _workers()
+                g = _guards[name] = DependencyGuard(
+                    name,
+                    int(os.environ.get(prefix + "CONCURRENCY", concurrency)),
+                    _env_float(prefix + "RPS", rps) / workers,
+                    _env_float(prefix + "BURST", burst) / workers,
+                    _env_float("ADMISSION_WAIT_MS", 50) / 1000,
+                )
+    return g
+
+
+@contextmanager
+def admit(name, cost=1.0, wait=None):
+    """Run the block under the dependency's limits; raises Overloaded (before the call) if full."""
+    g = guard(name)
+    g.acquire(cost, wait)
+    try:
+        yield
+    finally:
+        g.release()
+
+
+def guard_boto3(client_or_resource, dependency="dynamodb"):
+    """
+    Every API call of this client goes through guard(dependency). Register
+    before instrument_boto3(): a rejected call raises in before-call, so no
+    later handler (in-flight gauge) runs for it. Returns the argument.
+    """
+    client = getattr(getattr(client_or_resource, "meta", None), "client", client_or_resource)
+    g = guard(dependency)
+
+    def _before(context, **kwargs):
+        g.acquire()
+        context["travelease_admitted"] = True
+
+    def _after(context, **kwargs):
+        if context.pop("travelease_admitted", False):
+            g.release()
+
+    events = client.meta.events
+    events.register("before-call.*.*", _before)
+    events.register("after-call.*.*", _after)
+    events.register("after-call-error.*.*", _after)
+    return client_or_resource
+
+
+# ------------------------
+# FLASK
+# ------------------------
+def shed_response(error, stale_entry=None, namespace=""):
+    """
+    Flask response for an Overloaded error: the stale entry (ETag, compression,
+    `Warning: 110`) if there is one, else 429 with Retry-After.
+    """
+    from flask import jsonify
+
+    if stale_entry is not None:
+        from travelease_common.http_cache import json_response
+
+        record_stale(namespace)
+        response = json_response(stale_entry, "no-cache")
+        response.headers["Warning"] = '110 - "Response is Stale"'
+        return response
+    response = jsonify({"message": "Service is busy, please retry shortly", "limit": str(error)})
+    response.status_code = 429
+    response.headers["Retry-After"] = str(max(1, math.ceil(error.retry_after)))
+    return response
+
+
+def init_admission(app):
+    """Global + per-client rate limits for every request, and 429 for unhandled Overloaded."""
+    from flask import request
+
+    @app.before_request
+    def _admit():
+        try:
+            check_request(client_key(request.headers.get("X-Forwarded-For"), request.remote_addr), request.path,
+                          internal_caller(request.headers.get(INTERNAL_HEADER)))
+        except Overloaded as e:
+            return shed_response(e)
+
+    @app.errorhandler(Overloaded)
+    def _overloaded(e):
+        return shed_response(e)
+
+    return app
@@ -0,0 +1,295 @@
+"""
+Pluggable cache backends shared by all services.
+
+Backends:
+  memory -> in-process LRU (default; same behaviour as the old per-process dicts)
+  sqlite -> one SQLite file shared by every worker/process on the host
+  redis  -> any Redis-protocol server (Redis, Valkey, ElastiCache, or the
+            local stand-in in travelease_common.resp_server)
+
+Config (env):
+  CACHE_BACKEND      memory | sqlite | redis        (default: memory)
+  CACHE_URL          redis://host:port/db           (redis backend)
+  CACHE_SQLITE_PATH  /tmp/travelease_cache.sqlite3  (sqlite backend)
+  CACHE_MAX_ITEMS    max entries for the memory LRU (default: 10000)
+
+Values are stored as JSON (Decimal -> int/float), so cached data looks the
+same no matter which backend served it.
+"""
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from urllib.parse import urlparse
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value):
+    return json.dumps(value, default=_json_default, separators=(",", ":"))
+
+
+class Cache:
+    """Base class: get/set/delete plus hit/miss counters."""
+
+    backend = "base"
+
+    def __init__(self, namespace="default"):
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, key):
+        return f"{self.namespace}:{key}"
+
+    def get(self, key):
+        value = self._get(self._key(key))
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key, value, ttl):
+        self._set(self._key(key), value, ttl)
+
+    def delete(self, key):
+        self._delete(self._key(key))
+
+    def get_or_set(self, key, ttl, loader):
+        """Return the cached value, or call loader() and cache its result."""
+        value = self.get(key)
+        if value is None:
+            value = loader()
+            if value is not None:
+                self.set(key, value, ttl)
+        return value
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "namespace": self.namespace,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+    def _get(self, key):
+        raise NotImplementedError
+
+    def _set(self, key, value, ttl):
+        raise NotImplementedError
+
+    def _delete(self, key):
+        raise NotImplementedError
+
+
+# ------------------------
+# IN-PROCESS LRU
+# ------------------------
+class LocalLRUCache(Cache):
+    backend = "memory"
+
+    def __init__(self, namespace="default", max_items=10000):
+        super().__init__(namespace)
+        self.max_items = max_items
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, raw = entry
+            if expires_at < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+        return json.loads(raw)
+
+    def _set(self, key, value, ttl):
+        raw = dumps(value)
+        with self._lock:
+            self._data[key] = (time.time() + ttl, raw)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_items:
+                self._data.popitem(last=False)
+
+    def _delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+
+# ------------------------
+# SQLITE (CROSS-PROCESS, SAME HOST)
+# ------------------------
+class SQLiteCache(Cache):
+    backend = "sqlite"
+
+    def __init__(self, namespace="default", path="/tmp/travelease_cache.sqlite3"):
+        super().__init__(namespace)
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        conn.commit()
+
+    def _conn(self):
+        # sqlite3 connections thread-safe nahi hain -> har thread ka apna connection.
+        # pid check: preload ke baad fork hua worker master ka connection reuse na kare
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _get(self, key):
+        row = self._conn().execute(
+            "SELECT value FROM cache WHERE key = ? AND expires_at >= ?", (key, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _set(self, key, value, ttl):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, dumps(value), time.time() + ttl),
+        )
+
+    def _delete(self, key):
+        self._conn().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def purge_expired(self):
+        self._conn().execute("DELETE FROM cache WHERE expires_at < ?", (time.time(),))
+
+
+# ------------------------
+# REDIS PROTOCOL (CROSS-TASK)
+# ------------------------
+class RespConnection:
+    """Minimal blocking RESP2 client (just enough for a cache)."""
+
+    def __init__(self, host, port, db=0, password=None, timeout=1.0):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile("rb")
+        if password:
+            self.command("AUTH", password)
+        if db:
+            self.command("SELECT", db)
+
+    def command(self, *args):
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self.sock.sendall(b"".join(parts))
+        return self._read_reply()
+
+    def _read_reply(self):
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by cache server")
+        prefix, rest = line[:1], line[1:-2]
+        if prefix == b"+":
+            return rest.decode()
+        if prefix == b"-":
+            raise RuntimeError(rest.decode())
+        if prefix == b":":
+            return int(rest)
+        if prefix == b"$":
+            length = int(rest)
+            if length == -1:
+                return None
+            data = self.reader.read(length + 2)
+            return data[:-2]
+        if prefix == b"*":
+            count = int(rest)
+            return None if count == -1 else [self._read_reply() for _ in range(count)]
+        raise RuntimeError(f"Unexpected reply: {line!r}")
+
+    def close(self):
+        try:
+            self.reader.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class RedisCache(Cache):
+    """
+    Redis-protocol cache with a small per-thread connection.
+    Network errors never fail the request: they count as a miss / skipped write.
+    """
+
+    backend = "redis"
+
+    def __init__(self, namespace="default", url="redis://localhost:6379/0", timeout=0.25):
+        super().__init__(namespace)
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.db = int((parsed.path or "/0").lstrip("/") or 0)
+        self.password = parsed.password
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():  # fork ke baad naya socket
+            conn = RespConnection(self.host, self.port, self.db, self.password, self.timeout)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _call(self, *args):
+        try:
+            return self._conn().command(*args)
+        except (OSError, ConnectionError, RuntimeError) as e:
+            logging.warning(f"[cache] redis {args[0]} failed: {e}")
+            conn = getattr(self._local, "conn", None)
+            if conn is not None:
+                conn.close()
+                self._local.conn = None
+            return None
+
+    def _get(self, key):
+        raw = self._call("GET", key)
+        return json.loads(raw) if raw is not None else None
+
+    def _set(self, key, value, ttl):
+        self._call("SET", key, dumps(value), "PX", max(1, int(ttl * 1000)))
+
+    def _delete(self, key):
+        self._call("DEL", key)
+
+
+# ------------------------
+# FACTORY
+# ------------------------
+def get_cache(namespace, backend=None):
+    """Build the configured cache backend for a namespace (e.g. "flights")."""
+    backend = (backend or os.getenv("CACHE_BACKEND", "memory")).lower()
+    if backend == "redis":
+        return RedisCache(namespace, os.getenv("CACHE_URL", "redis://localhost:6379/0"))
+    if backend == "sqlite":
+        return SQLiteCache(namespace, os.getenv("CACHE_SQLITE_PATH", "/tmp/travelease_cache.sqlite3"))
+    if backend != "memory":
+        logging.warning(f"[cache] Unknown CACHE_BACKEND '{backend}', using in-process LRU.")
+    return LocalLRUCache(namespace, int(os.getenv("CACHE_MAX_ITEMS", "10000")))
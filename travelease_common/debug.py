@@ -0,0 +1,222 @@
+"""
+Runtime debug surface: on-demand sampling profiler + per-request spans.
+
+    init_debug(app)     # Flask: /debug/profile, /debug/spans, slow request logs
+
+GET /debug/profile?seconds=10[&interval_ms=5][&threads=requests|all]
+    Process ke threads ke stacks sys._current_frames() se sample hote hain
+    (koi restart / pehle se chalta profiler nahi). Response collapsed-stack
+    text hai jo flamegraph.pl / speedscope seedha padhte hain:
+        <module> (serving.py:1);...;book (Booking_Service_App.py:80);_send (email_sender_gmail.py:17) 42
+    threads=requests (default): sirf wahi threads jo us waqt request serve
+    kar rahe hain, idle gunicorn threads nahi. gunicorn mein har worker alag
+    process hai -- profile usi worker ka milta hai jisne request li. Sync
+    worker (payment) khud block ho jata hai, use WORKER_CLASS=threaded se
+    profile karo.
+
+GET /debug/spans[?slow_ms=N]
+    Har request ke spans: dependency calls (track_dependency /
+    instrument_boto3 -> dynamodb.PutItem, smtp.send, youtube.search) aur
+    JSON serialization. slow_ms se slow request par ek log line:
+        [SLOW] POST /book 812 ms: smtp.send 640.2 ms x2, dynamodb.PutItem 12.1 ms, other 159.4 ms
+    slow_ms runtime par threshold badalta hai (isi worker process ka; sab
+    workers ke liye SLOW_REQUEST_MS env).
+
+Endpoints tabhi khulte hain jab DEBUG_TOKEN env set ho (header
+X-Debug-Token); warna 404 -- stack traces public ALB par nahi jaane chahiye.
+"""
+import contextvars
+import hmac
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+try:
+    from flask.json.provider import DefaultJSONProvider
+except ImportError:  # Flask < 2.2
+    DefaultJSONProvider = None
+
+DEBUG_TOKEN = os.environ.get("DEBUG_TOKEN", "")
+SLOW_REQUEST_MS = float(os.environ.get("SLOW_REQUEST_MS", 1000))
+MAX_PROFILE_SECONDS = 30
+DEFAULT_INTERVAL_MS = 5
+
+_spans = contextvars.ContextVar("travelease_spans", default=None)
+_request_threads = Counter()  # thread ident -> requests in progress on it
+_profile_lock = threading.Lock()
+
+
+# ------------------------
+# SPANS
+# ------------------------
+def add_span(name, seconds):
+    """Record a finished span on the current request (no-op outside a request)."""
+    spans = _spans.get()
+    if spans is not None:
+        spans.append((name, seconds))
+
+
+@contextmanager
+def span(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_span(name, time.perf_counter() - start)
+
+
+def begin_request():
+    """Call at request start; returns the token for end_request()."""
+    _request_threads[threading.get_ident()] += 1
+    return _spans.set([]), time.perf_counter()
+
+
+def end_request(started, label):
+    token, start = started
+    elapsed = time.perf_counter() - start
+    spans = _spans.get()
+    _spans.reset(token)
+    tid = threading.get_ident()
+    _request_threads[tid] -= 1
+    if _request_threads[tid] <= 0:
+        del _request_threads[tid]
+    # /debug/profile khud seconds= tak chalta hai -> slow log mein nahi
+    if elapsed * 1000 >= SLOW_REQUEST_MS and " /debug/" not in label:
+        logging.warning(f"[SLOW] {label} {elapsed * 1000:.0f} ms: {format_spans(spans or [], elapsed)}")
+
+
+def format_spans(spans, elapsed):
+    """'smtp.send 640.2 ms x2, dynamodb.PutItem 12.1 ms, other 159.4 ms' (slowest first)."""
+    totals, counts = {}, Counter()
+    for name, seconds in spans:
+        totals[name] = totals.get(name, 0.0) + seconds
+        counts[name] += 1
+    parts = [f"{name} {totals[name] * 1000:.1f} ms" + (f" x{counts[name]}" if counts[name] > 1 else "")
+             for name in sorted(totals, key=totals.get, reverse=True)]
+    # Parallel spans (thread pool) overlap kar sakte hain -> other 0 se kam nahi
+    other = max(0.0, elapsed - sum(totals.values()))
+    parts.append(f"other {other * 1000:.1f} ms")
+    return ", ".join(parts)
+
+
+# ------------------------
+# SAMPLING PROFILER
+# ------------------------
+def _frame_label(code):
+    # co_firstlineno (line nahi) -> ek function ke saare samples ek hi frame mein
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def sample_stacks(seconds, interval=DEFAULT_INTERVAL_MS / 1000, only_requests=True):
+    """Returns (Counter of collapsed stacks "outer;...;leaf" -> samples, sample rounds)."""
+    counts = Counter()
+    me = threading.get_ident()
+    deadline = time.monotonic() + seconds
+    rounds = 0
+    while True:
+        for tid, frame in sys._current_frames().items():
+            if tid == me or (only_requests and tid not in _request_threads):
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            counts[";".join(reversed(stack))] += 1
+        rounds += 1
+        if time.monotonic() >= deadline:
+            return counts, rounds
+        time.sleep(interval)
+
+
+def authorized(token):
+    return bool(DEBUG_TOKEN) and hmac.compare_digest((token or "").encode(), DEBUG_TOKEN.encode())
+
+
+def profile_response(params):
+    """
+    /debug/profile for any framework: params is a dict of query values.
+    Returns (status, body text, extra headers).
+    """
+    try:
+        seconds = float(params.get("seconds", 10))
+        interval_ms = float(params.get("interval_ms", DEFAULT_INTERVAL_MS))
+    except ValueError:
+        return 400, "seconds and interval_ms must be numbers\n", {}
+    threads = params.get("threads", "requests")
+    if not 0 < seconds <= MAX_PROFILE_SECONDS:
+        return 400, f"seconds must be in (0, {MAX_PROFILE_SECONDS}]\n", {}
+    if interval_ms < 1:
+        return 400, "interval_ms must be >= 1\n", {}
+    if threads not in ("requests", "all"):
+        return 400, "threads must be 'requests' or 'all'\n", {}
+
+    if not _profile_lock.acquire(blocking=False):
+        return 409, "A profile is already running in this process\n", {}
+    try:
+        counts, rounds = sample_stacks(seconds, interval_ms / 1000, threads == "requests")
+    finally:
+        _profile_lock.release()
+    body = "".join(f"{stack} {n}\n" for stack, n in counts.most_common())
+    return 200, body, {"X-Profile-Samples": str(rounds), "X-Profile-Pid": str(os.getpid())}
+
+
+def spans_response(params):
+    """/debug/spans: show (and optionally set) the slow-request threshold. Returns (status, dict)."""
+    global SLOW_REQUEST_MS
+    if "slow_ms" in params:
+        try:
+            SLOW_REQUEST_MS = float(params["slow_ms"])
+        except ValueError:
+            return 400, {"error": "slow_ms must be a number"}
+        logging.info(f"Slow request threshold set to {SLOW_REQUEST_MS:g} ms (pid {os.getpid()})")
+    return 200, {"slow_ms": SLOW_REQUEST_MS, "pid": os.getpid()}
+
+
+# ------------------------
+# FLASK
+# ------------------------
+if DefaultJSONProvider is not None:
+    class _TimedJSONProvider(DefaultJSONProvider):
+        def dumps(self, obj, **kwargs):
+            with span("serialize"):
+                return super().dumps(obj, **kwargs)
+
+
+def init_debug(app):
+    """Per-request spans, slow request logging and the token-protected /debug routes."""
+    from flask import Response, abort, jsonify, request
+
+    if DefaultJSONProvider is not None:
+        app.json = _TimedJSONProvider(app)
+
+    @app.before_request
+    def _begin_spans():
+        request.environ["travelease.spans"] = begin_request()
+
+    @app.teardown_request
+    def _end_spans(exc):
+        started = request.environ.pop("travelease.spans", None)
+        if started is not None:
+            end_request(started, f"{request.method} {request.path}")
+
+    def _check_token():
+        if not authorized(request.headers.get("X-Debug-Token")):
+            abort(404)
+
+    @app.route("/debug/profile")
+    def debug_profile():
+        _check_token()
+        status, body, headers = profile_response(request.args.to_dict())
+        return Response(body, status=status, headers=headers, mimetype="text/plain")
+
+    @app.route("/debug/spans", methods=["GET", "POST"])
+    def debug_spans():
+        _check_token()
+        status, body = spans_response(request.args.to_dict())
+        return jsonify(body), status
+
+    return app
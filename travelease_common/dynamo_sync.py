@@ -0,0 +1,147 @@
+"""
+Incremental, diff-based sync of a DynamoDB table to a desired item set.
+
+Table ko ek baar scan karke har item ka content hash (key -> sha256)
+banaya jata hai. Phir desired items stream hote hain: sirf naye/badle hue
+items likhe jaate hain. Unchanged catalog par zero writes.
+
+Delete opt-in hai (prune=True / --prune): tabhi jo keys desired set mein
+nahi hain woh table se hatti hain. Default off, kyunki table mein doosre
+sources ke items bhi hote hain (e.g. --from-file wali dated schedule,
+purane random-UUID flights) jinhe ek generated sync nahi mita sakta.
+
+Runtime par service jo attributes khud likhti hai (e.g. SmartTripsDB ka
+booking_count) `preserve_fields` mein do: woh hash mein nahi gine jaate
+(isliye item "changed" nahi banta) aur changed item likhte waqt table ki
+current value ke saath hi put hote hain.
+
+    report = sync_table(table, items, key_name="trip_id", prune=True,
+                        preserve_fields=("booking_count",))
+    print(report.summary())
+
+Used by populate_smart_trips_db.py --sync and populate_flights_db.py --sync.
+"""
+import hashlib
+import json
+from decimal import Decimal
+
+
+def _normalize(value):
+    # int 2500, float 2500.0 aur Decimal('2500') sab ek hi hash dein
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float, Decimal)):
+        return format(Decimal(str(value)).normalize(), "f")
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted(_normalize(v) for v in value)
+    return value
+
+
+def content_hash(item, exclude=()):
+    """Stable hash of an item's content (minus `exclude` fields), independent of number types and key order."""
+    if exclude:
+        item = {k: v for k, v in item.items() if k not in exclude}
+    canonical = json.dumps(_normalize(item), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def to_dynamo(item):
+    """Convert ints/floats to Decimal for put_item (DynamoDB requirement)."""
+    out = {}
+    for k, v in item.items():
+        if isinstance(v, float) or (isinstance(v, int) and not isinstance(v, bool)):
+            out[k] = Decimal(str(v))
+        else:
+            out[k] = v
+    return out
+
+
+def scan_hashes(table, key_name, preserve_fields=()):
+    """
+    Scan the whole table (all pages) and return {key: (content_hash, preserved)},
+    preserved = the item's values of `preserve_fields` (not part of the hash).
+    """
+    hashes = {}
+    kwargs = {}
+    while True:
+        response = table.scan(**kwargs)
+        for item in response.get("Items", []):
+            preserved = {k: item[k] for k in preserve_fields if k in item}
+            hashes[item[key_name]] = (content_hash(item, preserve_fields), preserved)
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return hashes
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+class SyncReport:
+    def __init__(self, table_name, dry_run):
+        self.table_name = table_name
+        self.dry_run = dry_run
+        self.added = []
+        self.changed = []
+        self.deleted = []
+        self.unchanged = 0
+
+    @property
+    def writes(self):
+        return len(self.added) + len(self.changed) + len(self.deleted)
+
+    def summary(self):
+        mode = " (dry run)" if self.dry_run else ""
+        return (f"Sync {self.table_name}{mode}: {len(self.added)} added, {len(self.changed)} changed, "
+                f"{len(self.deleted)} deleted, {self.unchanged} unchanged")
+
+    def details(self, limit=20):
+        lines = []
+        for label, keys in (("+", self.added), ("~", self.changed), ("-", self.deleted)):
+            for key in keys[:limit]:
+                lines.append(f"  {label} {key}")
+            if len(keys) > limit:
+                lines.append(f"  {label} ... {len(keys) - limit} more")
+        return "\n".join(lines)
+
+
+def sync_table(table, desired_items, key_name, dry_run=False, prune=False, preserve_fields=()):
+    """
+    Write the `desired_items` (an iterable of dicts) that differ from the
+    table. prune=True also deletes keys not in desired_items, so the table
+    ends up containing exactly that set. `preserve_fields` are runtime-owned:
+    ignored in the diff and carried over on writes. Returns a SyncReport.
+    """
+    current = scan_hashes(table, key_name, preserve_fields)
+    report = SyncReport(getattr(table, "name", "table"), dry_run)
+    seen = set()
+
+    def _apply(batch):
+        for item in desired_items:
+            key = item[key_name]
+            if key in seen:
+                raise ValueError(f"Duplicate {key_name} in desired items: {key}")
+            seen.add(key)
+            old_hash, preserved = current.pop(key, (None, {}))
+            if old_hash == content_hash(item, preserve_fields):
+                report.unchanged += 1
+                continue
+            (report.added if old_hash is None else report.changed).append(key)
+            if batch is not None:
+                batch.put_item(Item=dict(to_dynamo(item), **preserved))
+
+        # Jo keys desired set mein nahi aayi, woh table se hatao (sirf prune par)
+        if not prune:
+            return
+        for key in current:
+            report.deleted.append(key)
+            if batch is not None:
+                batch.delete_item(Key={key_name: key})
+
+    if dry_run:
+        _apply(None)
+    else:
+        with table.batch_writer(overwrite_by_pkeys=[key_name]) as batch:
+            _apply(batch)
+    return report
@@ -0,0 +1,247 @@
+"""
+HTTP conditional requests + compression for catalog endpoints.
+
+    flight_responses = ResponseCache("flights")
+    ...
+    entry = flight_responses.get(key)
+    if entry is None:
+        entry = flight_responses.put(key, {"flights": results}, ttl)
+    return json_response(entry, "public, max-age=60")
+
+- Body ek baar serialize hota hai (sort_keys, Flask jsonify jaisa); ETag us
+  body ka content hash hai, isliye har worker / har task same data par same
+  ETag deta hai. If-None-Match match -> 304, koi serialization nahi.
+- gzip / brotli (brotli package installed ho to) Accept-Encoding se; body
+  COMPRESS_MIN_BYTES se chhota ho to compress nahi hota. Compressed bytes
+  bhi entry par memo hote hain -> repeat searches par compression CPU nahi.
+- ETag weak (W/"...") hai kyunki ek hi representation ke gzip/br/identity
+  variants same ETag share karte hain; Vary: Accept, Accept-Encoding hamesha set hai.
+- MessagePack (service-to-service): `Accept: application/msgpack` par body
+  msgpack mein, seedha payload (DynamoDB Decimal bhi) se encode hoti hai --
+  JSON round-trip nahi. Pehli msgpack request par ek baar pack + memo; apna
+  ETag (alag representation). msgpack package na ho to hamesha JSON.
+
+Memo in-process hai aur RESPONSE_MEMO_TTL (60s) se zyada nahi rehta, taaki
+shared data cache (sqlite/redis) ke upar staleness thodi hi badhe. Expired
+entries LRU se nikalne tak rehti hain: get(key, allow_stale=True) overload
+par (travelease_common.admission) stale response ke liye.
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from travelease_common.cache import _json_default
+from travelease_common.debug import span
+
+COMPRESS_MIN_BYTES = int(os.environ.get("COMPRESS_MIN_BYTES", 1024))
+RESPONSE_MEMO_TTL = 60
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # dynamic content ke liye 11 bahut slow hai
+MSGPACK = "application/msgpack"
+MSGPACK_TYPES = (MSGPACK, "application/x-msgpack")
+
+
+def pack(payload):
+    """MessagePack bytes; Decimal -> int / float (JSON body jaisa hi)."""
+    return msgpack.packb(payload, default=_json_default, use_bin_type=True)
+
+
+def decode_body(data, content_type):
+    """Decode a JSON or MessagePack response body by its Content-Type."""
+    media = (content_type or "").split(";", 1)[0].strip().lower()
+    if media in MSGPACK_TYPES and msgpack is not None:
+        return msgpack.unpackb(data, raw=False)
+    return json.loads(data)
+
+
+def _etag(body):
+    return f'W/"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+
+
+class ResponseEntry:
+    """A serialized JSON body, its ETag and lazily packed / compressed variants."""
+
+    def __init__(self, payload, expires_at):
+        with span("serialize"):
+            self.body = json.dumps(payload, default=_json_default, sort_keys=True,
+                                   separators=(",", ":")).encode("utf-8")
+        self.etag = _etag(self.body)
+        self.expires_at = expires_at
+        self._payload = payload if msgpack is not None else None
+        self._packed = None  # (body, etag)
+        self._encoded = {}
+
+    def representation(self, media="json"):
+        """(body, etag) for "json" or "msgpack"; msgpack is packed on first use."""
+        if media == "json":
+            return self.body, self.etag
+        if self._packed is None:
+            with span("serialize.msgpack"):
+                body = pack(self._payload)
+            self._packed = (body, _etag(body))
+        return self._packed
+
+    def encoded(self, encoding, media="json"):
+        """Body for a Content-Encoding (None = identity), compressed once."""
+        body = self.representation(media)[0]
+        if encoding is None:
+            return body
+        data = self._encoded.get((media, encoding))
+        if data is None:
+            with span(f"compress.{encoding}"):
+                if encoding == "br":
+                    data = brotli.compress(body, quality=BROTLI_QUALITY)
+                else:
+                    data = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+            self._encoded[(media, encoding)] = data
+        return data
+
+
+class ResponseCache:
+    """In-process LRU of ResponseEntry objects (per endpoint)."""
+
+    def __init__(self, namespace, max_items=1024):
+        self.namespace = namespace
+        self.max_items = max_items
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, allow_stale=False):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or (entry.expires_at < time.time() and not allow_stale):
+                return None
+            self._data.move_to_end(key)
+            return entry
+
+    def put(self, key, payload, ttl):
+        entry = ResponseEntry(payload, time.time() + min(ttl, RESPONSE_MEMO_TTL))
+        with self._lock:
+            self._data[key] = entry
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_items:
+                self._data.popitem(last=False)
+        return entry
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+
+# ------------------------
+# NEGOTIATION
+# ------------------------
+def etag_matches(if_none_match, etag):
+    """Weak comparison (RFC 9110 13.1.2): W/ prefix ignore hota hai."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if (candidate[2:] if candidate.startswith("W/") else candidate) == opaque:
+            return True
+    return False
+
+
+def _q_values(header):
+    """{lowercase token: q} for an Accept / Accept-Encoding header."""
+    accepted = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            param = param.strip()
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        accepted[name.strip().lower()] = q
+    return accepted
+
+
+def wants_msgpack(accept):
+    """
+    True if the Accept header names MessagePack at least as strongly as
+    JSON. Wildcards (*/* -- browsers) JSON hi paate hain.
+    """
+    if msgpack is None or not accept:
+        return False
+    accepted = _q_values(accept)
+    q = max(accepted.get(media, 0.0) for media in MSGPACK_TYPES)
+    return q > 0 and q >= accepted.get("application/json", 0.0)
+
+
+def choose_encoding(accept_encoding, size):
+    """'br', 'gzip' or None for this Accept-Encoding header and body size."""
+    if size < COMPRESS_MIN_BYTES or not accept_encoding:
+        return None
+    accepted = _q_values(accept_encoding)
+    for encoding in ("br", "gzip"):
+        if encoding == "br" and brotli is None:
+            continue
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def conditional(entry, if_none_match, accept_encoding, cache_control, accept=None):
+    """Framework-agnostic core: returns (status, body bytes, headers dict)."""
+    media = "msgpack" if wants_msgpack(accept) else "json"
+    body, etag = entry.representation(media)
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept, Accept-Encoding"}
+    if etag_matches(if_none_match, etag):
+        return 304, b"", headers
+    encoding = choose_encoding(accept_encoding, len(body))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    headers["Content-Type"] = MSGPACK if media == "msgpack" else "application/json"
+    return 200, entry.encoded(encoding, media), headers
+
+
+def json_response(entry, cache_control, conditional_ok=True):
+    """
+    Flask response for an entry. conditional_ok=False (POST jaise unsafe
+    methods) -> If-None-Match ignore, sirf compression + ETag.
+    """
+    from flask import Response, request
+
+    status, body, headers = conditional(
+        entry,
+        request.headers.get("If-None-Match") if conditional_ok else None,
+        request.headers.get("Accept-Encoding"),
+        cache_control,
+        request.headers.get("Accept"),
+    )
+    return Response(body, status=status, headers=headers)
+
+
+def negotiated_response(payload, status=200):
+    """Uncached Flask response (e.g. POST /book): MessagePack if asked for, else jsonify."""
+    from flask import Response, jsonify, request
+
+    if wants_msgpack(request.headers.get("Accept")):
+        return Response(pack(payload), status=status, mimetype=MSGPACK, headers={"Vary": "Accept"})
+    response = jsonify(payload)
+    response.status_code = status
+    response.headers["Vary"] = "Accept"
+    return response
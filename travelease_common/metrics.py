@@ -0,0 +1,269 @@
+"""
+Shared Prometheus instrumentation for all services.
+
+    metrics = init_metrics(app, "flight")          # Flask: per-route histograms + /metrics
+    table = instrument_boto3(boto3.resource(...))   # DynamoDB call histograms
+    with track_dependency("smtp", "send"): ...      # koi bhi external call
+    track_cache(flight_cache)                       # hit/miss/ratio at scrape time
+    record_shed("dynamodb", "concurrency")          # travelease_common.admission se
+
+Metrics:
+- travelease_http_request_duration_seconds{service,method,route,status}
+  (route = Flask rule jaise /api/crowdpulse/<string:city_code>, raw path nahi
+  -> bounded cardinality)
+- travelease_http_requests_in_flight{service}
+- travelease_dependency_duration_seconds{service,dependency,operation,outcome}
+- travelease_dependency_in_flight{service,dependency}
+- travelease_cache_hits_total / _misses_total / _hit_ratio{service,namespace}
+- travelease_admission_rejected_total{service,scope,reason}
+  (scope = global | client | dependency name; reason = rate | concurrency)
+- travelease_admission_limit{service,scope,kind}  (configured limits; livesum
+  -> multi-worker mein per-task value)
+- travelease_stale_responses_total{service,namespace}
+
+Per-request overhead: label children pehli baar ke baad dict se milte hain;
+cache metrics request path par kuch nahi karte (Cache.stats() scrape par
+padha jata hai).
+
+gunicorn multi-worker: PROMETHEUS_MULTIPROC_DIR set ho to /metrics saare
+workers ka aggregate deta hai (travelease_common.serving isko set karta hai).
+Har dependency call current request ka span bhi banta hai
+(travelease_common.debug slow requests ke breakdown ke liye).
+
+prometheus_client installed na ho to metrics no-op hain (spans phir bhi).
+"""
+import os
+import time
+from contextlib import contextmanager
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+    )
+    from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, REGISTRY
+except ImportError:
+    Histogram = None
+
+from travelease_common.debug import add_span, span
+
+SERVICE = os.environ.get("SERVICE_NAME", "unknown")
+MULTIPROC = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+# Latency buckets: 1 ms .. 10 s (dependency calls aur requests dono ke liye)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+if Histogram is not None:
+    REQUEST_LATENCY = Histogram(
+        "travelease_http_request_duration_seconds", "HTTP request latency by route",
+        ["service", "method", "route", "status"], buckets=BUCKETS)
+    REQUESTS_IN_FLIGHT = Gauge(
+        "travelease_http_requests_in_flight", "Requests currently being served",
+        ["service"], multiprocess_mode="livesum")
+    DEPENDENCY_LATENCY = Histogram(
+        "travelease_dependency_duration_seconds", "Latency of calls to external dependencies",
+        ["service", "dependency", "operation", "outcome"], buckets=BUCKETS)
+    DEPENDENCY_IN_FLIGHT = Gauge(
+        "travelease_dependency_in_flight", "External calls currently in progress",
+        ["service", "dependency"], multiprocess_mode="livesum")
+    ADMISSION_REJECTED = Counter(
+        "travelease_admission_rejected", "Requests / dependency calls shed by admission control",
+        ["service", "scope", "reason"])
+    ADMISSION_LIMIT = Gauge(
+        "travelease_admission_limit", "Configured admission limits (rps, concurrency)",
+        ["service", "scope", "kind"], multiprocess_mode="livesum")
+    STALE_RESPONSES = Counter(
+        "travelease_stale_responses", "Stale responses served instead of shedding",
+        ["service", "namespace"])
+
+_children = {}
+_caches = []
+
+
+def _child(metric, *labels):
+    # labels() har baar lock + validation karta hai; children yahan cache hote hain
+    key = (metric, labels)
+    child = _children.get(key)
+    if child is None:
+        child = _children[key] = metric.labels(*labels)
+    return child
+
+
+# ------------------------
+# DEPENDENCIES
+# ------------------------
+@contextmanager
+def track_dependency(dependency, operation):
+    """Time one external call (outcome=error if the block raises)."""
+    if Histogram is None:
+        with span(f"{dependency}.{operation}"):
+            yield
+        return
+    in_flight = _child(DEPENDENCY_IN_FLIGHT, SERVICE, dependency)
+    in_flight.inc()
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        elapsed = time.perf_counter() - start
+        _child(DEPENDENCY_LATENCY, SERVICE, dependency, operation, outcome).observe(elapsed)
+        in_flight.dec()
+        add_span(f"{dependency}.{operation}", elapsed)
+
+
+def instrument_boto3(client_or_resource, dependency="dynamodb"):
+    """
+    Hook botocore events so every API call (Query, PutItem, ...) is timed
+    (histogram + request span).
+    Accepts a client or a resource (uses resource.meta.client). Returns it.
+    """
+    client = getattr(getattr(client_or_resource, "meta", None), "client", client_or_resource)
+
+    def _before(context, model, **kwargs):
+        context["travelease_call"] = (model.name, time.perf_counter())
+        if Histogram is not None:
+            _child(DEPENDENCY_IN_FLIGHT, SERVICE, dependency).inc()
+
+    def _after(context, outcome):
+        call = context.pop("travelease_call", None)
+        if call is None:
+            return
+        operation, start = call
+        elapsed = time.perf_counter() - start
+        add_span(f"{dependency}.{operation}", elapsed)
+        if Histogram is not None:
+            _child(DEPENDENCY_IN_FLIGHT, SERVICE, dependency).dec()
+            _child(DEPENDENCY_LATENCY, SERVICE, dependency, operation, outcome).observe(elapsed)
+
+    def _after_call(http_response, context, **kwargs):
+        _after(context, "ok" if http_response.status_code < 400 else "error")
+
+    def _after_error(context, **kwargs):
+        # Network/timeout errors (after-call-error ke saath model nahi aata)
+        _after(context, "error")
+
+    events = client.meta.events
+    events.register("before-call.*.*", _before)
+    events.register("after-call.*.*", _after_call)
+    events.register("after-call-error.*.*", _after_error)
+    return client_or_resource
+
+
+# ------------------------
+# ADMISSION CONTROL
+# ------------------------
+def record_shed(scope, reason):
+    if Histogram is not None:
+        _child(ADMISSION_REJECTED, SERVICE, scope, reason).inc()
+
+
+def record_limit(scope, kind, value):
+    if Histogram is not None:
+        _child(ADMISSION_LIMIT, SERVICE, scope, kind).set(value)
+
+
+def record_stale(namespace):
+    if Histogram is not None:
+        _child(STALE_RESPONSES, SERVICE, namespace).inc()
+
+
+# ------------------------
+# CACHES
+# ------------------------
+class _CacheCollector:
+    def collect(self):
+        hits = CounterMetricFamily("travelease_cache_hits", "Cache hits", labels=self._labels())
+        misses = CounterMetricFamily("travelease_cache_misses", "Cache misses", labels=self._labels())
+        ratio = GaugeMetricFamily("travelease_cache_hit_ratio", "Cache hit ratio since start",
+                                  labels=self._labels())
+        for cache in _caches:
+            stats = cache.stats()
+            labels = [SERVICE, stats["namespace"]] + ([str(os.getpid())] if MULTIPROC else [])
+            hits.add_metric(labels, stats["hits"])
+            misses.add_metric(labels, stats["misses"])
+            ratio.add_metric(labels, stats["hit_ratio"])
+        return [hits, misses, ratio]
+
+    @staticmethod
+    def _labels():
+        # Multi-worker mein har worker ka apna in-process cache -> pid label
+        return ["service", "namespace"] + (["pid"] if MULTIPROC else [])
+
+
+_cache_collector = None
+
+
+def track_cache(cache):
+    """Export a travelease_common.cache.Cache's hit/miss counters."""
+    global _cache_collector
+    if Histogram is None:
+        return cache
+    _caches.append(cache)
+    if _cache_collector is None:
+        _cache_collector = _CacheCollector()
+        REGISTRY.register(_cache_collector)
+    return cache
+
+
+# ------------------------
+# HTTP (FLASK)
+# ------------------------
+def render_metrics():
+    """(body, content_type) for a /metrics response."""
+    if MULTIPROC:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        if _cache_collector is not None:
+            registry.register(_cache_collector)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def request_started():
+    """Call at request start; returns the token for request_finished()."""
+    if Histogram is None:
+        return None
+    _child(REQUESTS_IN_FLIGHT, SERVICE).inc()
+    return time.perf_counter()
+
+
+def request_finished(start, method, route, status):
+    if start is None:
+        return
+    _child(REQUESTS_IN_FLIGHT, SERVICE).dec()
+    _child(REQUEST_LATENCY, SERVICE, method, route, str(status)).observe(time.perf_counter() - start)
+
+
+def init_metrics(app, service):
+    """Per-route latency histograms, in-flight gauge and GET /metrics for a Flask app."""
+    global SERVICE
+    SERVICE = service
+    if Histogram is None:
+        print(f"prometheus_client not installed; metrics disabled for {service}.")
+        return None
+
+    from flask import Response, request
+
+    @app.before_request
+    def _start_timer():
+        request.environ["travelease.start"] = request_started()
+
+    @app.after_request
+    def _record_status(response):
+        request.environ["travelease.status"] = response.status_code
+        return response
+
+    @app.teardown_request
+    def _observe(exc):
+        start = request.environ.pop("travelease.start", None)
+        rule = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+        status = 500 if exc is not None else request.environ.get("travelease.status", 500)
+        request_finished(start, request.method, rule, status)
+
+    @app.route("/metrics")
+    def metrics():
+        body, content_type = render_metrics()
+        return Response(body, content_type=content_type)
+
+    return app
@@ -0,0 +1,136 @@
+"""
+Local Redis-protocol stand-in for tests, benchmarks and local dev.
+
+Supports the commands RedisCache uses (PING, GET, SET [EX|PX], DEL, EXISTS,
+INCR, FLUSHDB, SELECT, AUTH, DBSIZE). Not for production.
+
+    python -m travelease_common.resp_server --port 6379
+
+or in-process:
+
+    server = start_resp_server(port=0)   # random free port
+    url = f"redis://127.0.0.1:{server.server_address[1]}/0"
+    ...
+    server.shutdown()
+"""
+import argparse
+import socketserver
+import threading
+import time
+
+
+class _Store:
+    def __init__(self):
+        self.data = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at < time.time():
+            self.data.pop(key, None)
+            return None
+        return value
+
+
+class _RespHandler(socketserver.StreamRequestHandler):
+
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            return line.strip().split()  # inline command (e.g. from telnet)
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def _reply(self, value):
+        if value is None:
+            data = b"$-1\r\n"
+        elif isinstance(value, bool):
+            data = b"+OK\r\n"
+        elif isinstance(value, int):
+            data = b":%d\r\n" % value
+        elif isinstance(value, Exception):
+            data = f"-ERR {value}\r\n".encode()
+        elif isinstance(value, str):
+            data = f"+{value}\r\n".encode()
+        else:
+            data = b"$%d\r\n%s\r\n" % (len(value), value)
+        self.wfile.write(data)
+
+    def handle(self):
+        store = self.server.store
+        while True:
+            try:
+                args = self._read_command()
+            except (ConnectionError, ValueError):
+                return
+            if not args:
+                return
+            cmd = args[0].upper()
+            with store.lock:
+                try:
+                    self._reply(self._dispatch(store, cmd, args[1:]))
+                except Exception as e:
+                    self._reply(e)
+
+    def _dispatch(self, store, cmd, args):
+        if cmd == b"PING":
+            return "PONG"
+        if cmd in (b"SELECT", b"AUTH"):
+            return True
+        if cmd == b"GET":
+            return store.get(args[0])
+        if cmd == b"SET":
+            expires_at = None
+            if len(args) >= 4:
+                unit = args[2].upper()
+                seconds = int(args[3]) if unit == b"EX" else int(args[3]) / 1000.0
+                expires_at = time.time() + seconds
+            store.data[args[0]] = (args[1], expires_at)
+            return True
+        if cmd == b"DEL":
+            return sum(1 for key in args if store.data.pop(key, None) is not None)
+        if cmd == b"EXISTS":
+            return sum(1 for key in args if store.get(key) is not None)
+        if cmd == b"INCR":
+            value = int(store.get(args[0]) or 0) + 1
+            store.data[args[0]] = (str(value).encode(), None)
+            return value
+        if cmd == b"DBSIZE":
+            return len(store.data)
+        if cmd == b"FLUSHDB":
+            store.data.clear()
+            return True
+        raise ValueError(f"unknown command '{cmd.decode(errors='replace')}'")
+
+
+class RespServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address):
+        super().__init__(address, _RespHandler)
+        self.store = _Store()
+
+
+def start_resp_server(host="127.0.0.1", port=0):
+    """Start the stand-in on a background thread and return the server."""
+    server = RespServer((host, port))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Redis-protocol stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+    print(f"RESP stand-in listening on {args.host}:{args.port}")
+    RespServer((args.host, args.port)).serve_forever()
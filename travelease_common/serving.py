@@ -0,0 +1,282 @@
+"""
+Production serving launcher shared by all services.
+
+    python -m travelease_common.serving flight      # booking / payment / crowdpulse
+
+Flask ka app.run() single-process dev server hai. Yeh launcher gunicorn ko
+per-service config ke saath chalata hai:
+
+- worker class: sync | threaded (gthread) | gevent  (gevent na ho to threaded)
+- workers: container ke CPUs se (cgroup quota respect hota hai); payment aur
+  crowdpulse single_worker hain (in-process ledger / sentiment history)
+- preload, keep-alive (ALB idle timeout se zyada), graceful shutdown (ECS
+  SIGTERM -> stopTimeout ke andar)
+
+Env overrides: WORKER_CLASS, WEB_CONCURRENCY, THREADS, WORKER_CONNECTIONS,
+PRELOAD, KEEPALIVE, TIMEOUT, GRACEFUL_TIMEOUT, PORT.
+
+boto3 clients/resources processes ke beech share nahi hone chahiye --
+services unhe fork_safe() se banati hain: har worker process pehli use par
+apna object banata hai (preload ke saath bhi).
+
+Prometheus: workers > 1 par PROMETHEUS_MULTIPROC_DIR (unset ho to temp dir)
+set hota hai taaki /metrics saare workers ka aggregate de; worker exit par
+uski live gauges hata di jati hain.
+
+Warm-up (travelease_common.startup): har worker post_worker_init mein, yaani
+connections accept karne se pehle, boto3 clients / pooled connections /
+lazy imports ready karta hai -> ALB health check warm worker hi dekhta hai.
+
+gunicorn installed na ho (e.g. Windows dev box) to app.run() par fallback.
+"""
+import argparse
+import glob
+import importlib
+import importlib.util
+import logging
+import math
+import os
+import sys
+import tempfile
+import threading
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:
+    BaseApplication = None
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# service -> module, source dir (repo checkout mein), port, default worker class
+SERVICES = {
+    # DynamoDB I/O bound -> threads
+    "flight": {"module": "Flight_Service_App", "dir": "Flight_Service", "port": 5002,
+               "worker_class": "threaded"},
+    # DynamoDB + SMTP (slow) -> threads, zyada
+    "booking": {"module": "Booking_Service_App", "dir": "Booking_Service", "port": 5000,
+                "worker_class": "threaded", "threads": 16},
+    # Idempotency ledger process ke andar hai -> ek hi worker (WEB_CONCURRENCY
+    # ignore), threads se concurrency; ledger thread-safe hai
+    "payment": {"module": "Payment_Service_App", "dir": "Payment_Service", "port": 5003,
+                "worker_class": "threaded", "single_worker": True},
+    # YouTube I/O -> threads; sentiment history (SENTIMENT_HISTORY) process ke
+    # andar ring buffers hain -> ek hi worker, warna har worker ka alag trend
+    "crowdpulse": {"module": "crowdpulse_app", "dir": os.path.join("CrowdPulse", "backend"), "port": 5010,
+                   "worker_class": "threaded", "threads": 16, "single_worker": True},
+}
+
+WORKER_CLASSES = {"sync": "sync", "threaded": "gthread", "gevent": "gevent"}
+DEFAULT_THREADS = 8
+DEFAULT_KEEPALIVE = 75         # ALB idle timeout (60s) se zyada -> ALB ko 502 nahi milta
+DEFAULT_TIMEOUT = 60
+DEFAULT_GRACEFUL_TIMEOUT = 25  # ECS stopTimeout (30s) ke andar
+
+
+# ------------------------
+# FORK SAFETY
+# ------------------------
+class _ForkSafe:
+    """Proxy that builds its object lazily, once per process."""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._pid = None
+        self._obj = None
+        self._lock = threading.Lock()
+
+    def _get(self):
+        pid = os.getpid()
+        if self._pid != pid:
+            with self._lock:
+                if self._pid != pid:
+                    self._obj = self._factory()
+                    self._pid = pid
+        return self._obj
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+
+def fork_safe(factory):
+    """
+    Wrap a boto3 client/resource factory: each (forked) worker process gets
+    its own instance on first use, nothing is shared with the master.
+
+        bookings_table = fork_safe(lambda: boto3.resource("dynamodb").Table("BookingsDB"))
+    """
+    return _ForkSafe(factory)
+
+
+# ------------------------
+# CONFIG
+# ------------------------
+def available_cpus():
+    """CPUs this container may use (cgroup quota, affinity, then cpu_count)."""
+    quota = None
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:  # cgroup v2
+            limit, period = f.read().split()[:2]
+            if limit != "max":
+                quota = int(limit) / int(period)
+    except (OSError, ValueError):
+        try:  # cgroup v1
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+                limit = int(f.read())
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+                period = int(f.read())
+            if limit > 0:
+                quota = limit / period
+        except (OSError, ValueError):
+            pass
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    if quota:
+        cpus = min(cpus, max(1, math.ceil(quota)))
+    return cpus
+
+
+def _env_bool(name, default):
+    value = os.environ.get(name)
+    return default if value is None else value.lower() in ("1", "true", "yes")
+
+
+def resolve_worker_class(name):
+    name = name.lower()
+    if name not in WORKER_CLASSES:
+        raise ValueError(f"Unknown worker class '{name}' (use one of: {', '.join(WORKER_CLASSES)})")
+    if name == "gevent":
+        try:
+            import gevent  # noqa: F401
+        except ImportError:
+            logging.warning("gevent not installed; falling back to threaded workers.")
+            name = "threaded"
+    return name
+
+
+def gunicorn_options(service):
+    """Gunicorn settings for a service, with env overrides applied."""
+    config = SERVICES[service]
+    worker_class = resolve_worker_class(os.environ.get("WORKER_CLASS", config["worker_class"]))
+    cpus = available_cpus()
+    # sync: har worker ek request -> 2n+1; threaded/gevent: concurrency threads/greenlets se
+    default_workers = 2 * cpus + 1 if worker_class == "sync" else max(2, cpus)
+
+    workers = int(os.environ.get("WEB_CONCURRENCY", default_workers))
+    if config.get("single_worker") and workers != 1:
+        if "WEB_CONCURRENCY" in os.environ:
+            logging.warning(f"{service} keeps in-process state; ignoring WEB_CONCURRENCY={workers}, using 1 worker.")
+        workers = 1
+
+    options = {
+        "bind": f"0.0.0.0:{int(os.environ.get('PORT', config['port']))}",
+        "workers": workers,
+        "worker_class": WORKER_CLASSES[worker_class],
+        "preload_app": _env_bool("PRELOAD", True),
+        "keepalive": int(os.environ.get("KEEPALIVE", DEFAULT_KEEPALIVE)),
+        "timeout": int(os.environ.get("TIMEOUT", DEFAULT_TIMEOUT)),
+        "graceful_timeout": int(os.environ.get("GRACEFUL_TIMEOUT", DEFAULT_GRACEFUL_TIMEOUT)),
+        "accesslog": None,
+        "errorlog": "-",
+    }
+    if worker_class == "threaded":
+        options["threads"] = int(os.environ.get("THREADS", config.get("threads", DEFAULT_THREADS)))
+    elif worker_class == "gevent":
+        options["worker_connections"] = int(os.environ.get("WORKER_CONNECTIONS", 1000))
+    return options
+
+
+def prepare_metrics_dir(workers):
+    """
+    Multi-worker: har worker apni metric files PROMETHEUS_MULTIPROC_DIR mein
+    likhta hai. prometheus_client ke pehle import se pehle set hona chahiye
+    (value storage wahi tay hota hai) -- isliye yahan import nahi hota.
+    """
+    if workers <= 1 or importlib.util.find_spec("prometheus_client") is None:
+        return None
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not path:
+        path = os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="travelease-metrics-")
+    os.makedirs(path, exist_ok=True)
+    # Pichhle run ki files (purane pids) counters ko galat aggregate karti hain
+    for stale in glob.glob(os.path.join(path, "*.db")):
+        os.remove(stale)
+    return path
+
+
+def _child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def _post_worker_init(worker):
+    # Lazy import: prometheus_client (metrics ke through) multiproc dir set hone ke baad hi
+    from travelease_common.startup import warm_up
+    warm_up()
+
+
+def load_app(service):
+    """Import the service's Flask app (repo checkout ya Docker /app dono se)."""
+    config = SERVICES[service]
+    source_dir = os.path.join(REPO_DIR, config["dir"])
+    if os.path.isdir(source_dir) and source_dir not in sys.path:
+        sys.path.insert(0, source_dir)
+    return importlib.import_module(config["module"]).app
+
+
+# ------------------------
+# LAUNCHER
+# ------------------------
+if BaseApplication is not None:
+    class GunicornApp(BaseApplication):
+        def __init__(self, service, options):
+            self.service = service
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return load_app(self.service)
+
+
+def serve(service):
+    options = gunicorn_options(service)
+    if BaseApplication is None:
+        logging.warning("gunicorn not installed; using Flask's single-process dev server.")
+        host, port = options["bind"].rsplit(":", 1)
+        app = load_app(service)
+        from travelease_common.startup import warm_up
+        warm_up()
+        app.run(host=host, port=int(port), threaded=True)
+        return
+    prepare_metrics_dir(options["workers"])
+    # travelease_common.admission task-level rate limits workers mein baantta hai
+    os.environ["TRAVELEASE_WORKERS"] = str(options["workers"])
+    options["child_exit"] = _child_exit
+    options["post_worker_init"] = _post_worker_init
+    print(f"[serve] {service}: {options['workers']} x {options['worker_class']} workers"
+          f"{' x %d threads' % options['threads'] if 'threads' in options else ''} on {options['bind']}",
+          flush=True)
+    GunicornApp(service, options).run()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a TravelEase service with production workers")
+    parser.add_argument("service", choices=sorted(SERVICES))
+    parser.add_argument("--print-config", action="store_true", help="Show the resolved settings and exit")
+    args = parser.parse_args(argv)
+
+    if args.print_config:
+        for key, value in sorted(gunicorn_options(args.service).items()):
+            print(f"{key:18s} {value}")
+        return
+    serve(args.service)
+
+
+if __name__ == "__main__":
+    main()
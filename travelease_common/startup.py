@@ -0,0 +1,168 @@
+"""
+Fast cold start: lazy heavy imports, tuned DynamoDB clients, warm-up.
+
+    discovery = lazy_import("googleapiclient.discovery")   # import pehli attribute access par
+    analyzer = lazy(SentimentIntensityAnalyzer)             # object pehli use par (thread-safe)
+    dynamodb = fork_safe(dynamodb_resource)                 # pooled, keep-alive, adaptive retries
+    register_warmup("dynamodb", lambda: warm_dynamodb(table, {"flight_id": WARMUP_KEY}))
+
+warm_up() registered steps chalata hai (har process mein ek baar):
+- gunicorn: travelease_common.serving post_worker_init hook se, yaani worker
+  connections accept karne se pehle -> ALB health check (/ping) tabhi pass
+  hota hai jab kam se kam ek worker ke clients aur connections ready hon.
+- dev server (app.run) aur ASGI lifespan startup bhi isse call karte hain.
+
+Warm-up fail ho (e.g. DynamoDB down) to sirf log hota hai; service phir bhi
+start hoti hai aur first request wahi kaam karti hai jo pehle karti thi.
+
+DynamoDB client config (env):
+  DYNAMODB_MAX_POOL        pooled HTTP connections per process (default 32,
+                           botocore default 10 < booking ke 16 threads)
+  DYNAMODB_MAX_ATTEMPTS    adaptive retry attempts (default 5; throttling par
+                           client-side rate limiting bhi)
+  DYNAMODB_WARM_CONNECTIONS  warm-up par kitne connections pehle se kholne (4)
+  AWS_REGION / AWS_DEFAULT_REGION (default eu-north-1), DYNAMODB_ENDPOINT_URL
+"""
+import importlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from travelease_common.admission import guard_boto3
+from travelease_common.metrics import instrument_boto3
+
+WARMUP_KEY = "__warmup__"
+DEFAULT_REGION = "eu-north-1"
+
+_UNSET = object()
+_warmups = []  # (name, func)
+_warm_lock = threading.Lock()
+_warmed_pid = None
+
+
+# ------------------------
+# LAZY IMPORTS / OBJECTS
+# ------------------------
+class _LazyModule:
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+def lazy_import(name):
+    """Module proxy: the real import happens on first attribute access."""
+    return _LazyModule(name)
+
+
+class _Lazy:
+    """Builds its object once, on first use (thread-safe)."""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._obj = _UNSET  # factory None bhi lauta sakti hai (e.g. no API key)
+        self._lock = threading.Lock()
+
+    def get(self):
+        if self._obj is _UNSET:
+            with self._lock:
+                if self._obj is _UNSET:
+                    self._obj = self._factory()
+        return self._obj
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+
+def lazy(factory):
+    """
+    Like fork_safe(), but one object for the whole process tree: gunicorn
+    preload ke saath master mein bana object workers COW se share karte hain.
+    Sirf fork-safe objects ke liye (no sockets / threads).
+    """
+    return _Lazy(factory)
+
+
+# ------------------------
+# DYNAMODB
+# ------------------------
+def dynamodb_config():
+    from botocore.config import Config
+
+    return Config(
+        max_pool_connections=int(os.environ.get("DYNAMODB_MAX_POOL", 32)),
+        retries={"mode": "adaptive", "max_attempts": int(os.environ.get("DYNAMODB_MAX_ATTEMPTS", 5))},
+        tcp_keepalive=True,
+        connect_timeout=2,
+        read_timeout=5,
+    )
+
+
+def dynamodb_resource():
+    """
+    Tuned, instrumented boto3 DynamoDB resource, behind the "dynamodb"
+    admission guard (travelease_common.admission). Clients are thread-safe;
+    Table actions are stateless wrappers over the client, so one resource
+    per process is shared by all request threads (warm-up loads the models
+    before traffic so concurrent first calls don't race on lazy loading).
+    """
+    import boto3
+
+    region = os.environ.get("AWS_REGION") or os.environ.get("AWS_DEFAULT_REGION") or DEFAULT_REGION
+    resource = boto3.resource(
+        "dynamodb", region_name=region, endpoint_url=os.environ.get("DYNAMODB_ENDPOINT_URL"),
+        config=dynamodb_config(),
+    )
+    # Guard pehle register: rejected call ke liye instrument ke handlers chalte hi nahi
+    return instrument_boto3(guard_boto3(resource))
+
+
+def warm_dynamodb(table, key):
+    """
+    GetItem on a key that does not exist, from several threads at once:
+    service models load ho jate hain aur pool mein TLS connections khul
+    jati hain. (GetItem task role ke IAM policy mein hai; DescribeTable nahi.)
+    """
+    connections = int(os.environ.get("DYNAMODB_WARM_CONNECTIONS", 4))
+    table.get_item(Key=key)  # models + pehla connection (sequential, race nahi)
+    if connections > 1:
+        with ThreadPoolExecutor(max_workers=connections) as pool:
+            list(pool.map(lambda _: table.get_item(Key=key), range(connections)))
+
+
+# ------------------------
+# WARM-UP
+# ------------------------
+def register_warmup(name, func):
+    _warmups.append((name, func))
+    return func
+
+
+def warm_up():
+    """Run every registered warm-up step once per process. Returns {name: seconds}."""
+    global _warmed_pid
+    with _warm_lock:
+        if _warmed_pid == os.getpid():
+            return {}
+        timings = {}
+        for name, func in _warmups:
+            start = time.perf_counter()
+            try:
+                func()
+            except Exception as e:
+                logging.warning(f"[startup] warm-up '{name}' failed: {e}")
+            timings[name] = time.perf_counter() - start
+        _warmed_pid = os.getpid()
+    if timings:
+        print(f"[startup] pid {os.getpid()} warmed: "
+              + ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in timings.items()), flush=True)
+    return timings
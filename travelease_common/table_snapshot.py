@@ -0,0 +1,214 @@
+"""
+Compressed DynamoDB table snapshots (export / import) for warm starts.
+
+Format: gzip NDJSON, ek line per item, DynamoDB JSON mein
+({"Item": {"price": {"N": "22000"}, ...}}) -- wahi format jo AWS ka S3
+export use karta hai (binary B/BS base64 mein), isliye types lossless
+round-trip hote hain.
+
+Export ek parallel segmented Scan hai (har segment ka apna thread aur
+boto3 client); import BatchWriteItem ko thread pool se chalata hai.
+
+    python -m travelease_common.table_snapshot export TravelEase-Flights -o flights.ndjson.gz --segments 8
+    python -m travelease_common.table_snapshot import TravelEase-Flights -i flights.ndjson.gz
+
+Services snapshot se boot kar sakte hain (FLIGHTS_SNAPSHOT / SMART_TRIPS_SNAPSHOT
+env) -- iter_snapshot_items() plain Python dicts deta hai (numbers Decimal).
+"""
+import argparse
+import base64
+import gzip
+import json
+import os
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+from boto3.dynamodb.types import TypeDeserializer
+
+TABLES = ("TravelEase-Flights", "SmartTripsDB", "BookingsDB")
+BATCH_SIZE = 25
+MAX_RETRIES = 8
+
+
+def _client(region=None, endpoint_url=None):
+    # boto3 clients ek session per thread -> har worker naya session banata hai
+    return boto3.session.Session().client("dynamodb", region_name=region, endpoint_url=endpoint_url)
+
+
+def _open(path, mode, gzipped):
+    if gzipped:
+        return gzip.open(path, mode + "t", encoding="utf-8", compresslevel=6)
+    return open(path, mode, encoding="utf-8")
+
+
+def _encode_value(value):
+    """Low-level attribute value -> JSON-safe (bytes -> base64, like the S3 export)."""
+    (kind, v), = value.items()
+    if kind == "B":
+        return {"B": base64.b64encode(v).decode("ascii")}
+    if kind == "BS":
+        return {"BS": [base64.b64encode(b).decode("ascii") for b in v]}
+    if kind == "M":
+        return {"M": {k: _encode_value(x) for k, x in v.items()}}
+    if kind == "L":
+        return {"L": [_encode_value(x) for x in v]}
+    return value
+
+
+def _decode_value(value):
+    (kind, v), = value.items()
+    if kind == "B":
+        return {"B": base64.b64decode(v)}
+    if kind == "BS":
+        return {"BS": [base64.b64decode(b) for b in v]}
+    if kind == "M":
+        return {"M": {k: _decode_value(x) for k, x in v.items()}}
+    if kind == "L":
+        return {"L": [_decode_value(x) for x in v]}
+    return value
+
+
+# ------------------------
+# EXPORT
+# ------------------------
+def export_table(table_name, path, segments=4, region=None, endpoint_url=None):
+    """Parallel segmented scan of table_name into a snapshot file. Returns item count."""
+    pages = queue.Queue(maxsize=segments * 4)
+    errors = []
+
+    def _scan_segment(segment):
+        client = _client(region, endpoint_url)
+        kwargs = {"TableName": table_name, "Segment": segment, "TotalSegments": segments}
+        try:
+            while True:
+                response = client.scan(**kwargs)
+                pages.put(response.get("Items", []))
+                last_key = response.get("LastEvaluatedKey")
+                if not last_key:
+                    break
+                kwargs["ExclusiveStartKey"] = last_key
+        except Exception as e:
+            errors.append(e)
+        finally:
+            pages.put(None)
+
+    tmp_path = path + ".tmp"
+    count = 0
+    threads = [threading.Thread(target=_scan_segment, args=(s,), daemon=True) for s in range(segments)]
+    for t in threads:
+        t.start()
+
+    # Ek hi writer (yeh thread) -> file mein lines interleave nahi hoti
+    try:
+        with _open(tmp_path, "w", path.endswith(".gz")) as f:
+            finished = 0
+            while finished < segments:
+                items = pages.get()
+                if items is None:
+                    finished += 1
+                    continue
+                f.write("".join(json.dumps({"Item": {k: _encode_value(v) for k, v in item.items()}},
+                                           separators=(",", ":")) + "\n" for item in items))
+                count += len(items)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+
+    if errors:
+        os.remove(tmp_path)
+        raise errors[0]
+    os.replace(tmp_path, path)  # adha-likha snapshot kabhi final naam par nahi aata
+    return count
+
+
+# ------------------------
+# IMPORT
+# ------------------------
+def iter_snapshot_raw(path):
+    """Yield items in DynamoDB JSON form."""
+    with _open(path, "r", path.endswith(".gz")) as f:
+        for line in f:
+            if line.strip():
+                yield {k: _decode_value(v) for k, v in json.loads(line)["Item"].items()}
+
+
+def iter_snapshot_items(path):
+    """Yield items as plain Python dicts (same types boto3.resource returns)."""
+    deserializer = TypeDeserializer()
+    for raw in iter_snapshot_raw(path):
+        yield {k: deserializer.deserialize(v) for k, v in raw.items()}
+
+
+def _write_chunk(client_local, table_name, items, region, endpoint_url):
+    client = getattr(client_local, "client", None)
+    if client is None:
+        client = client_local.client = _client(region, endpoint_url)
+    for i in range(0, len(items), BATCH_SIZE):
+        request = {table_name: [{"PutRequest": {"Item": item}} for item in items[i:i + BATCH_SIZE]]}
+        for attempt in range(MAX_RETRIES + 1):
+            request = client.batch_write_item(RequestItems=request).get("UnprocessedItems") or {}
+            if not request:
+                break
+            time.sleep(0.05 * (2 ** attempt) * (0.5 + random.random()))
+        else:
+            raise RuntimeError(f"Unprocessed items remain for {table_name} after {MAX_RETRIES} retries")
+    return len(items)
+
+
+def import_table(table_name, path, workers=8, chunk_size=500, region=None, endpoint_url=None):
+    """Restore a snapshot file into table_name. Returns item count."""
+    client_local = threading.local()
+    count = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        chunk = []
+        for item in iter_snapshot_raw(path):
+            chunk.append(item)
+            if len(chunk) == chunk_size:
+                futures.append(pool.submit(_write_chunk, client_local, table_name, chunk, region, endpoint_url))
+                chunk = []
+            # Bounded memory: purane futures collect karte raho
+            if len(futures) >= workers * 2:
+                count += futures.pop(0).result()
+        if chunk:
+            futures.append(pool.submit(_write_chunk, client_local, table_name, chunk, region, endpoint_url))
+        for f in futures:
+            count += f.result()
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export / import DynamoDB table snapshots")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    exp = sub.add_parser("export", help="Table -> snapshot file")
+    exp.add_argument("table", help=f"e.g. {', '.join(TABLES)}")
+    exp.add_argument("-o", "--output", required=True, help="*.ndjson.gz")
+    exp.add_argument("--segments", type=int, default=4, help="Parallel scan segments")
+
+    imp = sub.add_parser("import", help="Snapshot file -> table")
+    imp.add_argument("table")
+    imp.add_argument("-i", "--input", required=True)
+    imp.add_argument("--workers", type=int, default=8)
+
+    for p in (exp, imp):
+        p.add_argument("--region", default=os.environ.get("AWS_REGION"))
+        p.add_argument("--endpoint-url", default=os.environ.get("DYNAMODB_ENDPOINT_URL"))
+
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    if args.command == "export":
+        count = export_table(args.table, args.output, args.segments, args.region, args.endpoint_url)
+        print(f"Exported {count:,} items from {args.table} to {args.output}", end="")
+    else:
+        count = import_table(args.table, args.input, args.workers, region=args.region, endpoint_url=args.endpoint_url)
+        print(f"Imported {count:,} items from {args.input} into {args.table}", end="")
+    print(f" in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Service-to-service HTTP calls + concurrent fan-out (aggregator endpoints).
+
+    flight_api = Upstream("flight", os.getenv("FLIGHT_SERVICE_URL"), timeout=1.5)
+    results, errors = fan_out({
+        "flights": lambda: flight_api.get("/api/flights", {"type": "domestic", ...}),
+        "crowdpulse": lambda: crowdpulse_api.get("/api/crowdpulse/GOI"),
+    }, timeout=2.0)
+
+- Upstream: har process ka apna urllib3 connection pool (keep-alive, fork ke
+  baad naya pool), retries nahi -- aggregator ka latency budget chhota hai.
+  Har call track_dependency(name, "GET") se time hoti hai (histogram + span).
+  Body MessagePack mein maangi jaati hai (msgpack installed ho to; chhota
+  payload, tez decode), JSON fallback -- decode Content-Type se.
+  INTERNAL_API_KEY set ho to X-Internal-Key header bhi (upstream ka
+  per-client rate limit in calls par nahi lagta, admission dekho).
+- fan_out: calls shared thread pool par parallel chalti hain; `timeout`
+  poori fan-out ki deadline hai. Jo call time par khatam na ho uska naam
+  errors mein "timeout" ke saath aata hai, baaki results phir bhi milte hain
+  (partial response). Per-dependency timeout Upstream ke socket timeouts se.
+
+Env: UPSTREAM_POOL_SIZE (keep-alive connections per upstream host, 16),
+FANOUT_WORKERS (fan-out threads per process, 32).
+"""
+import contextvars
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from urllib.parse import urlencode
+
+import urllib3
+
+from travelease_common.admission import INTERNAL_API_KEY, INTERNAL_HEADER, Overloaded
+from travelease_common.http_cache import MSGPACK, decode_body, msgpack
+from travelease_common.metrics import track_dependency
+from travelease_common.serving import fork_safe
+
+UPSTREAM_POOL_SIZE = int(os.environ.get("UPSTREAM_POOL_SIZE", 16))
+FANOUT_WORKERS = int(os.environ.get("FANOUT_WORKERS", 32))
+CONNECT_TIMEOUT = 0.5
+ACCEPT = f"{MSGPACK}, application/json;q=0.9" if msgpack is not None else "application/json"
+HEADERS = {"Accept": ACCEPT, "User-Agent": "travelease-upstream"}
+if INTERNAL_API_KEY:
+    HEADERS[INTERNAL_HEADER] = INTERNAL_API_KEY
+
+# Threads fork ke baad nahi bachte -> har worker ka apna executor
+_executor = fork_safe(lambda: ThreadPoolExecutor(max_workers=FANOUT_WORKERS, thread_name_prefix="fanout"))
+
+
+class UpstreamError(Exception):
+    """A failed upstream call; str() is a short reason ("timeout", "HTTP 503", ...)."""
+
+    def __init__(self, reason, status=None):
+        super().__init__(reason)
+        self.status = status
+
+
+# ------------------------
+# UPSTREAM
+# ------------------------
+class Upstream:
+    def __init__(self, name, base_url, timeout=1.5):
+        self.name = name
+        self.base_url = (base_url or "").rstrip("/")
+        self.timeout = urllib3.Timeout(connect=min(CONNECT_TIMEOUT, timeout), read=timeout)
+        self._http = fork_safe(lambda: urllib3.PoolManager(
+            maxsize=UPSTREAM_POOL_SIZE, block=False, retries=False,
+            headers=HEADERS,
+        ))
+
+    def get(self, path, params=None):
+        """GET base_url + path; returns the decoded body (2xx) or raises UpstreamError."""
+        if not self.base_url:
+            raise UpstreamError("not configured")
+        url = self.base_url + path + (f"?{urlencode(params)}" if params else "")
+        try:
+            with track_dependency(self.name, "GET"):
+                res = self._http.request("GET", url, timeout=self.timeout)
+        except urllib3.exceptions.TimeoutError:
+            raise UpstreamError("timeout")
+        except urllib3.exceptions.HTTPError as e:
+            raise UpstreamError(f"unavailable ({type(e).__name__})")
+        if not 200 <= res.status < 300:
+            raise UpstreamError(f"HTTP {res.status}", res.status)
+        try:
+            return decode_body(res.data, res.headers.get("Content-Type"))
+        except ValueError:
+            raise UpstreamError("invalid body", res.status)
+
+
+# ------------------------
+# FAN-OUT
+# ------------------------
+def fan_out(calls, timeout):
+    """
+    Run {name: fn} concurrently. Returns (results, errors): results[name] is
+    fn()'s value, errors[name] a short reason for calls that failed or missed
+    the deadline.
+    """
+    deadline = time.monotonic() + timeout
+    # copy_context: request spans (travelease_common.debug) pool threads mein bhi record hon
+    futures = {name: _executor.submit(contextvars.copy_context().run, fn) for name, fn in calls.items()}
+    results, errors = {}, {}
+    for name, future in futures.items():
+        try:
+            results[name] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeout:
+            future.cancel()  # abhi shuru nahi hui ho to; chal rahi call apne socket timeout par rukegi
+            errors[name] = "timeout"
+        except UpstreamError as e:
+            errors[name] = str(e)
+        except Overloaded:
+            errors[name] = "overloaded"
+        except Exception as e:
+            logging.warning(f"[fan-out] {name} failed: {e}")
+            errors[name] = "error"
+    return results, errors
@@ -1,24 +1,19 @@
 # -- coding: utf-8 --
-import re
 import sys
 import os
-import subprocess
 import json
+from deploy_tools.asset_build import build_frontend
+from deploy_tools.s3_deploy import S3Deployer
+from deploy_tools.task_graph import TaskGraph, stream_command
 
 def run_command(cmd, cwd=None):
-    """Run a shell command and print output in real time."""
-    print(f"\n[CMD] Running: {cmd}")
-    process = subprocess.Popen(cmd, cwd=cwd, shell=True,
-                               stdout=subprocess.PIPE,
-                               stderr=subprocess.STDOUT,
-                               text=True)
-    for line in process.stdout:
-        print(line, end='')
-    process.wait()
-    if process.returncode != 0:
+    """Run a command and stream its output in real time (prefixed when inside a task)."""
+    print(f"\n[CMD] Running: {cmd if isinstance(cmd, str) else ' '.join(cmd)}")
+    returncode = stream_command(cmd, cwd=cwd)
+    if returncode != 0:
         print(f"[ERROR] Command failed: {cmd}")
-        sys.exit(process.returncode)
-    return process.returncode
+        sys.exit(returncode)
+    return returncode
 
 
 def get_terraform_outputs(repo_dir):
@@ -45,78 +40,45 @@ def get_terraform_outputs(repo_dir):
 
     print(f"[INFO] ALB DNS Detected: {alb_dns}")
     print(f"[INFO] Frontend S3 Bucket: {s3_bucket}")
-
-    os.chdir(repo_dir)
     return alb_dns, s3_bucket
 
 
-def update_urls_in_index(file_path, new_url):
-    """Replace CONST ALB_URL and CONST API_ENDPOINT constants in index.html."""
-    if not os.path.exists(file_path):
-        print(f"[WARN] Skipping missing file: {file_path}")
-        return
-
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    original_content = content
-
-    # Match uppercase constants from index.html
-    content = re.sub(r'(const\s+ALB_URL\s*=\s*")[^"]+(")', fr'\1{new_url}\2', content)
-    content = re.sub(r'(const\s+API_ENDPOINT\s*=\s*")[^"]+(")', fr'\1{new_url}\2', content)
-
-    if content != original_content:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        print(f"[OK] Updated ALB URLs in: {file_path}")
-    else:
-        print(f"[INFO] No ALB URL changes needed in: {file_path}")
-
-
-def deploy_to_s3(bucket_name):
-    """Upload frontend files to S3 (compatible with ACLs disabled)."""
+def deploy_to_s3(bucket_name, files, force=False):
+    """Upload changed build files ({local_path: key}) to S3 (parallel, precompressed, hash-skipped)."""
     print(f"\n[DEPLOY] Uploading frontend to s3://{bucket_name}/")
 
-    files_to_upload = {
-        "index.html": "text/html",
-        "CrowdPulse\\frontend\\crowdpulse_widget.html": "text/html",
-        "images\\travelease_logo.png": "image/png"
-    }
-
-    for local_path, content_type in files_to_upload.items():
-        if not os.path.exists(local_path):
-            print(f"[WARN] File not found: {local_path}")
-            continue
-
-        s3_key = local_path.replace("\\", "/")  # normalize path for S3
-        cmd = (
-            f'aws s3 cp "{local_path}" "s3://{bucket_name}/{s3_key}" '
-            f'--content-type {content_type}'
-        )
-        run_command(cmd)
-
-    print("[SUCCESS] Frontend assets deployed successfully.")
-
-
-def populate_databases(repo_dir):
-    """Run DB population scripts automatically."""
-    print("\n[DB] Populating Smart Trips and Flights databases...")
-
-    scripts = [
-        "populate_smart_trips_db.py",
-        os.path.join("Flight_Service", "populate_flights_db.py")
-    ]
-
-    for script in scripts:
-        script_path = os.path.join(repo_dir, script)
-        if not os.path.exists(script_path):
-            print(f"[WARN] Database script not found: {script}")
-            continue
-
-        cmd = f'"C:\\Users\\bruhn\\AppData\\Local\\Programs\\Python\\Python311\\python.exe" "{script_path}"'
-        run_command(cmd)
-
-    print("[SUCCESS] Database population complete.")
+    deployer = S3Deployer(bucket_name, check_remote=True, force=force,
+                          endpoint_url=os.environ.get("S3_ENDPOINT_URL"))
+    result = deployer.deploy(files)
+
+    for key in result["uploaded"]:
+        print(f"[OK] Uploaded: {key}")
+    if result["skipped"]:
+        print(f"[INFO] Unchanged, skipped: {', '.join(result['skipped'])}")
+    print(f"[SUCCESS] Frontend assets deployed successfully "
+          f"({len(result['uploaded'])} uploaded, {result['bytes'] / 1024:.1f} KB).")
+
+
+# Populate scripts ek doosre se independent hain -> alag tasks, parallel
+# --sync: sirf changed items likhe jaate hain, unchanged catalog par zero writes
+# --prune sirf smart trips par: woh table poori is script ki list hai. Flights
+# table mein --from-file wali dated schedules / purane flights bhi hote hain,
+# deploy unhe kabhi delete na kare.
+POPULATE_SCRIPTS = {
+    "populate_smart_trips": ("populate_smart_trips_db.py", ["--sync", "--prune"]),
+    "populate_flights": (os.path.join("Flight_Service", "populate_flights_db.py"), ["--sync"]),
+}
+
+
+def populate_database(repo_dir, script, args):
+    """Run one DB population script with the current interpreter."""
+    script_path = os.path.join(repo_dir, script)
+    if not os.path.exists(script_path):
+        print(f"[WARN] Database script not found: {script}")
+        return
+    # -u: unbuffered, taaki output live stream ho
+    run_command([sys.executable, "-u", script_path, *args], cwd=repo_dir)
+    print(f"[SUCCESS] {script} complete.")
 
 
 def main():
@@ -124,17 +86,25 @@ def main():
         print("Usage: python update_frontend_and_deploy.py <repo_dir>")
         sys.exit(1)
 
-    repo_dir = sys.argv[1]
-    alb_dns, bucket = get_terraform_outputs(repo_dir)
-    alb_url = f"http://{alb_dns}"
-
-    print(f"[UPDATE] Updating index.html with ALB endpoint: {alb_url}")
-    update_urls_in_index(os.path.join(repo_dir, "index.html"), alb_url)
-
-    print(f"[UPLOAD] Uploading updated files to S3 bucket: {bucket}")
-    deploy_to_s3(bucket)
+    repo_dir = os.path.abspath(sys.argv[1])
+    os.chdir(repo_dir)
 
-    populate_databases(repo_dir)
+    graph = TaskGraph()
+    graph.add("terraform", lambda r: get_terraform_outputs(repo_dir))
+    graph.add("build_frontend",
+              lambda r: build_frontend(repo_dir, f"http://{r['terraform'][0]}"),
+              deps=["terraform"])
+    graph.add("upload_frontend",
+              lambda r: deploy_to_s3(r["terraform"][1], r["build_frontend"]),
+              deps=["terraform", "build_frontend"])
+    for name, (script, args) in POPULATE_SCRIPTS.items():
+        graph.add(name, lambda r, script=script, args=args: populate_database(repo_dir, script, args))
+
+    ok = graph.run()
+    print(graph.report())
+    if not ok:
+        print("[ERROR] Deploy finished with failures.")
+        sys.exit(1)
 
 
 if __name__ == "__main__":